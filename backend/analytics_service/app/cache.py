@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Redis hot cache for read-heavy analytics endpoints
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", "120"))
+
+redis_client: Optional[redis.Redis] = None
+
+def record_key(prefix: str, record_id: Any, updated_at: datetime) -> str:
+    """Key for a record's serialized response, versioned by updated_at so writes never have to delete it."""
+    return f"{prefix}:{record_id}:{updated_at.timestamp()}"
+
+def course_metrics_key(course_id: int) -> str:
+    return f"cm:{course_id}"
+
+def dashboard_key(user_id: int) -> str:
+    """Key for a user's serialized dashboard response."""
+    return f"dashboard:{user_id}"
+
+async def init_cache():
+    """Create the Redis client."""
+    global redis_client
+    redis_client = redis.from_url(REDIS_URL)
+
+async def close_cache():
+    """Close the Redis client."""
+    global redis_client
+    if redis_client is not None:
+        await redis_client.aclose()
+        redis_client = None
+
+async def _read_through(
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: int,
+    encode: Callable[[Any], Any],
+    decode: Callable[[Any], Any]
+) -> Any:
+    """Return decode(cached value) for key, or call loader and cache encode(result) on a miss.
+
+    A None result is not cached, and Redis errors fall back to the loader so the
+    cache never takes the endpoint down with it.
+    """
+    if redis_client is None:
+        return await loader()
+    
+    try:
+        hit = await redis_client.get(key)
+    except RedisError:
+        logger.warning("Redis GET failed for %s", key, exc_info=True)
+        return await loader()
+    if hit is not None:
+        return decode(hit)
+    
+    value = await loader()
+    if value is not None:
+        try:
+            await redis_client.setex(key, ttl, encode(value))
+        except RedisError:
+            logger.warning("Redis SETEX failed for %s", key, exc_info=True)
+    return value
+
+async def cached(key: str, loader: Callable[[], Awaitable[Any]], ttl: int = CACHE_TTL) -> Any:
+    """Return the JSON value cached under key, calling loader and caching its result on a miss."""
+    return await _read_through(key, loader, ttl, json.dumps, json.loads)
+
+async def cached_bytes(key: str, loader: Callable[[], Awaitable[Optional[bytes]]], ttl: int = CACHE_TTL) -> Optional[bytes]:
+    """Return the already-serialized bytes cached under key, calling loader and caching its result on a miss."""
+    return await _read_through(key, loader, ttl, bytes, bytes)
+
+async def invalidate(*keys: str):
+    """Delete cached entries after a write."""
+    if redis_client is None or not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except RedisError:
+        logger.warning("Redis DEL failed for %s", keys, exc_info=True)
@@ -1,11 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc, asc
+from sqlalchemy import RowMapping, select, insert, update, func, and_, or_, desc, asc, case, bindparam, literal, text, cast, tuple_, JSON, Text
 from sqlalchemy.orm import selectinload
-from typing import List, Optional, Dict, Any
+from starlette.concurrency import run_in_threadpool
+from typing import AsyncIterable, Final, List, Optional, Dict, Any
 from datetime import datetime, timedelta
-import pandas as pd
+import asyncio
+import json
+import os
+import time
 import numpy as np
 
+from .database import ReadSessionLocal, read_engine, SUMMARY_VIEW_NAME
 from .models import (
     UserAnalytics, CourseAnalytics, EnrollmentAnalytics, 
     AssessmentAnalytics, ProgressAnalytics, SystemAnalytics, 
@@ -21,6 +26,125 @@ from .schemas import (
     LearningPathAnalyticsCreate, LearningPathAnalyticsUpdate
 )
 
+# Engagement score normalizers (value at which a factor saturates at 1.0) and weights
+LOGIN_NORM: Final = 10.0
+SESSION_NORM: Final = 120.0  # minutes
+COURSE_NORM: Final = 5.0
+GRADE_NORM: Final = 100.0
+W_LOGIN: Final = 0.2
+W_SESSION: Final = 0.2
+W_COURSE: Final = 0.2
+W_COMPLETION: Final = 0.2
+W_GRADE: Final = 0.2
+MAX_ENGAGEMENT_SCORE: Final = 100.0
+
+# Analytics summary cache (seconds a computed summary stays fresh; not used on PostgreSQL)
+SUMMARY_CACHE_TTL = float(os.getenv("ANALYTICS_SUMMARY_CACHE_TTL", "30"))
+_summary_cache: Dict[str, Any] = {}
+_summary_lock = asyncio.Lock()
+
+# Point-lookup statements built once at import and reused with bound parameters
+_GET_USER_ANALYTICS = select(UserAnalytics).where(UserAnalytics.user_id == bindparam("user_id"))
+_GET_COURSE_ANALYTICS = select(CourseAnalytics).where(CourseAnalytics.course_id == bindparam("course_id"))
+_GET_ENROLLMENT_ANALYTICS = select(EnrollmentAnalytics).where(
+    EnrollmentAnalytics.enrollment_id == bindparam("enrollment_id")
+)
+_GET_ASSESSMENT_ANALYTICS = select(AssessmentAnalytics).where(
+    and_(
+        AssessmentAnalytics.assessment_id == bindparam("assessment_id"),
+        AssessmentAnalytics.user_id == bindparam("user_id")
+    )
+)
+_GET_LEARNING_PATH_ANALYTICS = select(LearningPathAnalytics).where(
+    LearningPathAnalytics.user_id == bindparam("user_id")
+)
+
+# Same lookups returning only updated_at, used to version cached responses
+_GET_USER_ANALYTICS_UPDATED_AT = _GET_USER_ANALYTICS.with_only_columns(UserAnalytics.updated_at)
+_GET_COURSE_ANALYTICS_UPDATED_AT = _GET_COURSE_ANALYTICS.with_only_columns(CourseAnalytics.updated_at)
+_GET_ENROLLMENT_ANALYTICS_UPDATED_AT = _GET_ENROLLMENT_ANALYTICS.with_only_columns(EnrollmentAnalytics.updated_at)
+_GET_ASSESSMENT_ANALYTICS_UPDATED_AT = _GET_ASSESSMENT_ANALYTICS.with_only_columns(AssessmentAnalytics.updated_at)
+_GET_LEARNING_PATH_ANALYTICS_UPDATED_AT = _GET_LEARNING_PATH_ANALYTICS.with_only_columns(
+    LearningPathAnalytics.updated_at
+)
+
+# Bulk ingestion
+BULK_COPY_THRESHOLD = 100  # below this many rows a plain multi-row INSERT is cheaper
+BULK_INSERT_BATCH_SIZE = 500  # rows per multi-row INSERT, well under PostgreSQL's bind parameter limit
+PROGRESS_INGEST_BATCH_SIZE = 1000  # streamed progress rows buffered per COPY
+THREADPOOL_MIN_ROWS = 1000  # Python-side passes over fewer rows are cheaper than a thread handoff
+
+def _copy_value(column, value):
+    """Adapt a Python value to what asyncpg's COPY encoder expects for a column."""
+    if value is not None and isinstance(column.type, JSON):
+        return json.dumps(value)
+    return value
+
+def _copy_records(rows: List[Dict[str, Any]], columns, defaults: Dict[str, Any]) -> List[tuple]:
+    """Build the COPY tuples for rows, filling in column defaults."""
+    return [
+        tuple(_copy_value(c, row.get(c.key, defaults[c.key])) for c in columns)
+        for row in rows
+    ]
+
+async def _off_loop(fn, rows, *args):
+    """Run a Python-side pass over rows inline, or in the threadpool once there are enough rows to stall the event loop."""
+    if len(rows) >= THREADPOOL_MIN_ROWS:
+        return await run_in_threadpool(fn, rows, *args)
+    return fn(rows, *args)
+
+async def _bulk_insert(db: AsyncSession, model, rows: List[Dict[str, Any]]) -> int:
+    """Insert many rows of a model in one go, with a single commit, and return the number inserted."""
+    count = await _insert_rows(db, model, rows)
+    await db.commit()
+    return count
+
+async def _insert_rows(db: AsyncSession, model, rows: List[Dict[str, Any]]) -> int:
+    """Insert many rows of a model without committing and return the number inserted.
+
+    Large batches on PostgreSQL/asyncpg are streamed with the COPY protocol;
+    everything else is sent as multi-row INSERTs of BULK_INSERT_BATCH_SIZE rows.
+    """
+    if not rows:
+        return 0
+    
+    conn = await db.connection()
+    if len(rows) < BULK_COPY_THRESHOLD or conn.dialect.driver != "asyncpg":
+        for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+            await db.execute(insert(model).values(rows[start:start + BULK_INSERT_BATCH_SIZE]))
+        return len(rows)
+    
+    # COPY bypasses SQLAlchemy, so column defaults are resolved here; columns
+    # with only a server default are left out for the database to fill
+    now = datetime.utcnow()
+    columns = [
+        c for c in model.__table__.columns
+        if not c.primary_key and c.computed is None
+        and not (c.default is None and c.server_default is not None and c.key not in rows[0])
+    ]
+    defaults = {}
+    for column in columns:
+        if column.default is None:
+            defaults[column.key] = None
+        elif column.default.is_scalar:
+            defaults[column.key] = column.default.arg
+        else:
+            defaults[column.key] = now
+    
+    records = await _off_loop(_copy_records, rows, columns, defaults)
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        model.__tablename__,
+        records=records,
+        columns=[c.name for c in columns]
+    )
+    return len(rows)
+
+async def _reload_updated_at(db: AsyncSession, db_analytics) -> None:
+    """Reload updated_at after an UPDATE ... RETURNING on SQLite, whose trigger stamps it only afterwards."""
+    if db.get_bind().dialect.name == "sqlite":
+        await db.refresh(db_analytics, ["updated_at"])
+
 # User Analytics CRUD
 async def create_user_analytics(db: AsyncSession, analytics: UserAnalyticsCreate) -> UserAnalytics:
     """Create user analytics record."""
@@ -30,28 +154,48 @@ async def create_user_analytics(db: AsyncSession, analytics: UserAnalyticsCreate
     await db.refresh(db_analytics)
     return db_analytics
 
+async def bulk_create_user_analytics(db: AsyncSession, analytics: List[UserAnalyticsCreate]) -> int:
+    """Create many user analytics records."""
+    count = await _bulk_insert(db, UserAnalytics, [a.dict() for a in analytics])
+    return count
+
 async def get_user_analytics(db: AsyncSession, user_id: int) -> Optional[UserAnalytics]:
     """Get user analytics by user ID."""
-    result = await db.execute(
-        select(UserAnalytics).where(UserAnalytics.user_id == user_id)
-    )
+    result = await db.execute(_GET_USER_ANALYTICS, {"user_id": user_id})
+    return result.scalar_one_or_none()
+
+async def get_user_analytics_updated_at(db: AsyncSession, user_id: int) -> Optional[datetime]:
+    """Get when the user's analytics last changed, without loading the row."""
+    result = await db.execute(_GET_USER_ANALYTICS_UPDATED_AT, {"user_id": user_id})
     return result.scalar_one_or_none()
 
 async def update_user_analytics(db: AsyncSession, user_id: int, analytics: UserAnalyticsUpdate) -> Optional[UserAnalytics]:
     """Update user analytics."""
-    db_analytics = await get_user_analytics(db, user_id)
+    update_data = analytics.dict(exclude_unset=True)
+    if not update_data:
+        return await get_user_analytics(db, user_id)
+    
+    result = await db.execute(
+        update(UserAnalytics)
+        .where(UserAnalytics.user_id == user_id)
+        .values(**update_data)
+        .returning(UserAnalytics)
+    )
+    db_analytics = result.scalar_one_or_none()
     if not db_analytics:
         return None
     
-    update_data = analytics.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_analytics, field, value)
-    
-    db_analytics.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(db_analytics)
+    await _reload_updated_at(db, db_analytics)
     return db_analytics
 
+async def get_user_engagement_score(db: AsyncSession, user_id: int) -> float:
+    """Get the engagement score last stored by the scheduled metrics refresh."""
+    result = await db.execute(
+        select(UserAnalytics.engagement_score).where(UserAnalytics.user_id == user_id)
+    )
+    return result.scalar_one_or_none() or 0.0
+
 async def calculate_user_engagement_score(db: AsyncSession, user_id: int) -> float:
     """Calculate user engagement score based on various metrics."""
     # Get user analytics
@@ -59,23 +203,66 @@ async def calculate_user_engagement_score(db: AsyncSession, user_id: int) -> flo
     if not user_analytics:
         return 0.0
     
-    # Calculate engagement score based on multiple factors
-    login_factor = min(user_analytics.login_count / 10, 1.0)  # Normalize to 0-1
-    session_factor = min(user_analytics.session_duration / 120, 1.0)  # Normalize to 0-1
-    course_factor = min(user_analytics.total_courses_enrolled / 5, 1.0)  # Normalize to 0-1
+    # Calculate engagement score based on multiple factors, each normalized to 0-1
+    login_factor = min(user_analytics.login_count / LOGIN_NORM, 1.0)
+    session_factor = min(user_analytics.session_duration / SESSION_NORM, 1.0)
+    course_factor = min(user_analytics.total_courses_enrolled / COURSE_NORM, 1.0)
     completion_factor = user_analytics.completed_courses / max(user_analytics.total_courses_enrolled, 1)
-    grade_factor = user_analytics.average_grade / 100  # Normalize to 0-1
+    grade_factor = user_analytics.average_grade / GRADE_NORM
     
     # Weighted average
     engagement_score = (
-        login_factor * 0.2 +
-        session_factor * 0.2 +
-        course_factor * 0.2 +
-        completion_factor * 0.2 +
-        grade_factor * 0.2
-    ) * 100
+        login_factor * W_LOGIN +
+        session_factor * W_SESSION +
+        course_factor * W_COURSE +
+        completion_factor * W_COMPLETION +
+        grade_factor * W_GRADE
+    ) * MAX_ENGAGEMENT_SCORE
+    
+    return min(engagement_score, MAX_ENGAGEMENT_SCORE)
+
+async def calculate_user_engagement_scores_bulk(db: AsyncSession, user_ids: List[int]) -> Dict[int, float]:
+    """Calculate engagement scores for many users with one query and vectorized math."""
+    if not user_ids:
+        return {}
     
-    return min(engagement_score, 100.0)
+    result = await db.execute(
+        select(
+            UserAnalytics.user_id,
+            UserAnalytics.login_count,
+            UserAnalytics.session_duration,
+            UserAnalytics.total_courses_enrolled,
+            UserAnalytics.completed_courses,
+            UserAnalytics.average_grade
+        ).where(UserAnalytics.user_id.in_(user_ids))
+    )
+    rows = result.all()
+    if not rows:
+        return {}
+    
+    return await _off_loop(_engagement_scores_from_rows, rows)
+
+def _engagement_scores_from_rows(rows) -> Dict[int, float]:
+    """Compute engagement scores from the rows selected by calculate_user_engagement_scores_bulk."""
+    data = np.asarray(rows, dtype=np.float64)
+    login_factor = np.minimum(data[:, 1] / LOGIN_NORM, 1.0)
+    session_factor = np.minimum(data[:, 2] / SESSION_NORM, 1.0)
+    course_factor = np.minimum(data[:, 3] / COURSE_NORM, 1.0)
+    completion_factor = data[:, 4] / np.maximum(data[:, 3], 1)
+    grade_factor = data[:, 5] / GRADE_NORM
+    
+    # Same weighted average as calculate_user_engagement_score
+    engagement_scores = np.minimum(
+        (
+            login_factor * W_LOGIN +
+            session_factor * W_SESSION +
+            course_factor * W_COURSE +
+            completion_factor * W_COMPLETION +
+            grade_factor * W_GRADE
+        ) * MAX_ENGAGEMENT_SCORE,
+        MAX_ENGAGEMENT_SCORE
+    )
+    return dict(zip(data[:, 0].astype(int).tolist(), engagement_scores.tolist()))
 
 # Course Analytics CRUD
 async def create_course_analytics(db: AsyncSession, analytics: CourseAnalyticsCreate) -> CourseAnalytics:
@@ -86,37 +273,71 @@ async def create_course_analytics(db: AsyncSession, analytics: CourseAnalyticsCr
     await db.refresh(db_analytics)
     return db_analytics
 
+async def bulk_create_course_analytics(db: AsyncSession, analytics: List[CourseAnalyticsCreate]) -> int:
+    """Create many course analytics records."""
+    count = await _bulk_insert(db, CourseAnalytics, [a.dict() for a in analytics])
+    return count
+
 async def get_course_analytics(db: AsyncSession, course_id: int) -> Optional[CourseAnalytics]:
     """Get course analytics by course ID."""
-    result = await db.execute(
-        select(CourseAnalytics).where(CourseAnalytics.course_id == course_id)
-    )
+    result = await db.execute(_GET_COURSE_ANALYTICS, {"course_id": course_id})
+    return result.scalar_one_or_none()
+
+async def get_course_analytics_updated_at(db: AsyncSession, course_id: int) -> Optional[datetime]:
+    """Get when the course's analytics last changed, without loading the row."""
+    result = await db.execute(_GET_COURSE_ANALYTICS_UPDATED_AT, {"course_id": course_id})
     return result.scalar_one_or_none()
 
 async def update_course_analytics(db: AsyncSession, course_id: int, analytics: CourseAnalyticsUpdate) -> Optional[CourseAnalytics]:
     """Update course analytics."""
-    db_analytics = await get_course_analytics(db, course_id)
+    update_data = analytics.dict(exclude_unset=True)
+    if not update_data:
+        return await get_course_analytics(db, course_id)
+    
+    result = await db.execute(
+        update(CourseAnalytics)
+        .where(CourseAnalytics.course_id == course_id)
+        .values(**update_data)
+        .returning(CourseAnalytics)
+    )
+    db_analytics = result.scalar_one_or_none()
     if not db_analytics:
         return None
     
-    update_data = analytics.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_analytics, field, value)
-    
-    db_analytics.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(db_analytics)
+    await _reload_updated_at(db, db_analytics)
     return db_analytics
 
+# Per-course enrollment aggregates; filtered to one course on demand and
+# grouped by course in the scheduled metrics refresh
+COURSE_METRICS_COLUMNS = (
+    func.count(EnrollmentAnalytics.id).label("total_enrollments"),
+    func.count(EnrollmentAnalytics.id).filter(
+        and_(
+            EnrollmentAnalytics.progress_percentage > 0,
+            EnrollmentAnalytics.completion_date.is_(None)
+        )
+    ).label("active_enrollments"),
+    func.count(EnrollmentAnalytics.completion_date).label("completed_enrollments"),
+    func.coalesce(func.avg(EnrollmentAnalytics.time_to_completion), 0.0).label("average_completion_time"),
+    func.coalesce(func.avg(EnrollmentAnalytics.final_grade), 0.0).label("average_grade"),
+    func.coalesce(func.avg(EnrollmentAnalytics.progress_percentage), 0.0).label("engagement_score"),
+    func.coalesce(
+        (func.count(EnrollmentAnalytics.id) - func.count(EnrollmentAnalytics.completion_date)) * 100.0
+        / func.nullif(func.count(EnrollmentAnalytics.id), 0),
+        0.0
+    ).label("dropout_rate")
+)
+
 async def calculate_course_metrics(db: AsyncSession, course_id: int) -> Dict[str, Any]:
     """Calculate comprehensive course metrics."""
-    # Get enrollment analytics for this course
+    # Aggregate enrollment analytics for this course in a single query
     result = await db.execute(
-        select(EnrollmentAnalytics).where(EnrollmentAnalytics.course_id == course_id)
+        select(*COURSE_METRICS_COLUMNS).where(EnrollmentAnalytics.course_id == course_id)
     )
-    enrollments = result.scalars().all()
-    
-    if not enrollments:
+    metrics = result.mappings().one()
+
+    if not metrics["total_enrollments"]:
         return {
             "total_enrollments": 0,
             "active_enrollments": 0,
@@ -126,35 +347,78 @@ async def calculate_course_metrics(db: AsyncSession, course_id: int) -> Dict[str
             "engagement_score": 0.0,
             "dropout_rate": 0.0
         }
+
+    return dict(metrics)
+
+async def get_course_metrics(db: AsyncSession, course_id: int) -> Optional[Dict[str, Any]]:
+    """Get the course metrics last stored on the course analytics row, if there is one."""
+    result = await db.execute(
+        select(
+            CourseAnalytics.total_enrollments,
+            CourseAnalytics.active_enrollments,
+            CourseAnalytics.completed_enrollments,
+            CourseAnalytics.average_completion_time,
+            CourseAnalytics.average_grade,
+            CourseAnalytics.engagement_score,
+            CourseAnalytics.dropout_rate
+        ).where(CourseAnalytics.course_id == course_id)
+    )
+    metrics = result.mappings().first()
+    return dict(metrics) if metrics else None
+
+async def get_course_performance(db: AsyncSession, course_id: int) -> Optional[Dict[str, Any]]:
+    """Get course performance with per-assessment aggregates in a single query."""
+    # One row per assessment (or a single row with a NULL assessment_id when the
+    # course has none), each carrying the course analytics columns
+    result = await db.execute(
+        select(
+            CourseAnalytics.total_enrollments,
+            case(
+                (
+                    CourseAnalytics.total_enrollments > 0,
+                    CourseAnalytics.completed_enrollments * 100.0 / CourseAnalytics.total_enrollments
+                ),
+                else_=0.0
+            ).label("completion_rate"),
+            CourseAnalytics.average_grade,
+            CourseAnalytics.average_completion_time,
+            CourseAnalytics.engagement_score,
+            CourseAnalytics.dropout_rate,
+            CourseAnalytics.satisfaction_score,
+            AssessmentAnalytics.assessment_id,
+            func.count(AssessmentAnalytics.id).label("attempts"),
+            func.avg(AssessmentAnalytics.percentage).label("average_percentage"),
+            func.avg(case((AssessmentAnalytics.passed, 100.0), else_=0.0)).label("pass_rate")
+        )
+        .outerjoin(AssessmentAnalytics, AssessmentAnalytics.course_id == CourseAnalytics.course_id)
+        .where(CourseAnalytics.course_id == course_id)
+        .group_by(CourseAnalytics.id, AssessmentAnalytics.assessment_id)
+        .order_by(AssessmentAnalytics.assessment_id)
+    )
+    rows = result.all()
+    if not rows:
+        return None
     
-    # Calculate metrics
-    total_enrollments = len(enrollments)
-    completed_enrollments = len([e for e in enrollments if e.completion_date])
-    active_enrollments = len([e for e in enrollments if e.progress_percentage > 0 and not e.completion_date])
-    
-    # Calculate average completion time
-    completion_times = [e.time_to_completion for e in enrollments if e.time_to_completion]
-    average_completion_time = np.mean(completion_times) if completion_times else 0.0
-    
-    # Calculate average grade
-    grades = [e.final_grade for e in enrollments if e.final_grade]
-    average_grade = np.mean(grades) if grades else 0.0
-    
-    # Calculate dropout rate
-    dropout_rate = ((total_enrollments - completed_enrollments) / total_enrollments) * 100
-    
-    # Calculate engagement score
-    engagement_scores = [e.progress_percentage for e in enrollments]
-    engagement_score = np.mean(engagement_scores) if engagement_scores else 0.0
-    
+    course = rows[0]
     return {
-        "total_enrollments": total_enrollments,
-        "active_enrollments": active_enrollments,
-        "completed_enrollments": completed_enrollments,
-        "average_completion_time": average_completion_time,
-        "average_grade": average_grade,
-        "engagement_score": engagement_score,
-        "dropout_rate": dropout_rate
+        "course_id": course_id,
+        "enrollment_count": course.total_enrollments,
+        "completion_rate": course.completion_rate,
+        "average_grade": course.average_grade,
+        "average_completion_time": course.average_completion_time,
+        "engagement_score": course.engagement_score,
+        "dropout_rate": course.dropout_rate,
+        "satisfaction_score": course.satisfaction_score,
+        "assessment_performance": [
+            {
+                "assessment_id": row.assessment_id,
+                "attempts": row.attempts,
+                "average_percentage": row.average_percentage or 0.0,
+                "pass_rate": row.pass_rate
+            }
+            for row in rows
+            if row.assessment_id is not None
+        ]
     }
 
 # Enrollment Analytics CRUD
@@ -166,62 +430,106 @@ async def create_enrollment_analytics(db: AsyncSession, analytics: EnrollmentAna
     await db.refresh(db_analytics)
     return db_analytics
 
+async def bulk_create_enrollment_analytics(db: AsyncSession, analytics: List[EnrollmentAnalyticsCreate]) -> int:
+    """Create many enrollment analytics records."""
+    count = await _bulk_insert(db, EnrollmentAnalytics, [a.dict() for a in analytics])
+    return count
+
 async def get_enrollment_analytics(db: AsyncSession, enrollment_id: int) -> Optional[EnrollmentAnalytics]:
     """Get enrollment analytics by enrollment ID."""
-    result = await db.execute(
-        select(EnrollmentAnalytics).where(EnrollmentAnalytics.enrollment_id == enrollment_id)
-    )
+    result = await db.execute(_GET_ENROLLMENT_ANALYTICS, {"enrollment_id": enrollment_id})
+    return result.scalar_one_or_none()
+
+async def get_enrollment_analytics_updated_at(db: AsyncSession, enrollment_id: int) -> Optional[datetime]:
+    """Get when the enrollment's analytics last changed, without loading the row."""
+    result = await db.execute(_GET_ENROLLMENT_ANALYTICS_UPDATED_AT, {"enrollment_id": enrollment_id})
     return result.scalar_one_or_none()
 
 async def update_enrollment_analytics(db: AsyncSession, enrollment_id: int, analytics: EnrollmentAnalyticsUpdate) -> Optional[EnrollmentAnalytics]:
     """Update enrollment analytics."""
-    db_analytics = await get_enrollment_analytics(db, enrollment_id)
+    update_data = analytics.dict(exclude_unset=True)
+    if not update_data:
+        return await get_enrollment_analytics(db, enrollment_id)
+    
+    result = await db.execute(
+        update(EnrollmentAnalytics)
+        .where(EnrollmentAnalytics.enrollment_id == enrollment_id)
+        .values(**update_data)
+        .returning(EnrollmentAnalytics)
+    )
+    db_analytics = result.scalar_one_or_none()
     if not db_analytics:
         return None
     
-    update_data = analytics.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_analytics, field, value)
-    
-    db_analytics.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(db_analytics)
+    await _reload_updated_at(db, db_analytics)
     return db_analytics
 
 # Assessment Analytics CRUD
 async def create_assessment_analytics(db: AsyncSession, analytics: AssessmentAnalyticsCreate) -> AssessmentAnalytics:
     """Create assessment analytics record."""
-    # Calculate percentage if score is provided
-    if analytics.score is not None and analytics.max_score > 0:
-        analytics.percentage = (analytics.score / analytics.max_score) * 100
-        analytics.passed = analytics.percentage >= 70  # 70% passing threshold
-    
     db_analytics = AssessmentAnalytics(**analytics.dict())
     db.add(db_analytics)
     await db.commit()
     await db.refresh(db_analytics)
     return db_analytics
 
+async def bulk_create_assessment_analytics(db: AsyncSession, analytics: List[AssessmentAnalyticsCreate]) -> int:
+    """Create many assessment analytics records."""
+    count = await _bulk_insert(db, AssessmentAnalytics, [a.dict() for a in analytics])
+    return count
+
 async def get_assessment_analytics(db: AsyncSession, assessment_id: int, user_id: int) -> Optional[AssessmentAnalytics]:
     """Get assessment analytics by assessment ID and user ID."""
     result = await db.execute(
-        select(AssessmentAnalytics).where(
-            and_(
-                AssessmentAnalytics.assessment_id == assessment_id,
-                AssessmentAnalytics.user_id == user_id
-            )
-        )
+        _GET_ASSESSMENT_ANALYTICS, {"assessment_id": assessment_id, "user_id": user_id}
+    )
+    return result.scalar_one_or_none()
+
+async def get_assessment_analytics_updated_at(db: AsyncSession, assessment_id: int, user_id: int) -> Optional[datetime]:
+    """Get when the assessment analytics last changed, without loading the row."""
+    result = await db.execute(
+        _GET_ASSESSMENT_ANALYTICS_UPDATED_AT, {"assessment_id": assessment_id, "user_id": user_id}
     )
     return result.scalar_one_or_none()
 
-async def get_user_assessment_history(db: AsyncSession, user_id: int, course_id: Optional[int] = None) -> List[AssessmentAnalytics]:
-    """Get user's assessment history."""
-    query = select(AssessmentAnalytics).where(AssessmentAnalytics.user_id == user_id)
+async def get_user_assessment_history(
+    db: AsyncSession,
+    user_id: int,
+    course_id: Optional[int] = None,
+    limit: int = 50,
+    offset: int = 0,
+    after_id: Optional[int] = None
+) -> List[RowMapping]:
+    """Get a page of the user's assessment history, newest first, as plain row mappings.
+
+    Pass the id of the last row seen as after_id to page by key instead of by
+    offset, which stays cheap however deep the history goes. The key is the
+    whole (submitted_at, id) sort order, since backfilled rows can carry an
+    older submitted_at than rows with lower ids; that row's stored submitted_at
+    is read in the same query, so it compares exactly on every backend.
+    """
+    query = select(*AssessmentAnalytics.__table__.columns).where(AssessmentAnalytics.user_id == user_id)
     if course_id:
         query = query.where(AssessmentAnalytics.course_id == course_id)
+    if after_id is not None:
+        after_submitted_at = (
+            select(AssessmentAnalytics.submitted_at)
+            .where(AssessmentAnalytics.id == after_id)
+            .correlate(None)
+            .scalar_subquery()
+        )
+        query = query.where(
+            tuple_(AssessmentAnalytics.submitted_at, AssessmentAnalytics.id) < tuple_(after_submitted_at, after_id)
+        )
+    else:
+        query = query.offset(offset)
     
-    result = await db.execute(query.order_by(desc(AssessmentAnalytics.submitted_at)))
-    return result.scalars().all()
+    result = await db.execute(
+        query.order_by(desc(AssessmentAnalytics.submitted_at), desc(AssessmentAnalytics.id))
+        .limit(limit)
+    )
+    return result.mappings().all()
 
 # Progress Analytics CRUD
 async def create_progress_analytics(db: AsyncSession, analytics: ProgressAnalyticsCreate) -> ProgressAnalytics:
@@ -232,44 +540,77 @@ async def create_progress_analytics(db: AsyncSession, analytics: ProgressAnalyti
     await db.refresh(db_analytics)
     return db_analytics
 
-async def get_user_progress(db: AsyncSession, user_id: int, course_id: Optional[int] = None) -> List[ProgressAnalytics]:
-    """Get user progress analytics."""
-    query = select(ProgressAnalytics).where(ProgressAnalytics.user_id == user_id)
+async def bulk_create_progress_analytics(db: AsyncSession, analytics: List[ProgressAnalyticsCreate]) -> int:
+    """Create many progress analytics records."""
+    return await _bulk_insert(db, ProgressAnalytics, [a.dict() for a in analytics])
+
+async def ingest_progress_analytics(db: AsyncSession, analytics: AsyncIterable[ProgressAnalyticsCreate]) -> int:
+    """Create progress analytics records from a stream, PROGRESS_INGEST_BATCH_SIZE rows at a time, in one transaction."""
+    count = 0
+    batch = []
+    async for record in analytics:
+        batch.append(record.dict())
+        if len(batch) >= PROGRESS_INGEST_BATCH_SIZE:
+            count += await _insert_rows(db, ProgressAnalytics, batch)
+            batch = []
+    count += await _insert_rows(db, ProgressAnalytics, batch)
+    await db.commit()
+    return count
+
+# activity_metadata is selected as its JSON text, so listings can pass it through
+# to the response without parsing it into Python objects and encoding it again
+_PROGRESS_LIST_COLUMNS = [
+    cast(column, Text).label(column.key) if column.key == "activity_metadata" else column
+    for column in ProgressAnalytics.__table__.columns
+]
+
+async def get_user_progress(db: AsyncSession, user_id: int, course_id: Optional[int] = None, limit: int = 100, offset: int = 0) -> List[RowMapping]:
+    """Get a page of user progress analytics, newest first, as plain row mappings with activity_metadata as JSON text."""
+    query = select(*_PROGRESS_LIST_COLUMNS).where(ProgressAnalytics.user_id == user_id)
     if course_id:
         query = query.where(ProgressAnalytics.course_id == course_id)
     
-    result = await db.execute(query.order_by(desc(ProgressAnalytics.created_at)))
-    return result.scalars().all()
+    result = await db.execute(
+        query.order_by(desc(ProgressAnalytics.created_at))
+        .limit(limit)
+        .offset(offset)
+    )
+    return result.mappings().all()
+
+async def get_user_progress_light(db: AsyncSession, user_id: int, limit: int = 10):
+    """Get the user's most recent activities, selecting only the dashboard columns."""
+    result = await db.execute(
+        select(
+            ProgressAnalytics.id,
+            ProgressAnalytics.activity_type,
+            ProgressAnalytics.course_id,
+            ProgressAnalytics.completion_status,
+            ProgressAnalytics.created_at
+        )
+        .where(ProgressAnalytics.user_id == user_id)
+        .order_by(desc(ProgressAnalytics.created_at))
+        .limit(limit)
+    )
+    return result.all()
 
 async def get_course_progress_summary(db: AsyncSession, course_id: int) -> Dict[str, Any]:
-    """Get course progress summary."""
+    """Get course progress summary, aggregated by the database."""
+    # Zero scores and durations are skipped, matching the truthiness checks this replaced
     result = await db.execute(
-        select(ProgressAnalytics).where(ProgressAnalytics.course_id == course_id)
+        select(
+            func.count(ProgressAnalytics.id).label("total_activities"),
+            func.count(case((ProgressAnalytics.completion_status == "completed", 1))).label("completed_activities"),
+            func.avg(func.nullif(ProgressAnalytics.activity_score, 0)).label("average_activity_score"),
+            func.sum(ProgressAnalytics.activity_duration).label("total_time_spent")
+        ).where(ProgressAnalytics.course_id == course_id)
     )
-    progress_records = result.scalars().all()
-    
-    if not progress_records:
-        return {
-            "total_activities": 0,
-            "completed_activities": 0,
-            "average_activity_score": 0.0,
-            "total_time_spent": 0.0
-        }
-    
-    total_activities = len(progress_records)
-    completed_activities = len([p for p in progress_records if p.completion_status == "completed"])
-    
-    scores = [p.activity_score for p in progress_records if p.activity_score]
-    average_score = np.mean(scores) if scores else 0.0
-    
-    time_spent = [p.activity_duration for p in progress_records if p.activity_duration]
-    total_time = np.sum(time_spent) if time_spent else 0.0
+    row = result.mappings().one()
     
     return {
-        "total_activities": total_activities,
-        "completed_activities": completed_activities,
-        "average_activity_score": average_score,
-        "total_time_spent": total_time
+        "total_activities": row["total_activities"],
+        "completed_activities": row["completed_activities"],
+        "average_activity_score": row["average_activity_score"] or 0.0,
+        "total_time_spent": row["total_time_spent"] or 0.0
     }
 
 # System Analytics CRUD
@@ -281,14 +622,18 @@ async def create_system_analytics(db: AsyncSession, analytics: SystemAnalyticsCr
     await db.refresh(db_analytics)
     return db_analytics
 
-async def get_system_metrics(db: AsyncSession, period: str, category: Optional[str] = None) -> List[SystemAnalytics]:
-    """Get system metrics for a specific period and category."""
-    query = select(SystemAnalytics).where(SystemAnalytics.period == period)
+async def bulk_create_system_analytics(db: AsyncSession, analytics: List[SystemAnalyticsCreate]) -> int:
+    """Create many system analytics records."""
+    return await _bulk_insert(db, SystemAnalytics, [a.dict() for a in analytics])
+
+async def get_system_metrics(db: AsyncSession, period: str, category: Optional[str] = None) -> List[RowMapping]:
+    """Get system metrics for a specific period and category as plain row mappings."""
+    query = select(*SystemAnalytics.__table__.columns).where(SystemAnalytics.period == period)
     if category:
         query = query.where(SystemAnalytics.category == category)
     
     result = await db.execute(query.order_by(desc(SystemAnalytics.period_date)))
-    return result.scalars().all()
+    return result.mappings().all()
 
 # Learning Path Analytics CRUD
 async def create_learning_path_analytics(db: AsyncSession, analytics: LearningPathAnalyticsCreate) -> LearningPathAnalytics:
@@ -299,95 +644,123 @@ async def create_learning_path_analytics(db: AsyncSession, analytics: LearningPa
     await db.refresh(db_analytics)
     return db_analytics
 
+async def bulk_create_learning_path_analytics(db: AsyncSession, analytics: List[LearningPathAnalyticsCreate]) -> int:
+    """Create many learning path analytics records."""
+    return await _bulk_insert(db, LearningPathAnalytics, [a.dict() for a in analytics])
+
 async def get_learning_path_analytics(db: AsyncSession, user_id: int) -> Optional[LearningPathAnalytics]:
     """Get learning path analytics for a user."""
-    result = await db.execute(
-        select(LearningPathAnalytics).where(LearningPathAnalytics.user_id == user_id)
-    )
+    result = await db.execute(_GET_LEARNING_PATH_ANALYTICS, {"user_id": user_id})
+    return result.scalar_one_or_none()
+
+async def get_learning_path_analytics_updated_at(db: AsyncSession, user_id: int) -> Optional[datetime]:
+    """Get when the user's learning path analytics last changed, without loading the row."""
+    result = await db.execute(_GET_LEARNING_PATH_ANALYTICS_UPDATED_AT, {"user_id": user_id})
     return result.scalar_one_or_none()
 
 async def update_learning_path_analytics(db: AsyncSession, user_id: int, analytics: LearningPathAnalyticsUpdate) -> Optional[LearningPathAnalytics]:
     """Update learning path analytics."""
-    db_analytics = await get_learning_path_analytics(db, user_id)
+    update_data = analytics.dict(exclude_unset=True)
+    if not update_data:
+        return await get_learning_path_analytics(db, user_id)
+    
+    result = await db.execute(
+        update(LearningPathAnalytics)
+        .where(LearningPathAnalytics.user_id == user_id)
+        .values(**update_data)
+        .returning(LearningPathAnalytics)
+    )
+    db_analytics = result.scalar_one_or_none()
     if not db_analytics:
         return None
     
-    update_data = analytics.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_analytics, field, value)
-    
-    db_analytics.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(db_analytics)
+    await _reload_updated_at(db, db_analytics)
     return db_analytics
 
 # Analytics Summary and Dashboard functions
+async def _with_session(query_fn, *args, **kwargs):
+    """Run a read-only CRUD query on its own session from the read pool."""
+    async with ReadSessionLocal() as session:
+        return await query_fn(session, *args, **kwargs)
+
 async def get_analytics_summary(db: AsyncSession) -> Dict[str, Any]:
-    """Get system-wide analytics summary."""
-    # Count total users
-    user_result = await db.execute(select(func.count(UserAnalytics.id)))
-    total_users = user_result.scalar() or 0
-    
-    # Count total courses
-    course_result = await db.execute(select(func.count(CourseAnalytics.id)))
-    total_courses = course_result.scalar() or 0
-    
-    # Count total enrollments
-    enrollment_result = await db.execute(select(func.count(EnrollmentAnalytics.id)))
-    total_enrollments = enrollment_result.scalar() or 0
-    
-    # Count active enrollments
-    active_result = await db.execute(
-        select(func.count(EnrollmentAnalytics.id)).where(
-            and_(
-                EnrollmentAnalytics.progress_percentage > 0,
-                EnrollmentAnalytics.completion_date.is_(None)
-            )
+    """Get system-wide analytics summary.
+    
+    Writes never invalidate it; it is instead at most SUMMARY_VIEW_REFRESH_INTERVAL
+    seconds stale on PostgreSQL, which reads the materialized view directly, and at
+    most SUMMARY_CACHE_TTL seconds stale elsewhere, where it is cached in process.
+    """
+    if read_engine.dialect.name == "postgresql":
+        return await _with_session(_compute_analytics_summary)
+    
+    cached = _summary_cache.get("summary")
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
+    # Only one request recomputes an expired summary; the rest wait for it
+    async with _summary_lock:
+        cached = _summary_cache.get("summary")
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        summary = await _with_session(_compute_analytics_summary)
+        _summary_cache["summary"] = (time.monotonic() + SUMMARY_CACHE_TTL, summary)
+    return summary
+
+# Every summary counter as one SELECT; also the body of the PostgreSQL materialized view
+ANALYTICS_SUMMARY_QUERY = select(
+    literal(1).label("id"),
+    select(func.count(UserAnalytics.id)).scalar_subquery().label("total_users"),
+    select(func.count(CourseAnalytics.id)).scalar_subquery().label("total_courses"),
+    select(func.count(EnrollmentAnalytics.id)).scalar_subquery().label("total_enrollments"),
+    select(func.count(EnrollmentAnalytics.id)).where(
+        and_(
+            EnrollmentAnalytics.progress_percentage > 0,
+            EnrollmentAnalytics.completion_date.is_(None)
         )
-    )
-    active_enrollments = active_result.scalar() or 0
+    ).scalar_subquery().label("active_enrollments"),
+    select(func.count(EnrollmentAnalytics.completion_date)).scalar_subquery().label("completed_enrollments"),
+    select(func.avg(EnrollmentAnalytics.final_grade)).scalar_subquery().label("average_grade"),
+    select(func.count(AssessmentAnalytics.id)).scalar_subquery().label("total_assessments"),
+    select(func.avg(UserAnalytics.engagement_score)).scalar_subquery().label("average_engagement_score")
+)
+
+async def _compute_analytics_summary(db: AsyncSession) -> Dict[str, Any]:
+    """Compute the system-wide analytics summary from the database."""
+    # PostgreSQL serves the precomputed materialized view; other databases
+    # fetch every counter and average in a single round trip
+    if db.get_bind().dialect.name == "postgresql":
+        result = await db.execute(text(f"SELECT * FROM {SUMMARY_VIEW_NAME}"))
+    else:
+        result = await db.execute(ANALYTICS_SUMMARY_QUERY)
+    row = result.mappings().one()
+    
+    total_enrollments = row["total_enrollments"] or 0
+    completed_enrollments = row["completed_enrollments"] or 0
     
     # Calculate completion rate
-    completion_result = await db.execute(
-        select(func.count(EnrollmentAnalytics.id)).where(
-            EnrollmentAnalytics.completion_date.isnot(None)
-        )
-    )
-    completed_enrollments = completion_result.scalar() or 0
     completion_rate = (completed_enrollments / total_enrollments * 100) if total_enrollments > 0 else 0
     
-    # Calculate average grade
-    grade_result = await db.execute(
-        select(func.avg(EnrollmentAnalytics.final_grade)).where(
-            EnrollmentAnalytics.final_grade.isnot(None)
-        )
-    )
-    average_grade = grade_result.scalar() or 0.0
-    
-    # Count total assessments
-    assessment_result = await db.execute(select(func.count(AssessmentAnalytics.id)))
-    total_assessments = assessment_result.scalar() or 0
-    
-    # Calculate average engagement score
-    engagement_result = await db.execute(
-        select(func.avg(UserAnalytics.engagement_score))
-    )
-    average_engagement_score = engagement_result.scalar() or 0.0
-    
     return {
-        "total_users": total_users,
-        "total_courses": total_courses,
+        "total_users": row["total_users"] or 0,
+        "total_courses": row["total_courses"] or 0,
         "total_enrollments": total_enrollments,
-        "active_enrollments": active_enrollments,
+        "active_enrollments": row["active_enrollments"] or 0,
         "completion_rate": completion_rate,
-        "average_grade": average_grade,
-        "total_assessments": total_assessments,
-        "average_engagement_score": average_engagement_score
+        "average_grade": row["average_grade"] or 0.0,
+        "total_assessments": row["total_assessments"] or 0,
+        "average_engagement_score": row["average_engagement_score"] or 0.0
     }
 
 async def get_user_dashboard_analytics(db: AsyncSession, user_id: int) -> Dict[str, Any]:
     """Get user dashboard analytics."""
-    user_analytics = await get_user_analytics(db, user_id)
+    # The three lookups are independent; run them concurrently, each on its
+    # own session since an AsyncSession cannot be shared between tasks
+    user_analytics, recent_activities, learning_path = await asyncio.gather(
+        get_user_analytics(db, user_id),
+        _with_session(get_user_progress_light, user_id, limit=10),
+        _with_session(get_learning_path_analytics, user_id)
+    )
     if not user_analytics:
         return {
             "user_id": user_id,
@@ -400,8 +773,6 @@ async def get_user_dashboard_analytics(db: AsyncSession, user_id: int) -> Dict[s
             "recommended_courses": []
         }
     
-    # Get recent activities
-    recent_activities = await get_user_progress(db, user_id)
     recent_activities_data = [
         {
             "id": activity.id,
@@ -410,11 +781,10 @@ async def get_user_dashboard_analytics(db: AsyncSession, user_id: int) -> Dict[s
             "completion_status": activity.completion_status,
             "created_at": activity.created_at.isoformat()
         }
-        for activity in recent_activities[:10]  # Last 10 activities
+        for activity in recent_activities
     ]
     
     # Get learning path progress
-    learning_path = await get_learning_path_analytics(db, user_id)
     learning_path_progress = None
     if learning_path:
         learning_path_progress = {
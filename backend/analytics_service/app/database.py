@@ -1,24 +1,79 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
+from sqlalchemy import text
+import asyncio
+import hashlib
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
+def _async_url(url: str) -> str:
+    """Point a plain postgresql:// URL at asyncpg; SQLAlchemy would pick the sync psycopg2 driver."""
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    return url
+
 # Database URL - using SQLite for development
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./analytics.db")
+DATABASE_URL = _async_url(os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./analytics.db"))
+# Optional read replica for dashboard/summary reads; defaults to the primary
+READ_DATABASE_URL = _async_url(os.getenv("READ_DATABASE_URL", DATABASE_URL))
+
+# Materialized view backing the analytics summary (PostgreSQL only); its refresh
+# interval is how stale the summary can get there
+SUMMARY_VIEW_NAME = "mv_analytics_summary"
+SUMMARY_VIEW_REFRESH_INTERVAL = float(os.getenv("ANALYTICS_SUMMARY_REFRESH_INTERVAL", "120"))
+
+# Connection pool settings (ignored for SQLite, which shares one static connection)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+
+if "sqlite" in DATABASE_URL:
+    pool_options = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+else:
+    pool_options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
 
 # Create async engine
 engine = create_async_engine(
     DATABASE_URL,
     echo=True,  # Set to False in production
-    poolclass=StaticPool,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+    **pool_options
 )
 
+# Read-only engine; shares the primary engine unless a replica is configured
+if READ_DATABASE_URL == DATABASE_URL:
+    read_engine = engine
+else:
+    read_engine = create_async_engine(
+        READ_DATABASE_URL,
+        echo=False,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        execution_options={"postgresql_readonly": True} if "postgresql" in READ_DATABASE_URL else {}
+    )
+
 # Create async session factory
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Session factory for independent read-only queries that run concurrently
+ReadSessionLocal = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
 async def get_db():
     """Dependency to get database session."""
     async with AsyncSessionLocal() as session:
@@ -27,14 +82,121 @@ async def get_db():
         finally:
             await session.close()
 
+async def warm_pool():
+    """Open DB_POOL_SIZE connections up front so the first requests skip connection setup."""
+    if "sqlite" in DATABASE_URL:
+        return
+    
+    async def touch():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    
+    await asyncio.gather(*(touch() for _ in range(DB_POOL_SIZE)))
+
 async def create_tables():
-    """Create all tables."""
+    """Create all tables, and the triggers that maintain their updated_at columns."""
     from .models import Base
     async with engine.begin() as conn:
+        # Every worker runs this on startup; concurrent DDL on a fresh database
+        # fails with duplicate-object errors, so they take turns
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": "analytics_schema"})
         await conn.run_sync(Base.metadata.create_all)
+        tables = [t.name for t in Base.metadata.sorted_tables if "updated_at" in t.c]
+        if conn.dialect.name == "postgresql":
+            await _create_postgresql_updated_at_triggers(conn, tables)
+        elif conn.dialect.name == "sqlite":
+            await _create_sqlite_updated_at_triggers(conn, tables)
+
+# Both trigger flavours leave updated_at alone when the UPDATE sets it explicitly
+async def _create_postgresql_updated_at_triggers(conn, tables):
+    """Stamp updated_at in a BEFORE UPDATE trigger, so UPDATE statements need not send it."""
+    await conn.execute(text("""
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.updated_at IS NOT DISTINCT FROM OLD.updated_at THEN
+                NEW.updated_at := now();
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    for table in tables:
+        await conn.execute(text(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}"))
+        await conn.execute(text(
+            f"CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        ))
+
+async def _create_sqlite_updated_at_triggers(conn, tables):
+    """SQLite cannot modify NEW, so stamp updated_at with a follow-up UPDATE after each row changes.
+    
+    RETURNING on the original UPDATE still reports the previous updated_at.
+    """
+    for table in tables:
+        await conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_updated_at AFTER UPDATE ON {table} "
+            f"FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at "
+            f"BEGIN UPDATE {table} SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id; END"
+        ))
 
 async def drop_tables():
     """Drop all tables."""
     from .models import Base
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all) 
\ No newline at end of file
+        await conn.run_sync(Base.metadata.drop_all)
+
+async def create_summary_view():
+    """Create the analytics summary materialized view, recreating it if its definition changed.
+    
+    The view's comment holds a hash of the query it was built from, since
+    CREATE ... IF NOT EXISTS would otherwise keep serving an outdated definition.
+    """
+    from .crud import ANALYTICS_SUMMARY_QUERY
+    async with engine.begin() as conn:
+        if conn.dialect.name != "postgresql":
+            return
+        query = str(ANALYTICS_SUMMARY_QUERY.compile(
+            dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+        ))
+        digest = hashlib.sha256(query.encode()).hexdigest()
+        
+        # Serialize workers starting at the same time
+        await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": SUMMARY_VIEW_NAME})
+        current = await conn.scalar(
+            text("SELECT obj_description(to_regclass(:name), 'pg_class')"), {"name": SUMMARY_VIEW_NAME}
+        )
+        if current == digest:
+            return
+        
+        await conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {SUMMARY_VIEW_NAME}"))
+        await conn.execute(text(f"CREATE MATERIALIZED VIEW {SUMMARY_VIEW_NAME} AS {query}"))
+        # A unique index is required for REFRESH ... CONCURRENTLY
+        await conn.execute(text(f"CREATE UNIQUE INDEX ix_{SUMMARY_VIEW_NAME}_id ON {SUMMARY_VIEW_NAME} (id)"))
+        await conn.execute(text(f"COMMENT ON MATERIALIZED VIEW {SUMMARY_VIEW_NAME} IS '{digest}'"))
+
+async def try_job_lock(conn, name: str) -> bool:
+    """Take a transaction-scoped advisory lock so workers never run the same periodic job at once.
+    
+    Every uvicorn worker starts its own copy of the background jobs. Outside
+    PostgreSQL there is a single process, so the lock is always granted.
+    """
+    if conn.dialect.name != "postgresql":
+        return True
+    return await conn.scalar(text("SELECT pg_try_advisory_xact_lock(hashtext(:name))"), {"name": name})
+
+async def refresh_summary_view():
+    """Recompute the analytics summary materialized view without blocking readers."""
+    async with engine.begin() as conn:
+        if conn.dialect.name != "postgresql" or not await try_job_lock(conn, SUMMARY_VIEW_NAME):
+            return
+        await conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {SUMMARY_VIEW_NAME}"))
+
+async def refresh_summary_view_periodically():
+    """Refresh the analytics summary view every SUMMARY_VIEW_REFRESH_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(SUMMARY_VIEW_REFRESH_INTERVAL)
+        try:
+            await refresh_summary_view()
+        except Exception:
+            logger.exception("Failed to refresh %s", SUMMARY_VIEW_NAME)
@@ -1,26 +1,119 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Query
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, status, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import asynccontextmanager
 from typing import List, Optional
 from datetime import datetime, timedelta
+import asyncio
+import base64
+import hashlib
+import orjson
+import os
 
-from .database import get_db, create_tables
-from . import crud, schemas
+from .database import (
+    engine, read_engine, get_db, create_tables, create_summary_view,
+    refresh_summary_view_periodically, warm_pool
+)
+from . import cache, crud, schemas
+from .middleware import ASGIRequestTimer
+from .scheduled_jobs import refresh_metrics_periodically
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create database tables on startup and release connections on shutdown."""
+    await create_tables()
+    await create_summary_view()
+    await warm_pool()
+    await cache.init_cache()
+    summary_refresh_task = asyncio.create_task(refresh_summary_view_periodically())
+    metrics_refresh_task = asyncio.create_task(refresh_metrics_periodically())
+    yield
+    summary_refresh_task.cancel()
+    metrics_refresh_task.cancel()
+    await cache.close_cache()
+    if read_engine is not engine:
+        await read_engine.dispose()
+    await engine.dispose()
 
-app = FastAPI(title="Analytics Service", version="1.0.0")
+app = FastAPI(
+    title="Analytics Service",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
+# Explicit origin list (comma-separated); CORS is added last so it runs outermost
+CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:3000").split(",")
+# Clients may keep record responses but must revalidate them with If-None-Match
+RECORD_CACHE_CONTROL = os.getenv("ANALYTICS_RECORD_CACHE_CONTROL", "private, no-cache")
+
+app.add_middleware(ASGIRequestTimer)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-@app.on_event("startup")
-async def startup_event():
-    """Create database tables on startup."""
-    await create_tables()
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists etag, using weak comparison."""
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+async def _cached_record_response(request: Request, key: Optional[str], load, not_found: str) -> Response:
+    """Serve a record's serialized response from cache, building it with load() on a miss.
+    
+    key is None when there is no updated_at to version the entry by (a missing
+    record, or a row written before updated_at existed); load() runs uncached then
+    and decides between the record and a 404. Otherwise the key doubles as the
+    ETag, and a matching If-None-Match is answered with 304 without loading anything.
+    """
+    if key is None:
+        body = await load()
+        headers = None
+    else:
+        etag = f'W/"{hashlib.sha1(key.encode()).hexdigest()[:16]}"'
+        headers = {"ETag": etag, "Cache-Control": RECORD_CACHE_CONTROL}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        body = await cache.cached_bytes(key, load)
+    if body is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_found
+        )
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _model_response(payload: schemas.AnalyticsResponse, status_code: int = status.HTTP_200_OK, exclude_none: bool = False) -> Response:
+    """Serialize a response model straight to JSON bytes with its compiled serializer.
+    
+    Returning the model itself would have FastAPI dump it to a dict, validate that
+    against response_model again and encode the result a second time.
+    """
+    return Response(
+        content=payload.model_dump_json(exclude_none=exclude_none),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+def _encode_cursor(record_id: int) -> str:
+    """Encode a keyset pagination position as an opaque URL-safe token."""
+    return base64.urlsafe_b64encode(str(record_id).encode()).decode()
+
+def _decode_cursor(cursor: str) -> int:
+    """Decode a token from _encode_cursor back into the last record ID seen."""
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
 
 @app.get("/api/v1/health")
 async def health_check() -> dict[str, str]:
@@ -31,46 +124,87 @@ async def health_check() -> dict[str, str]:
 async def create_user_analytics(
     analytics: schemas.UserAnalyticsCreate,
     db: AsyncSession = Depends(get_db)
-) -> schemas.UserAnalyticsResponse:
+) -> Response:
     """Create user analytics record."""
     try:
         db_analytics = await crud.create_user_analytics(db, analytics)
-        return schemas.UserAnalyticsResponse(
+        await cache.invalidate(cache.dashboard_key(analytics.user_id))
+        return _model_response(schemas.UserAnalyticsResponse(
             success=True,
             data=db_analytics,
             message="User analytics created successfully"
+        ), status.HTTP_201_CREATED)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to create user analytics: {str(e)}"
         )
+
+@app.post("/api/v1/analytics/users/bulk", status_code=status.HTTP_201_CREATED)
+async def bulk_create_user_analytics(
+    analytics: List[schemas.UserAnalyticsCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many user analytics records in one request."""
+    try:
+        created = await crud.bulk_create_user_analytics(db, analytics)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create user analytics: {str(e)}"
         )
+    await cache.invalidate(*{cache.dashboard_key(a.user_id) for a in analytics})
+    
+    return {
+        "success": True,
+        "data": {"created": created},
+        "message": "User analytics created successfully"
+    }
+
+@app.get("/api/v1/analytics/users/engagement-scores")
+async def get_user_engagement_scores(
+    user_ids: List[int] = Query(..., description="User IDs to score"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Calculate engagement scores for several users at once."""
+    engagement_scores = await crud.calculate_user_engagement_scores_bulk(db, user_ids)
+    return {
+        "success": True,
+        "data": [
+            {"user_id": user_id, "engagement_score": score}
+            for user_id, score in engagement_scores.items()
+        ],
+        "message": "Engagement scores calculated successfully"
+    }
 
 @app.get("/api/v1/analytics/users/{user_id}", response_model=schemas.UserAnalyticsResponse)
 async def get_user_analytics(
     user_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
-) -> schemas.UserAnalyticsResponse:
+) -> Response:
     """Get user analytics by user ID."""
-    db_analytics = await crud.get_user_analytics(db, user_id)
-    if not db_analytics:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User analytics not found"
-        )
+    updated_at = await crud.get_user_analytics_updated_at(db, user_id)
     
-    return schemas.UserAnalyticsResponse(
-        success=True,
-        data=db_analytics,
-        message="User analytics retrieved successfully"
-    )
+    async def load():
+        db_analytics = await crud.get_user_analytics(db, user_id)
+        if not db_analytics:
+            return None
+        return schemas.UserAnalyticsResponse(
+            success=True,
+            data=db_analytics,
+            message="User analytics retrieved successfully"
+        ).model_dump_json().encode()
+    
+    key = cache.record_key("ua", user_id, updated_at) if updated_at else None
+    return await _cached_record_response(request, key, load, "User analytics not found")
 
 @app.put("/api/v1/analytics/users/{user_id}", response_model=schemas.UserAnalyticsResponse)
 async def update_user_analytics(
     user_id: int,
     analytics: schemas.UserAnalyticsUpdate,
     db: AsyncSession = Depends(get_db)
-) -> schemas.UserAnalyticsResponse:
+) -> Response:
     """Update user analytics."""
     db_analytics = await crud.update_user_analytics(db, user_id, analytics)
     if not db_analytics:
@@ -78,24 +212,28 @@ async def update_user_analytics(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User analytics not found"
         )
+    # A write within the timestamp's resolution keeps the same version key, so clear it too
+    await cache.invalidate(
+        cache.record_key("ua", user_id, db_analytics.updated_at), cache.dashboard_key(user_id)
+    )
     
-    return schemas.UserAnalyticsResponse(
+    return _model_response(schemas.UserAnalyticsResponse(
         success=True,
         data=db_analytics,
         message="User analytics updated successfully"
-    )
+    ))
 
 @app.get("/api/v1/analytics/users/{user_id}/engagement-score")
 async def get_user_engagement_score(
     user_id: int,
     db: AsyncSession = Depends(get_db)
 ):
-    """Calculate and return user engagement score."""
-    engagement_score = await crud.calculate_user_engagement_score(db, user_id)
+    """Return the user's engagement score, as last computed by the scheduled metrics refresh."""
+    engagement_score = await crud.get_user_engagement_score(db, user_id)
     return {
         "success": True,
         "data": {"user_id": user_id, "engagement_score": engagement_score},
-        "message": "Engagement score calculated successfully"
+        "message": "Engagement score retrieved successfully"
     }
 
 # Course Analytics Endpoints
@@ -103,46 +241,68 @@ async def get_user_engagement_score(
 async def create_course_analytics(
     analytics: schemas.CourseAnalyticsCreate,
     db: AsyncSession = Depends(get_db)
-) -> schemas.CourseAnalyticsResponse:
+) -> Response:
     """Create course analytics record."""
     try:
         db_analytics = await crud.create_course_analytics(db, analytics)
-        return schemas.CourseAnalyticsResponse(
+        return _model_response(schemas.CourseAnalyticsResponse(
             success=True,
             data=db_analytics,
             message="Course analytics created successfully"
+        ), status.HTTP_201_CREATED)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to create course analytics: {str(e)}"
         )
+
+@app.post("/api/v1/analytics/courses/bulk", status_code=status.HTTP_201_CREATED)
+async def bulk_create_course_analytics(
+    analytics: List[schemas.CourseAnalyticsCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many course analytics records in one request."""
+    try:
+        created = await crud.bulk_create_course_analytics(db, analytics)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create course analytics: {str(e)}"
         )
+    return {
+        "success": True,
+        "data": {"created": created},
+        "message": "Course analytics created successfully"
+    }
 
 @app.get("/api/v1/analytics/courses/{course_id}", response_model=schemas.CourseAnalyticsResponse)
 async def get_course_analytics(
     course_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
-) -> schemas.CourseAnalyticsResponse:
+) -> Response:
     """Get course analytics by course ID."""
-    db_analytics = await crud.get_course_analytics(db, course_id)
-    if not db_analytics:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Course analytics not found"
-        )
+    updated_at = await crud.get_course_analytics_updated_at(db, course_id)
     
-    return schemas.CourseAnalyticsResponse(
-        success=True,
-        data=db_analytics,
-        message="Course analytics retrieved successfully"
-    )
+    async def load():
+        db_analytics = await crud.get_course_analytics(db, course_id)
+        if not db_analytics:
+            return None
+        return schemas.CourseAnalyticsResponse(
+            success=True,
+            data=db_analytics,
+            message="Course analytics retrieved successfully"
+        ).model_dump_json().encode()
+    
+    key = cache.record_key("ca", course_id, updated_at) if updated_at else None
+    return await _cached_record_response(request, key, load, "Course analytics not found")
 
 @app.put("/api/v1/analytics/courses/{course_id}", response_model=schemas.CourseAnalyticsResponse)
 async def update_course_analytics(
     course_id: int,
     analytics: schemas.CourseAnalyticsUpdate,
     db: AsyncSession = Depends(get_db)
-) -> schemas.CourseAnalyticsResponse:
+) -> Response:
     """Update course analytics."""
     db_analytics = await crud.update_course_analytics(db, course_id, analytics)
     if not db_analytics:
@@ -150,12 +310,13 @@ async def update_course_analytics(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course analytics not found"
         )
+    await cache.invalidate(cache.record_key("ca", course_id, db_analytics.updated_at))
     
-    return schemas.CourseAnalyticsResponse(
+    return _model_response(schemas.CourseAnalyticsResponse(
         success=True,
         data=db_analytics,
         message="Course analytics updated successfully"
-    )
+    ))
 
 @app.get("/api/v1/analytics/courses/{course_id}/metrics")
 async def get_course_metrics(
@@ -163,58 +324,91 @@ async def get_course_metrics(
     db: AsyncSession = Depends(get_db)
 ):
     """Get comprehensive course metrics."""
-    metrics = await crud.calculate_course_metrics(db, course_id)
-    return {
+    async def load():
+        # Served from the course analytics row kept current by the scheduled
+        # metrics refresh; courses without a row are aggregated on the spot
+        metrics = await crud.get_course_metrics(db, course_id)
+        if metrics is None:
+            metrics = await crud.calculate_course_metrics(db, course_id)
+        return metrics
+    
+    metrics = await cache.cached(cache.course_metrics_key(course_id), load)
+    return ORJSONResponse(content={
         "success": True,
         "data": metrics,
         "message": "Course metrics calculated successfully"
-    }
+    })
 
 # Enrollment Analytics Endpoints
 @app.post("/api/v1/analytics/enrollments", response_model=schemas.EnrollmentAnalyticsResponse, status_code=status.HTTP_201_CREATED)
 async def create_enrollment_analytics(
     analytics: schemas.EnrollmentAnalyticsCreate,
     db: AsyncSession = Depends(get_db)
-) -> schemas.EnrollmentAnalyticsResponse:
+) -> Response:
     """Create enrollment analytics record."""
     try:
         db_analytics = await crud.create_enrollment_analytics(db, analytics)
-        return schemas.EnrollmentAnalyticsResponse(
+        await cache.invalidate(cache.course_metrics_key(analytics.course_id))
+        return _model_response(schemas.EnrollmentAnalyticsResponse(
             success=True,
             data=db_analytics,
             message="Enrollment analytics created successfully"
+        ), status.HTTP_201_CREATED)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to create enrollment analytics: {str(e)}"
         )
+
+@app.post("/api/v1/analytics/enrollments/bulk", status_code=status.HTTP_201_CREATED)
+async def bulk_create_enrollment_analytics(
+    analytics: List[schemas.EnrollmentAnalyticsCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many enrollment analytics records in one request."""
+    try:
+        created = await crud.bulk_create_enrollment_analytics(db, analytics)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create enrollment analytics: {str(e)}"
         )
+    await cache.invalidate(*{cache.course_metrics_key(a.course_id) for a in analytics})
+    
+    return {
+        "success": True,
+        "data": {"created": created},
+        "message": "Enrollment analytics created successfully"
+    }
 
 @app.get("/api/v1/analytics/enrollments/{enrollment_id}", response_model=schemas.EnrollmentAnalyticsResponse)
 async def get_enrollment_analytics(
     enrollment_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
-) -> schemas.EnrollmentAnalyticsResponse:
+) -> Response:
     """Get enrollment analytics by enrollment ID."""
-    db_analytics = await crud.get_enrollment_analytics(db, enrollment_id)
-    if not db_analytics:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Enrollment analytics not found"
-        )
+    updated_at = await crud.get_enrollment_analytics_updated_at(db, enrollment_id)
     
-    return schemas.EnrollmentAnalyticsResponse(
-        success=True,
-        data=db_analytics,
-        message="Enrollment analytics retrieved successfully"
-    )
+    async def load():
+        db_analytics = await crud.get_enrollment_analytics(db, enrollment_id)
+        if not db_analytics:
+            return None
+        return schemas.EnrollmentAnalyticsResponse(
+            success=True,
+            data=db_analytics,
+            message="Enrollment analytics retrieved successfully"
+        ).model_dump_json().encode()
+    
+    key = cache.record_key("ea", enrollment_id, updated_at) if updated_at else None
+    return await _cached_record_response(request, key, load, "Enrollment analytics not found")
 
 @app.put("/api/v1/analytics/enrollments/{enrollment_id}", response_model=schemas.EnrollmentAnalyticsResponse)
 async def update_enrollment_analytics(
     enrollment_id: int,
     analytics: schemas.EnrollmentAnalyticsUpdate,
     db: AsyncSession = Depends(get_db)
-) -> schemas.EnrollmentAnalyticsResponse:
+) -> Response:
     """Update enrollment analytics."""
     db_analytics = await crud.update_enrollment_analytics(db, enrollment_id, analytics)
     if not db_analytics:
@@ -222,100 +416,212 @@ async def update_enrollment_analytics(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Enrollment analytics not found"
         )
+    await cache.invalidate(
+        cache.record_key("ea", enrollment_id, db_analytics.updated_at),
+        cache.course_metrics_key(db_analytics.course_id)
+    )
     
-    return schemas.EnrollmentAnalyticsResponse(
+    return _model_response(schemas.EnrollmentAnalyticsResponse(
         success=True,
         data=db_analytics,
         message="Enrollment analytics updated successfully"
-    )
+    ))
 
 # Assessment Analytics Endpoints
 @app.post("/api/v1/analytics/assessments", response_model=schemas.AssessmentAnalyticsResponse, status_code=status.HTTP_201_CREATED)
 async def create_assessment_analytics(
     analytics: schemas.AssessmentAnalyticsCreate,
     db: AsyncSession = Depends(get_db)
-) -> schemas.AssessmentAnalyticsResponse:
+) -> Response:
     """Create assessment analytics record."""
     try:
         db_analytics = await crud.create_assessment_analytics(db, analytics)
-        return schemas.AssessmentAnalyticsResponse(
+        return _model_response(schemas.AssessmentAnalyticsResponse(
             success=True,
             data=db_analytics,
             message="Assessment analytics created successfully"
+        ), status.HTTP_201_CREATED)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to create assessment analytics: {str(e)}"
         )
+
+@app.post("/api/v1/analytics/assessments/bulk", status_code=status.HTTP_201_CREATED)
+async def bulk_create_assessment_analytics(
+    analytics: List[schemas.AssessmentAnalyticsCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many assessment analytics records in one request."""
+    try:
+        created = await crud.bulk_create_assessment_analytics(db, analytics)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create assessment analytics: {str(e)}"
         )
+    return {
+        "success": True,
+        "data": {"created": created},
+        "message": "Assessment analytics created successfully"
+    }
 
 @app.get("/api/v1/analytics/assessments/{assessment_id}/users/{user_id}", response_model=schemas.AssessmentAnalyticsResponse)
 async def get_assessment_analytics(
     assessment_id: int,
     user_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
-) -> schemas.AssessmentAnalyticsResponse:
+) -> Response:
     """Get assessment analytics by assessment ID and user ID."""
-    db_analytics = await crud.get_assessment_analytics(db, assessment_id, user_id)
-    if not db_analytics:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assessment analytics not found"
-        )
+    updated_at = await crud.get_assessment_analytics_updated_at(db, assessment_id, user_id)
     
-    return schemas.AssessmentAnalyticsResponse(
-        success=True,
-        data=db_analytics,
-        message="Assessment analytics retrieved successfully"
-    )
+    async def load():
+        db_analytics = await crud.get_assessment_analytics(db, assessment_id, user_id)
+        if not db_analytics:
+            return None
+        return schemas.AssessmentAnalyticsResponse(
+            success=True,
+            data=db_analytics,
+            message="Assessment analytics retrieved successfully"
+        ).model_dump_json().encode()
+    
+    key = cache.record_key("aa", f"{assessment_id}:{user_id}", updated_at) if updated_at else None
+    return await _cached_record_response(request, key, load, "Assessment analytics not found")
 
-@app.get("/api/v1/analytics/users/{user_id}/assessments")
+@app.get("/api/v1/analytics/users/{user_id}/assessments", response_model=schemas.AssessmentHistoryResponse)
 async def get_user_assessment_history(
     user_id: int,
     course_id: Optional[int] = Query(None, description="Filter by course ID"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides offset"),
     db: AsyncSession = Depends(get_db)
-):
+) -> Response:
     """Get user's assessment history."""
-    assessments = await crud.get_user_assessment_history(db, user_id, course_id)
-    return {
+    after_id = _decode_cursor(cursor) if cursor else None
+    assessments = await crud.get_user_assessment_history(db, user_id, course_id, limit, offset, after_id)
+    next_cursor = _encode_cursor(assessments[-1]["id"]) if len(assessments) == limit else None
+    # Plain row dicts go straight to orjson, skipping jsonable_encoder's per-value walk
+    return ORJSONResponse(content={
         "success": True,
-        "data": assessments,
+        "data": [dict(row) for row in assessments],
+        "next_cursor": next_cursor,
         "message": "User assessment history retrieved successfully"
-    }
+    })
 
 # Progress Analytics Endpoints
 @app.post("/api/v1/analytics/progress", response_model=schemas.ProgressAnalyticsResponse, status_code=status.HTTP_201_CREATED)
 async def create_progress_analytics(
     analytics: schemas.ProgressAnalyticsCreate,
     db: AsyncSession = Depends(get_db)
-) -> schemas.ProgressAnalyticsResponse:
+) -> Response:
     """Create progress analytics record."""
     try:
         db_analytics = await crud.create_progress_analytics(db, analytics)
-        return schemas.ProgressAnalyticsResponse(
+        await cache.invalidate(cache.dashboard_key(analytics.user_id))
+        return _model_response(schemas.ProgressAnalyticsResponse(
             success=True,
             data=db_analytics,
             message="Progress analytics created successfully"
+        ), status.HTTP_201_CREATED)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to create progress analytics: {str(e)}"
         )
+
+@app.post("/api/v1/analytics/progress/bulk", status_code=status.HTTP_201_CREATED)
+async def bulk_create_progress_analytics(
+    analytics: List[schemas.ProgressAnalyticsCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many progress analytics records in one request."""
+    try:
+        created = await crud.bulk_create_progress_analytics(db, analytics)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create progress analytics: {str(e)}"
         )
+    await cache.invalidate(*{cache.dashboard_key(a.user_id) for a in analytics})
+    
+    return {
+        "success": True,
+        "data": {"created": created},
+        "message": "Progress analytics created successfully"
+    }
 
-@app.get("/api/v1/analytics/users/{user_id}/progress")
+@app.post("/api/v1/analytics/progress/ingest", status_code=status.HTTP_201_CREATED)
+async def ingest_progress_analytics(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """Create progress analytics records from a newline-delimited JSON body, read as it streams in.
+    
+    The whole body is one transaction: any invalid line rejects every record.
+    """
+    user_ids = set()
+    
+    async def records():
+        line_number = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line_number += 1
+                if line.strip():
+                    yield parse(line, line_number)
+        if buffer.strip():
+            yield parse(buffer, line_number + 1)
+    
+    def parse(line: bytes, line_number: int) -> schemas.ProgressAnalyticsCreate:
+        try:
+            record = schemas.ProgressAnalyticsCreate.model_validate_json(line)
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid progress record on line {line_number}: {e.errors()[0]['msg']}"
+            )
+        user_ids.add(record.user_id)
+        return record
+    
+    try:
+        created = await crud.ingest_progress_analytics(db, records())
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to ingest progress analytics: {str(e)}"
+        )
+    await cache.invalidate(*(cache.dashboard_key(user_id) for user_id in user_ids))
+    
+    return {
+        "success": True,
+        "data": {"created": created},
+        "message": "Progress analytics ingested successfully"
+    }
+
+@app.get("/api/v1/analytics/users/{user_id}/progress", response_model=schemas.ProgressAnalyticsListResponse)
 async def get_user_progress(
     user_id: int,
     course_id: Optional[int] = Query(None, description="Filter by course ID"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db)
-):
+) -> Response:
     """Get user progress analytics."""
-    progress = await crud.get_user_progress(db, user_id, course_id)
-    return {
+    progress = await crud.get_user_progress(db, user_id, course_id, limit, offset)
+    return ORJSONResponse(content={
         "success": True,
-        "data": progress,
+        "data": [
+            {**row, "activity_metadata": orjson.Fragment(row["activity_metadata"]) if row["activity_metadata"] else None}
+            for row in progress
+        ],
         "message": "User progress retrieved successfully"
-    }
+    })
 
 @app.get("/api/v1/analytics/courses/{course_id}/progress-summary")
 async def get_course_progress_summary(
@@ -324,31 +630,51 @@ async def get_course_progress_summary(
 ):
     """Get course progress summary."""
     summary = await crud.get_course_progress_summary(db, course_id)
-    return {
+    return ORJSONResponse(content={
         "success": True,
         "data": summary,
         "message": "Course progress summary retrieved successfully"
-    }
+    })
 
 # System Analytics Endpoints
 @app.post("/api/v1/analytics/system", response_model=schemas.SystemAnalyticsResponse, status_code=status.HTTP_201_CREATED)
 async def create_system_analytics(
     analytics: schemas.SystemAnalyticsCreate,
     db: AsyncSession = Depends(get_db)
-) -> schemas.SystemAnalyticsResponse:
+) -> Response:
     """Create system analytics record."""
     try:
         db_analytics = await crud.create_system_analytics(db, analytics)
-        return schemas.SystemAnalyticsResponse(
+        return _model_response(schemas.SystemAnalyticsResponse(
             success=True,
             data=db_analytics,
             message="System analytics created successfully"
+        ), status.HTTP_201_CREATED)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to create system analytics: {str(e)}"
         )
+
+@app.post("/api/v1/analytics/system/bulk", status_code=status.HTTP_201_CREATED)
+async def bulk_create_system_analytics(
+    analytics: List[schemas.SystemAnalyticsCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many system analytics records in one request."""
+    try:
+        created = await crud.bulk_create_system_analytics(db, analytics)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create system analytics: {str(e)}"
         )
+    
+    return {
+        "success": True,
+        "data": {"created": created},
+        "message": "System analytics created successfully"
+    }
 
 @app.get("/api/v1/analytics/system/metrics")
 async def get_system_metrics(
@@ -358,57 +684,82 @@ async def get_system_metrics(
 ):
     """Get system metrics for a specific period and category."""
     metrics = await crud.get_system_metrics(db, period, category)
-    return {
+    return ORJSONResponse(content={
         "success": True,
-        "data": metrics,
+        "data": [dict(row) for row in metrics],
         "message": "System metrics retrieved successfully"
-    }
+    })
 
 # Learning Path Analytics Endpoints
 @app.post("/api/v1/analytics/learning-paths", response_model=schemas.LearningPathAnalyticsResponse, status_code=status.HTTP_201_CREATED)
 async def create_learning_path_analytics(
     analytics: schemas.LearningPathAnalyticsCreate,
     db: AsyncSession = Depends(get_db)
-) -> schemas.LearningPathAnalyticsResponse:
+) -> Response:
     """Create learning path analytics record."""
     try:
         db_analytics = await crud.create_learning_path_analytics(db, analytics)
-        return schemas.LearningPathAnalyticsResponse(
+        await cache.invalidate(cache.dashboard_key(analytics.user_id))
+        return _model_response(schemas.LearningPathAnalyticsResponse(
             success=True,
             data=db_analytics,
             message="Learning path analytics created successfully"
+        ), status.HTTP_201_CREATED)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to create learning path analytics: {str(e)}"
         )
+
+@app.post("/api/v1/analytics/learning-paths/bulk", status_code=status.HTTP_201_CREATED)
+async def bulk_create_learning_path_analytics(
+    analytics: List[schemas.LearningPathAnalyticsCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many learning path analytics records in one request."""
+    try:
+        created = await crud.bulk_create_learning_path_analytics(db, analytics)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create learning path analytics: {str(e)}"
         )
+    await cache.invalidate(*{cache.dashboard_key(a.user_id) for a in analytics})
+    
+    return {
+        "success": True,
+        "data": {"created": created},
+        "message": "Learning path analytics created successfully"
+    }
 
 @app.get("/api/v1/analytics/users/{user_id}/learning-path", response_model=schemas.LearningPathAnalyticsResponse)
 async def get_learning_path_analytics(
     user_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
-) -> schemas.LearningPathAnalyticsResponse:
+) -> Response:
     """Get learning path analytics for a user."""
-    db_analytics = await crud.get_learning_path_analytics(db, user_id)
-    if not db_analytics:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Learning path analytics not found"
-        )
+    updated_at = await crud.get_learning_path_analytics_updated_at(db, user_id)
     
-    return schemas.LearningPathAnalyticsResponse(
-        success=True,
-        data=db_analytics,
-        message="Learning path analytics retrieved successfully"
-    )
+    async def load():
+        db_analytics = await crud.get_learning_path_analytics(db, user_id)
+        if not db_analytics:
+            return None
+        return schemas.LearningPathAnalyticsResponse(
+            success=True,
+            data=db_analytics,
+            message="Learning path analytics retrieved successfully"
+        ).model_dump_json().encode()
+    
+    key = cache.record_key("lp", user_id, updated_at) if updated_at else None
+    return await _cached_record_response(request, key, load, "Learning path analytics not found")
 
 @app.put("/api/v1/analytics/users/{user_id}/learning-path", response_model=schemas.LearningPathAnalyticsResponse)
 async def update_learning_path_analytics(
     user_id: int,
     analytics: schemas.LearningPathAnalyticsUpdate,
     db: AsyncSession = Depends(get_db)
-) -> schemas.LearningPathAnalyticsResponse:
+) -> Response:
     """Update learning path analytics."""
     db_analytics = await crud.update_learning_path_analytics(db, user_id, analytics)
     if not db_analytics:
@@ -416,74 +767,60 @@ async def update_learning_path_analytics(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Learning path analytics not found"
         )
+    await cache.invalidate(cache.record_key("lp", user_id, db_analytics.updated_at), cache.dashboard_key(user_id))
     
-    return schemas.LearningPathAnalyticsResponse(
+    return _model_response(schemas.LearningPathAnalyticsResponse(
         success=True,
         data=db_analytics,
         message="Learning path analytics updated successfully"
-    )
+    ))
 
 # Dashboard and Summary Endpoints
-@app.get("/api/v1/analytics/summary", response_model=schemas.AnalyticsSummaryResponse)
+@app.get("/api/v1/analytics/summary", response_model=schemas.AnalyticsSummaryResponse, response_model_exclude_none=True)
 async def get_analytics_summary(
     db: AsyncSession = Depends(get_db)
-) -> schemas.AnalyticsSummaryResponse:
+) -> Response:
     """Get system-wide analytics summary."""
     summary = await crud.get_analytics_summary(db)
-    return schemas.AnalyticsSummaryResponse(
+    return _model_response(schemas.AnalyticsSummaryResponse(
         success=True,
         data=summary,
         message="Analytics summary retrieved successfully"
-    )
+    ), exclude_none=True)
 
-@app.get("/api/v1/analytics/users/{user_id}/dashboard", response_model=schemas.UserDashboardResponse)
+@app.get("/api/v1/analytics/users/{user_id}/dashboard", response_model=schemas.UserDashboardResponse, response_model_exclude_none=True)
 async def get_user_dashboard(
     user_id: int,
     db: AsyncSession = Depends(get_db)
-) -> schemas.UserDashboardResponse:
+) -> Response:
     """Get user dashboard analytics."""
-    dashboard = await crud.get_user_dashboard_analytics(db, user_id)
-    return schemas.UserDashboardResponse(
-        success=True,
-        data=dashboard,
-        message="User dashboard analytics retrieved successfully"
-    )
+    async def load():
+        dashboard = await crud.get_user_dashboard_analytics(db, user_id)
+        return schemas.UserDashboardResponse(
+            success=True,
+            data=dashboard,
+            message="User dashboard analytics retrieved successfully"
+        ).model_dump_json(exclude_none=True).encode()
+    
+    # Cache hits are served as the stored bytes, without decoding or validating them again
+    body = await cache.cached_bytes(cache.dashboard_key(user_id), load)
+    return Response(content=body, media_type="application/json")
 
-@app.get("/api/v1/analytics/courses/{course_id}/performance", response_model=schemas.CoursePerformanceResponse)
+@app.get("/api/v1/analytics/courses/{course_id}/performance", response_model=schemas.CoursePerformanceResponse, response_model_exclude_none=True)
 async def get_course_performance(
     course_id: int,
     db: AsyncSession = Depends(get_db)
-) -> schemas.CoursePerformanceResponse:
+) -> Response:
     """Get comprehensive course performance analytics."""
-    # Get course analytics
-    course_analytics = await crud.get_course_analytics(db, course_id)
-    if not course_analytics:
+    performance_data = await crud.get_course_performance(db, course_id)
+    if not performance_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course analytics not found"
         )
     
-    # Get assessment performance
-    assessment_result = await db.execute(
-        f"SELECT * FROM assessment_analytics WHERE course_id = {course_id}"
-    )
-    assessment_performance = []
-    # This would need proper implementation based on your assessment analytics structure
-    
-    performance_data = {
-        "course_id": course_id,
-        "enrollment_count": course_analytics.total_enrollments,
-        "completion_rate": (course_analytics.completed_enrollments / course_analytics.total_enrollments * 100) if course_analytics.total_enrollments > 0 else 0,
-        "average_grade": course_analytics.average_grade,
-        "average_completion_time": course_analytics.average_completion_time,
-        "engagement_score": course_analytics.engagement_score,
-        "dropout_rate": course_analytics.dropout_rate,
-        "satisfaction_score": course_analytics.satisfaction_score,
-        "assessment_performance": assessment_performance
-    }
-    
-    return schemas.CoursePerformanceResponse(
+    return _model_response(schemas.CoursePerformanceResponse(
         success=True,
         data=performance_data,
         message="Course performance analytics retrieved successfully"
-    )
\ No newline at end of file
+    ), exclude_none=True)
\ No newline at end of file
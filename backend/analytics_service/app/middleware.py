@@ -0,0 +1,30 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+class ASGIRequestTimer:
+    """Pure ASGI middleware that reports handler time in an X-Process-Time header.
+
+    Written against the raw ASGI interface rather than BaseHTTPMiddleware, which
+    wraps every request in an extra task and response stream.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+    
+        start = time.perf_counter()
+    
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - start
+                headers = list(message.get("headers", []))
+                headers.append((b"x-process-time", f"{elapsed:.6f}".encode()))
+                message["headers"] = headers
+            await send(message)
+    
+        await self.app(scope, receive, send_with_timing)
@@ -1,32 +1,41 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Float, Text, Boolean, ForeignKey, JSON, Index, Computed, FetchedValue
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
 
 Base = declarative_base()
 
+# Minimum assessment percentage that counts as a pass
+PASS_THRESHOLD = 70.0
+
+# 64-bit surrogate key; SQLite only autoincrements a column declared exactly INTEGER
+BigIntegerPK = BigInteger().with_variant(Integer, "sqlite")
+# Binary, GIN-indexable JSON on PostgreSQL; plain JSON text elsewhere
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 class UserAnalytics(Base):
     """User analytics and behavior tracking."""
     __tablename__ = "user_analytics"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, index=True, nullable=False)
+    id = Column(BigIntegerPK, primary_key=True)
+    user_id = Column(BigInteger, index=True, nullable=False)
     session_duration = Column(Float, default=0.0)  # in minutes
     login_count = Column(Integer, default=0)
-    last_login = Column(DateTime, default=func.now())
+    last_login = Column(DateTime, server_default=func.now())
     total_courses_enrolled = Column(Integer, default=0)
     completed_courses = Column(Integer, default=0)
     average_grade = Column(Float, default=0.0)
     engagement_score = Column(Float, default=0.0)  # calculated engagement metric
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())  # set by trigger, see database.py
 
 class CourseAnalytics(Base):
     """Course performance and engagement analytics."""
     __tablename__ = "course_analytics"
     
-    id = Column(Integer, primary_key=True, index=True)
-    course_id = Column(Integer, index=True, nullable=False)
+    id = Column(BigIntegerPK, primary_key=True)
+    course_id = Column(BigInteger, index=True, nullable=False)
     total_enrollments = Column(Integer, default=0)
     active_enrollments = Column(Integer, default=0)
     completed_enrollments = Column(Integer, default=0)
@@ -35,86 +44,141 @@ class CourseAnalytics(Base):
     engagement_score = Column(Float, default=0.0)
     dropout_rate = Column(Float, default=0.0)  # percentage
     satisfaction_score = Column(Float, default=0.0)  # from reviews
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
 
 class EnrollmentAnalytics(Base):
     """Detailed enrollment analytics and trends."""
     __tablename__ = "enrollment_analytics"
     
-    id = Column(Integer, primary_key=True, index=True)
-    enrollment_id = Column(Integer, index=True, nullable=False)
-    user_id = Column(Integer, index=True, nullable=False)
-    course_id = Column(Integer, index=True, nullable=False)
-    enrollment_date = Column(DateTime, default=func.now())
+    id = Column(BigIntegerPK, primary_key=True)
+    enrollment_id = Column(BigInteger, index=True, nullable=False)
+    user_id = Column(BigInteger, index=True, nullable=False)
+    course_id = Column(BigInteger, index=True, nullable=False)
+    enrollment_date = Column(DateTime, server_default=func.now())
     completion_date = Column(DateTime, nullable=True)
     time_to_completion = Column(Float, nullable=True)  # in days
     progress_percentage = Column(Float, default=0.0)
     final_grade = Column(Float, nullable=True)
     engagement_level = Column(String(20), default="low")  # low, medium, high
     dropout_reason = Column(String(100), nullable=True)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
 
 class AssessmentAnalytics(Base):
     """Assessment and quiz performance analytics."""
     __tablename__ = "assessment_analytics"
     
-    id = Column(Integer, primary_key=True, index=True)
-    assessment_id = Column(Integer, index=True, nullable=False)
-    user_id = Column(Integer, index=True, nullable=False)
-    course_id = Column(Integer, index=True, nullable=False)
+    id = Column(BigIntegerPK, primary_key=True)
+    assessment_id = Column(BigInteger, index=True, nullable=False)
+    # user_id and course_id are covered by the composite indexes below
+    user_id = Column(BigInteger, nullable=False)
+    course_id = Column(BigInteger, nullable=False)
     score = Column(Float, nullable=True)
     max_score = Column(Float, nullable=False)
-    percentage = Column(Float, nullable=True)
+    # Derived from score/max_score by the database so every write path agrees
+    percentage = Column(
+        Float,
+        Computed("CASE WHEN max_score > 0 THEN score / max_score * 100 END", persisted=True)
+    )
     time_taken = Column(Float, nullable=True)  # in minutes
     attempts = Column(Integer, default=1)
-    passed = Column(Boolean, default=False)
-    submitted_at = Column(DateTime, default=func.now())
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    passed = Column(
+        Boolean,
+        Computed(
+            f"CASE WHEN max_score > 0 AND score IS NOT NULL THEN score / max_score * 100 >= {PASS_THRESHOLD} ELSE false END",
+            persisted=True
+        )
+    )
+    submitted_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
 
 class ProgressAnalytics(Base):
     """Detailed progress tracking analytics."""
     __tablename__ = "progress_analytics"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, index=True, nullable=False)
-    course_id = Column(Integer, index=True, nullable=False)
-    module_id = Column(Integer, index=True, nullable=True)
+    id = Column(BigIntegerPK, primary_key=True)
+    # user_id and course_id are covered by the composite indexes below
+    user_id = Column(BigInteger, nullable=False)
+    course_id = Column(BigInteger, nullable=False)
+    module_id = Column(BigInteger, index=True, nullable=True)
     activity_type = Column(String(50), nullable=False)  # video_watch, quiz_taken, assignment_submitted, etc.
     activity_duration = Column(Float, nullable=True)  # in minutes
     activity_score = Column(Float, nullable=True)
     completion_status = Column(String(20), default="in_progress")  # not_started, in_progress, completed
-    activity_metadata = Column(JSON, nullable=True)  # additional activity data
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    activity_metadata = Column(JSONDocument, nullable=True)  # additional activity data
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
 
 class SystemAnalytics(Base):
     """System-wide analytics and metrics."""
     __tablename__ = "system_analytics"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigIntegerPK, primary_key=True)
     metric_name = Column(String(100), nullable=False)
     metric_value = Column(Float, nullable=False)
     metric_type = Column(String(50), nullable=False)  # count, percentage, average, etc.
     category = Column(String(50), nullable=False)  # users, courses, enrollments, etc.
     period = Column(String(20), nullable=False)  # daily, weekly, monthly, yearly
     period_date = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
 
 class LearningPathAnalytics(Base):
     """Learning path and recommendation analytics."""
     __tablename__ = "learning_path_analytics"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, index=True, nullable=False)
-    path_id = Column(Integer, index=True, nullable=True)
-    recommended_courses = Column(JSON, nullable=True)  # list of recommended course IDs
+    id = Column(BigIntegerPK, primary_key=True)
+    user_id = Column(BigInteger, index=True, nullable=False)
+    path_id = Column(BigInteger, index=True, nullable=True)
+    recommended_courses = Column(JSONDocument, nullable=True)  # list of recommended course IDs
     completion_rate = Column(Float, default=0.0)
     time_to_complete_path = Column(Float, nullable=True)  # in days
-    skill_gaps = Column(JSON, nullable=True)  # identified skill gaps
-    next_recommendations = Column(JSON, nullable=True)  # next recommended actions
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now()) 
\ No newline at end of file
+    skill_gaps = Column(JSONDocument, nullable=True)  # identified skill gaps
+    next_recommendations = Column(JSONDocument, nullable=True)  # next recommended actions
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
+
+# Composite indexes matching the hot query predicates
+Index(
+    "ix_assessment_analytics_user_course_submitted",
+    AssessmentAnalytics.user_id,
+    AssessmentAnalytics.course_id,
+    AssessmentAnalytics.submitted_at.desc()
+)
+Index(
+    "ix_assessment_analytics_course_assessment",
+    AssessmentAnalytics.course_id,
+    AssessmentAnalytics.assessment_id
+)
+Index(
+    "ix_progress_analytics_user_course_created",
+    ProgressAnalytics.user_id,
+    ProgressAnalytics.course_id,
+    ProgressAnalytics.created_at.desc()
+)
+Index(
+    "ix_progress_analytics_course_activity",
+    ProgressAnalytics.course_id,
+    ProgressAnalytics.activity_type
+)
+Index(
+    "ix_system_analytics_period_category_date",
+    SystemAnalytics.period,
+    SystemAnalytics.category,
+    SystemAnalytics.period_date.desc()
+)
+# Partial index over active enrollments (started but not completed)
+Index(
+    "ix_enrollment_analytics_active_course",
+    EnrollmentAnalytics.course_id,
+    postgresql_where=(EnrollmentAnalytics.progress_percentage > 0) & EnrollmentAnalytics.completion_date.is_(None),
+    sqlite_where=(EnrollmentAnalytics.progress_percentage > 0) & EnrollmentAnalytics.completion_date.is_(None)
+)
+# Containment lookups on skill gaps (skill_gaps @> '["sql"]'); PostgreSQL only
+Index(
+    "ix_learning_path_analytics_skill_gaps",
+    LearningPathAnalytics.skill_gaps,
+    postgresql_using="gin"
+).ddl_if(dialect="postgresql")
@@ -0,0 +1,113 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, select, update, case, or_
+import asyncio
+import logging
+import os
+
+from . import cache
+from .crud import (
+    COURSE_METRICS_COLUMNS, LOGIN_NORM, SESSION_NORM, COURSE_NORM, GRADE_NORM,
+    W_LOGIN, W_SESSION, W_COURSE, W_COMPLETION, W_GRADE, MAX_ENGAGEMENT_SCORE
+)
+from .database import AsyncSessionLocal, try_job_lock
+from .models import UserAnalytics, CourseAnalytics, EnrollmentAnalytics
+
+logger = logging.getLogger(__name__)
+
+# Seconds between recomputations of the stored engagement scores and course metrics
+METRICS_REFRESH_INTERVAL = float(os.getenv("ANALYTICS_METRICS_REFRESH_INTERVAL", "60"))
+
+def _capped(expr, cap=1.0):
+    """SQL equivalent of min(expr, cap) that works on both PostgreSQL and SQLite."""
+    return case((expr > cap, cap), else_=expr)
+
+# Same weighted average as crud.calculate_user_engagement_score, evaluated by the database
+ENGAGEMENT_SCORE_EXPR = _capped(
+    (
+        _capped(UserAnalytics.login_count / LOGIN_NORM) * W_LOGIN +
+        _capped(UserAnalytics.session_duration / SESSION_NORM) * W_SESSION +
+        _capped(UserAnalytics.total_courses_enrolled / COURSE_NORM) * W_COURSE +
+        UserAnalytics.completed_courses * 1.0 / case(
+            (UserAnalytics.total_courses_enrolled > 1, UserAnalytics.total_courses_enrolled), else_=1
+        ) * W_COMPLETION +
+        UserAnalytics.average_grade / GRADE_NORM * W_GRADE
+    ) * MAX_ENGAGEMENT_SCORE,
+    MAX_ENGAGEMENT_SCORE
+)
+
+async def refresh_engagement_scores(db: AsyncSession) -> list[Row]:
+    """Store the computed engagement score on every out-of-date user analytics row; return (user_id, updated_at) of each."""
+    result = await db.execute(
+        update(UserAnalytics)
+        .where(UserAnalytics.engagement_score.is_distinct_from(ENGAGEMENT_SCORE_EXPR))
+        .values(engagement_score=ENGAGEMENT_SCORE_EXPR)
+        .returning(UserAnalytics.user_id, UserAnalytics.updated_at)
+    )
+    return result.all()
+
+async def refresh_course_metrics(db: AsyncSession) -> list[Row]:
+    """Store aggregated enrollment metrics on each course analytics row; return (course_id, updated_at) of those changed."""
+    metrics = (
+        select(EnrollmentAnalytics.course_id, *COURSE_METRICS_COLUMNS)
+        .group_by(EnrollmentAnalytics.course_id)
+        .subquery()
+    )
+    fields = [
+        "total_enrollments", "active_enrollments", "completed_enrollments",
+        "average_completion_time", "average_grade", "engagement_score", "dropout_rate"
+    ]
+    result = await db.execute(
+        update(CourseAnalytics)
+        .where(CourseAnalytics.course_id == metrics.c.course_id)
+        .where(or_(*(getattr(CourseAnalytics, f).is_distinct_from(metrics.c[f]) for f in fields)))
+        .values({f: metrics.c[f] for f in fields})
+        .returning(CourseAnalytics.course_id, CourseAnalytics.updated_at)
+    )
+    changed = result.all()
+    
+    # Courses with no enrollment rows produce no group above; zero them instead
+    has_enrollments = (
+        select(EnrollmentAnalytics.id)
+        .where(EnrollmentAnalytics.course_id == CourseAnalytics.course_id)
+        .exists()
+    )
+    result = await db.execute(
+        update(CourseAnalytics)
+        .where(~has_enrollments)
+        .where(or_(*(getattr(CourseAnalytics, f).is_distinct_from(0) for f in fields)))
+        .values({f: 0 for f in fields})
+        .returning(CourseAnalytics.course_id, CourseAnalytics.updated_at)
+    )
+    changed.extend(result.all())
+    return changed
+
+async def refresh_metrics():
+    """Recompute stored engagement scores and course metrics in one transaction."""
+    async with AsyncSessionLocal() as db:
+        if not await try_job_lock(await db.connection(), "analytics_metrics_refresh"):
+            return
+        users = await refresh_engagement_scores(db)
+        courses = await refresh_course_metrics(db)
+        await db.commit()
+    
+    # The UPDATEs bump updated_at, but a same-second bump on SQLite keeps the old
+    # version key, so drop the entries for the new versions as well
+    keys = []
+    for user_id, updated_at in users:
+        keys.append(cache.dashboard_key(user_id))
+        if updated_at:
+            keys.append(cache.record_key("ua", user_id, updated_at))
+    for course_id, updated_at in courses:
+        keys.append(cache.course_metrics_key(course_id))
+        if updated_at:
+            keys.append(cache.record_key("ca", course_id, updated_at))
+    await cache.invalidate(*keys)
+
+async def refresh_metrics_periodically():
+    """Refresh the stored metrics every METRICS_REFRESH_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(METRICS_REFRESH_INTERVAL)
+        try:
+            await refresh_metrics()
+        except Exception:
+            logger.exception("Failed to refresh analytics metrics")
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 from enum import Enum
 
@@ -32,6 +32,25 @@ class PeriodType(str, Enum):
     MONTHLY = "monthly"
     YEARLY = "yearly"
 
+# Literal forms of the enums above, used as the schema field types: pydantic
+# validates a Literal with a plain membership check instead of building an
+# Enum member per value, and the value stays the str the column stores
+EngagementLevelValue = Literal["low", "medium", "high"]
+CompletionStatusValue = Literal["not_started", "in_progress", "completed"]
+ActivityTypeValue = Literal[
+    "video_watch", "quiz_taken", "assignment_submitted", "module_completed", "course_accessed"
+]
+MetricTypeValue = Literal["count", "percentage", "average", "rate"]
+PeriodTypeValue = Literal["daily", "weekly", "monthly", "yearly"]
+
+# Columns every stored analytics record carries
+class TimestampedMixin(BaseModel):
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
 # Base schemas
 class UserAnalyticsBase(BaseModel):
     user_id: int = Field(..., description="User ID")
@@ -51,16 +70,12 @@ class UserAnalyticsUpdate(BaseModel):
     total_courses_enrolled: Optional[int] = None
     completed_courses: Optional[int] = None
     average_grade: Optional[float] = None
-    engagement_score: Optional[float] = None
+    # engagement_score is recomputed by the scheduled metrics refresh
 
-class UserAnalytics(UserAnalyticsBase):
-    id: int
-    last_login: datetime
-    created_at: datetime
-    updated_at: datetime
+    model_config = ConfigDict(extra="forbid")
 
-    class Config:
-        from_attributes = True
+class UserAnalytics(UserAnalyticsBase, TimestampedMixin):
+    last_login: datetime
 
 class CourseAnalyticsBase(BaseModel):
     course_id: int = Field(..., description="Course ID")
@@ -77,22 +92,13 @@ class CourseAnalyticsCreate(CourseAnalyticsBase):
     pass
 
 class CourseAnalyticsUpdate(BaseModel):
-    total_enrollments: Optional[int] = None
-    active_enrollments: Optional[int] = None
-    completed_enrollments: Optional[int] = None
-    average_completion_time: Optional[float] = None
-    average_grade: Optional[float] = None
-    engagement_score: Optional[float] = None
-    dropout_rate: Optional[float] = None
+    # Enrollment-derived metrics are recomputed by the scheduled metrics refresh
     satisfaction_score: Optional[float] = None
 
-class CourseAnalytics(CourseAnalyticsBase):
-    id: int
-    created_at: datetime
-    updated_at: datetime
+    model_config = ConfigDict(extra="forbid")
 
-    class Config:
-        from_attributes = True
+class CourseAnalytics(CourseAnalyticsBase, TimestampedMixin):
+    pass
 
 class EnrollmentAnalyticsBase(BaseModel):
     enrollment_id: int = Field(..., description="Enrollment ID")
@@ -100,7 +106,7 @@ class EnrollmentAnalyticsBase(BaseModel):
     course_id: int = Field(..., description="Course ID")
     progress_percentage: float = Field(0.0, description="Progress percentage")
     final_grade: Optional[float] = Field(None, description="Final grade")
-    engagement_level: EngagementLevel = Field(EngagementLevel.LOW, description="Engagement level")
+    engagement_level: EngagementLevelValue = Field("low", description="Engagement level")
     dropout_reason: Optional[str] = Field(None, description="Reason for dropout")
 
 class EnrollmentAnalyticsCreate(EnrollmentAnalyticsBase):
@@ -111,19 +117,13 @@ class EnrollmentAnalyticsUpdate(BaseModel):
     time_to_completion: Optional[float] = None
     progress_percentage: Optional[float] = None
     final_grade: Optional[float] = None
-    engagement_level: Optional[EngagementLevel] = None
+    engagement_level: Optional[EngagementLevelValue] = None
     dropout_reason: Optional[str] = None
 
-class EnrollmentAnalytics(EnrollmentAnalyticsBase):
-    id: int
+class EnrollmentAnalytics(EnrollmentAnalyticsBase, TimestampedMixin):
     enrollment_date: datetime
     completion_date: Optional[datetime] = None
     time_to_completion: Optional[float] = None
-    created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        from_attributes = True
 
 class AssessmentAnalyticsBase(BaseModel):
     assessment_id: int = Field(..., description="Assessment ID")
@@ -131,38 +131,30 @@ class AssessmentAnalyticsBase(BaseModel):
     course_id: int = Field(..., description="Course ID")
     score: Optional[float] = Field(None, description="Assessment score")
     max_score: float = Field(..., description="Maximum possible score")
-    percentage: Optional[float] = Field(None, description="Score percentage")
     time_taken: Optional[float] = Field(None, description="Time taken in minutes")
     attempts: int = Field(1, description="Number of attempts")
-    passed: bool = Field(False, description="Whether the assessment was passed")
 
 class AssessmentAnalyticsCreate(AssessmentAnalyticsBase):
     pass
 
 class AssessmentAnalyticsUpdate(BaseModel):
     score: Optional[float] = None
-    percentage: Optional[float] = None
     time_taken: Optional[float] = None
     attempts: Optional[int] = None
-    passed: Optional[bool] = None
 
-class AssessmentAnalytics(AssessmentAnalyticsBase):
-    id: int
+class AssessmentAnalytics(AssessmentAnalyticsBase, TimestampedMixin):
+    percentage: Optional[float] = Field(None, description="Score percentage")
+    passed: bool = Field(False, description="Whether the assessment was passed")
     submitted_at: datetime
-    created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        from_attributes = True
 
 class ProgressAnalyticsBase(BaseModel):
     user_id: int = Field(..., description="User ID")
     course_id: int = Field(..., description="Course ID")
     module_id: Optional[int] = Field(None, description="Module ID")
-    activity_type: ActivityType = Field(..., description="Type of activity")
+    activity_type: ActivityTypeValue = Field(..., description="Type of activity")
     activity_duration: Optional[float] = Field(None, description="Activity duration in minutes")
     activity_score: Optional[float] = Field(None, description="Activity score")
-    completion_status: CompletionStatus = Field(CompletionStatus.IN_PROGRESS, description="Completion status")
+    completion_status: CompletionStatusValue = Field("in_progress", description="Completion status")
     activity_metadata: Optional[Dict[str, Any]] = Field(None, description="Additional activity data")
 
 class ProgressAnalyticsCreate(ProgressAnalyticsBase):
@@ -171,23 +163,18 @@ class ProgressAnalyticsCreate(ProgressAnalyticsBase):
 class ProgressAnalyticsUpdate(BaseModel):
     activity_duration: Optional[float] = None
     activity_score: Optional[float] = None
-    completion_status: Optional[CompletionStatus] = None
+    completion_status: Optional[CompletionStatusValue] = None
     activity_metadata: Optional[Dict[str, Any]] = None
 
-class ProgressAnalytics(ProgressAnalyticsBase):
-    id: int
-    created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        from_attributes = True
+class ProgressAnalytics(ProgressAnalyticsBase, TimestampedMixin):
+    pass
 
 class SystemAnalyticsBase(BaseModel):
     metric_name: str = Field(..., description="Name of the metric")
     metric_value: float = Field(..., description="Value of the metric")
-    metric_type: MetricType = Field(..., description="Type of metric")
+    metric_type: MetricTypeValue = Field(..., description="Type of metric")
     category: str = Field(..., description="Category of the metric")
-    period: PeriodType = Field(..., description="Time period")
+    period: PeriodTypeValue = Field(..., description="Time period")
     period_date: datetime = Field(..., description="Date for the period")
 
 class SystemAnalyticsCreate(SystemAnalyticsBase):
@@ -197,13 +184,8 @@ class SystemAnalyticsUpdate(BaseModel):
     metric_value: Optional[float] = None
     period_date: Optional[datetime] = None
 
-class SystemAnalytics(SystemAnalyticsBase):
-    id: int
-    created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        from_attributes = True
+class SystemAnalytics(SystemAnalyticsBase, TimestampedMixin):
+    pass
 
 class LearningPathAnalyticsBase(BaseModel):
     user_id: int = Field(..., description="User ID")
@@ -224,13 +206,8 @@ class LearningPathAnalyticsUpdate(BaseModel):
     skill_gaps: Optional[Dict[str, Any]] = None
     next_recommendations: Optional[Dict[str, Any]] = None
 
-class LearningPathAnalytics(LearningPathAnalyticsBase):
-    id: int
-    created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        from_attributes = True
+class LearningPathAnalytics(LearningPathAnalyticsBase, TimestampedMixin):
+    pass
 
 # Analytics Summary and Dashboard schemas
 class AnalyticsSummary(BaseModel):
@@ -265,7 +242,7 @@ class CoursePerformanceAnalytics(BaseModel):
     assessment_performance: List[Dict[str, Any]] = []
 
 class SystemMetrics(BaseModel):
-    period: PeriodType
+    period: PeriodTypeValue
     period_date: datetime
     metrics: List[SystemAnalytics]
 
@@ -287,9 +264,16 @@ class EnrollmentAnalyticsResponse(AnalyticsResponse):
 class AssessmentAnalyticsResponse(AnalyticsResponse):
     data: AssessmentAnalytics
 
+class AssessmentHistoryResponse(AnalyticsResponse):
+    data: List[AssessmentAnalytics]
+    next_cursor: Optional[str] = None
+
 class ProgressAnalyticsResponse(AnalyticsResponse):
     data: ProgressAnalytics
 
+class ProgressAnalyticsListResponse(AnalyticsResponse):
+    data: List[ProgressAnalytics]
+
 class SystemAnalyticsResponse(AnalyticsResponse):
     data: SystemAnalytics
 
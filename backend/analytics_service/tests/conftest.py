@@ -0,0 +1,56 @@
+import os
+import tempfile
+
+# The engine is built at import time, so point it at a throwaway SQLite file first
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_db_dir, 'analytics_test.db')}"
+
+import httpx
+import pytest_asyncio
+
+from app import cache
+from app.database import engine, create_tables, drop_tables
+from app.main import app
+
+engine.echo = False
+
+class FakeRedis:
+    """In-memory stand-in for the few redis.asyncio calls the cache module makes."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value.encode() if isinstance(value, str) else value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    async def aclose(self):
+        pass
+
+@pytest_asyncio.fixture
+async def db_tables():
+    """Give each test empty analytics tables."""
+    await drop_tables()
+    await create_tables()
+    yield
+
+@pytest_asyncio.fixture
+async def client(db_tables):
+    """HTTP client bound to the app in-process, without the Redis cache."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+@pytest_asyncio.fixture
+async def fake_redis():
+    """Route the response cache through an in-memory FakeRedis for the test."""
+    previous = cache.redis_client
+    cache.redis_client = FakeRedis()
+    yield cache.redis_client
+    cache.redis_client = previous
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.database import AsyncSessionLocal
+from app.models import AssessmentAnalytics
+
+@pytest.mark.asyncio
+async def test_assessment_history_cursor_walks_every_page(client):
+    """Following next_cursor visits each assessment once, newest first, then stops."""
+    response = await client.post(
+        "/api/v1/analytics/assessments/bulk",
+        json=[
+            {"assessment_id": i, "user_id": 1, "course_id": 10, "score": i, "max_score": 10}
+            for i in range(5)
+        ]
+    )
+    assert response.status_code == 201
+
+    seen = []
+    cursor = None
+    for _ in range(10):
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = (await client.get("/api/v1/analytics/users/1/assessments", params=params)).json()
+        seen.extend(a["assessment_id"] for a in page["data"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [4, 3, 2, 1, 0]
+
+@pytest.mark.asyncio
+async def test_assessment_history_cursor_follows_submitted_at_for_backfilled_rows(client):
+    """Rows whose submitted_at runs against their id order are neither skipped nor repeated."""
+    await client.post(
+        "/api/v1/analytics/assessments/bulk",
+        json=[
+            {"assessment_id": i, "user_id": 1, "course_id": 10, "score": i, "max_score": 10}
+            for i in range(6)
+        ]
+    )
+    # Backfill: the newest ids carry the oldest submissions, and two rows share a timestamp
+    now = datetime(2026, 1, 10, 12, 0, 0)
+    submitted = {0: now, 1: now - timedelta(days=1), 2: now - timedelta(days=1), 3: now - timedelta(days=3),
+                 4: now - timedelta(days=4), 5: now - timedelta(days=2)}
+    async with AsyncSessionLocal() as db:
+        for assessment_id, submitted_at in submitted.items():
+            await db.execute(
+                update(AssessmentAnalytics)
+                .where(AssessmentAnalytics.assessment_id == assessment_id)
+                .values(submitted_at=submitted_at)
+            )
+        await db.commit()
+
+    seen = []
+    cursor = None
+    for _ in range(10):
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = (await client.get("/api/v1/analytics/users/1/assessments", params=params)).json()
+        seen.extend(a["assessment_id"] for a in page["data"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [0, 2, 1, 5, 3, 4]
+
+@pytest.mark.asyncio
+async def test_assessment_history_rejects_bad_cursor(client):
+    response = await client.get("/api/v1/analytics/users/1/assessments", params={"cursor": "zzz"})
+    assert response.status_code == 400
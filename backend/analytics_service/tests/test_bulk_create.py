@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from app import crud
+from app.database import AsyncSessionLocal
+from app.models import EnrollmentAnalytics, ProgressAnalytics
+
+def _enrollments(count):
+    return [
+        {"enrollment_id": i, "user_id": i, "course_id": 10, "progress_percentage": 50}
+        for i in range(count)
+    ]
+
+async def _count_enrollments():
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count(EnrollmentAnalytics.id)))
+
+@pytest.mark.asyncio
+async def test_bulk_create_below_copy_threshold(client):
+    response = await client.post("/api/v1/analytics/enrollments/bulk", json=_enrollments(3))
+    assert response.status_code == 201
+    assert response.json()["data"]["created"] == 3
+    assert await _count_enrollments() == 3
+
+@pytest.mark.asyncio
+async def test_bulk_create_above_copy_threshold_falls_back_to_batched_insert(client, monkeypatch):
+    # aiosqlite has no COPY, so a large batch goes through several multi-row INSERTs
+    monkeypatch.setattr(crud, "BULK_INSERT_BATCH_SIZE", 40)
+    count = crud.BULK_COPY_THRESHOLD + 5
+    response = await client.post("/api/v1/analytics/enrollments/bulk", json=_enrollments(count))
+    assert response.status_code == 201
+    assert response.json()["data"]["created"] == count
+    assert await _count_enrollments() == count
+
+    # Column defaults still apply on the fallback path
+    data = (await client.get("/api/v1/analytics/enrollments/0")).json()["data"]
+    assert data["engagement_level"] == "low"
+
+@pytest.mark.asyncio
+async def test_assessment_percentage_and_passed_are_generated(client):
+    response = await client.post("/api/v1/analytics/assessments/bulk", json=[
+        {"assessment_id": 1, "user_id": 1, "course_id": 10, "score": 8, "max_score": 10},
+        {"assessment_id": 2, "user_id": 1, "course_id": 10, "score": 6, "max_score": 10},
+        {"assessment_id": 3, "user_id": 1, "course_id": 10, "score": 5, "max_score": 0}
+    ])
+    assert response.status_code == 201
+
+    results = {}
+    for assessment_id in (1, 2, 3):
+        data = (await client.get(f"/api/v1/analytics/assessments/{assessment_id}/users/1")).json()["data"]
+        results[assessment_id] = (data["percentage"], data["passed"])
+    assert results == {1: (80.0, True), 2: (60.0, False), 3: (None, False)}
+
+def _progress_ndjson(count, bad_line=None):
+    lines = [
+        json.dumps({"user_id": 1, "course_id": 10, "activity_type": "video_watch", "activity_duration": i})
+        for i in range(count)
+    ]
+    if bad_line is not None:
+        lines[bad_line - 1] = '{"user_id": "not a number"}'
+    return ("\n".join(lines) + "\n").encode()
+
+async def _count_progress():
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count(ProgressAnalytics.id)))
+
+@pytest.mark.asyncio
+async def test_progress_ingest_streams_ndjson_in_batches(client, monkeypatch):
+    monkeypatch.setattr(crud, "PROGRESS_INGEST_BATCH_SIZE", 4)
+    response = await client.post("/api/v1/analytics/progress/ingest", content=_progress_ndjson(10))
+    assert response.status_code == 201
+    assert response.json()["data"]["created"] == 10
+    assert await _count_progress() == 10
+
+@pytest.mark.asyncio
+async def test_progress_ingest_rejects_whole_body_on_bad_line(client, monkeypatch):
+    monkeypatch.setattr(crud, "PROGRESS_INGEST_BATCH_SIZE", 4)
+    response = await client.post("/api/v1/analytics/progress/ingest", content=_progress_ndjson(10, bad_line=7))
+    assert response.status_code == 400
+    assert "line 7" in response.json()["detail"]
+    assert await _count_progress() == 0
+
+@pytest.mark.asyncio
+async def test_progress_listing_passes_metadata_json_through(client):
+    metadata = {"video": {"id": 7, "chapters": [1, 2]}, "note": "é"}
+    for activity_metadata in (metadata, None):
+        response = await client.post("/api/v1/analytics/progress", json={
+            "user_id": 1, "course_id": 10, "activity_type": "video_watch", "activity_metadata": activity_metadata
+        })
+        assert response.status_code == 201
+
+    rows = (await client.get("/api/v1/analytics/users/1/progress")).json()["data"]
+    assert sorted((row["activity_metadata"] for row in rows), key=bool) == [None, metadata]
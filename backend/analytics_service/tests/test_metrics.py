@@ -0,0 +1,118 @@
+import pytest
+
+from app import crud
+from app.database import AsyncSessionLocal
+from app.scheduled_jobs import refresh_metrics
+
+ENROLLMENTS = [
+    # (progress_percentage, final_grade, completed, time_to_completion)
+    (0, None, False, None),
+    (50, None, False, None),
+    (100, 90, True, 10),
+    (100, 70, True, 20),
+]
+
+async def _seed_enrollments(client, course_id):
+    for i, (progress, grade, completed, days) in enumerate(ENROLLMENTS):
+        enrollment_id = course_id * 100 + i
+        response = await client.post("/api/v1/analytics/enrollments", json={
+            "enrollment_id": enrollment_id,
+            "user_id": i + 1,
+            "course_id": course_id,
+            "progress_percentage": progress,
+            "final_grade": grade
+        })
+        assert response.status_code == 201
+        if completed:
+            response = await client.put(f"/api/v1/analytics/enrollments/{enrollment_id}", json={
+                "completion_date": "2024-01-01T00:00:00",
+                "time_to_completion": days
+            })
+            assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_calculate_course_metrics_without_enrollments(db_tables):
+    async with AsyncSessionLocal() as db:
+        metrics = await crud.calculate_course_metrics(db, 999)
+
+    assert metrics == {
+        "total_enrollments": 0,
+        "active_enrollments": 0,
+        "completed_enrollments": 0,
+        "average_completion_time": 0.0,
+        "average_grade": 0.0,
+        "engagement_score": 0.0,
+        "dropout_rate": 0.0
+    }
+
+@pytest.mark.asyncio
+async def test_calculate_course_metrics_with_enrollments(client):
+    await _seed_enrollments(client, 10)
+
+    async with AsyncSessionLocal() as db:
+        metrics = await crud.calculate_course_metrics(db, 10)
+
+    assert metrics == {
+        "total_enrollments": 4,
+        "active_enrollments": 1,
+        "completed_enrollments": 2,
+        "average_completion_time": 15.0,
+        "average_grade": 80.0,
+        "engagement_score": 62.5,
+        "dropout_rate": 50.0
+    }
+
+@pytest.mark.asyncio
+async def test_refresh_metrics_stores_engagement_and_course_metrics(client):
+    await client.post("/api/v1/analytics/users", json={
+        "user_id": 1, "login_count": 5, "session_duration": 60,
+        "total_courses_enrolled": 2, "completed_courses": 1, "average_grade": 80
+    })
+    await client.post("/api/v1/analytics/courses", json={"course_id": 10})
+    # Course 20 has stale metrics and no enrollment rows at all
+    await client.post("/api/v1/analytics/courses", json={"course_id": 20, "total_enrollments": 7, "dropout_rate": 30})
+    await _seed_enrollments(client, 10)
+
+    score = (await client.get("/api/v1/analytics/users/1/engagement-score")).json()["data"]["engagement_score"]
+    assert score == 0.0
+
+    await refresh_metrics()
+
+    async with AsyncSessionLocal() as db:
+        expected_score = await crud.calculate_user_engagement_score(db, 1)
+    score = (await client.get("/api/v1/analytics/users/1/engagement-score")).json()["data"]["engagement_score"]
+    assert score == pytest.approx(expected_score)
+
+    course = (await client.get("/api/v1/analytics/courses/10/metrics")).json()["data"]
+    assert course["total_enrollments"] == 4
+    assert course["dropout_rate"] == 50.0
+
+    stale = (await client.get("/api/v1/analytics/courses/20/metrics")).json()["data"]
+    assert stale["total_enrollments"] == 0
+    assert stale["dropout_rate"] == 0.0
+
+@pytest.mark.asyncio
+async def test_job_owned_fields_are_read_only(client):
+    await client.post("/api/v1/analytics/courses", json={"course_id": 10})
+
+    response = await client.put("/api/v1/analytics/courses/10", json={"dropout_rate": 10})
+    assert response.status_code == 422
+    response = await client.put("/api/v1/analytics/courses/10", json={"satisfaction_score": 4.5})
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_bulk_engagement_scores_match_single_user_scores(client, monkeypatch):
+    # Force the threadpool path that large batches take
+    monkeypatch.setattr(crud, "THREADPOOL_MIN_ROWS", 1)
+    for user_id, logins in ((1, 3), (2, 30)):
+        await client.post("/api/v1/analytics/users", json={
+            "user_id": user_id, "login_count": logins, "session_duration": 60,
+            "total_courses_enrolled": 2, "completed_courses": 1, "average_grade": 80
+        })
+
+    response = await client.get("/api/v1/analytics/users/engagement-scores", params=[("user_ids", 1), ("user_ids", 2)])
+    scores = {row["user_id"]: row["engagement_score"] for row in response.json()["data"]}
+
+    async with AsyncSessionLocal() as db:
+        for user_id in (1, 2):
+            assert scores[user_id] == pytest.approx(await crud.calculate_user_engagement_score(db, user_id))
@@ -0,0 +1,92 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from app.database import AsyncSessionLocal
+from app.models import UserAnalytics
+from app.scheduled_jobs import refresh_metrics
+
+USER = {
+    "user_id": 1, "login_count": 5, "session_duration": 60,
+    "total_courses_enrolled": 2, "completed_courses": 1, "average_grade": 80
+}
+
+@pytest.mark.asyncio
+async def test_get_is_served_from_cache_until_put(client, fake_redis):
+    await client.post("/api/v1/analytics/users", json=USER)
+
+    first = await client.get("/api/v1/analytics/users/1")
+    assert first.status_code == 200
+    assert any(key.startswith("ua:1:") for key in fake_redis.store)
+    second = await client.get("/api/v1/analytics/users/1")
+    assert second.content == first.content
+
+    # The PUT lands in the same second on SQLite, so only invalidation keeps this fresh
+    response = await client.put("/api/v1/analytics/users/1", json={"login_count": 9})
+    assert response.status_code == 200
+    third = await client.get("/api/v1/analytics/users/1")
+    assert third.json()["data"]["login_count"] == 9
+
+@pytest.mark.asyncio
+async def test_scheduled_refresh_invalidates_cached_record(client, fake_redis):
+    await client.post("/api/v1/analytics/users", json=USER)
+    before = await client.get("/api/v1/analytics/users/1")
+    assert before.json()["data"]["engagement_score"] == 0.0
+
+    await refresh_metrics()
+
+    after = await client.get("/api/v1/analytics/users/1")
+    assert after.json()["data"]["engagement_score"] > 0.0
+
+@pytest.mark.asyncio
+async def test_record_without_updated_at_is_served_uncached(client, fake_redis):
+    await client.post("/api/v1/analytics/users", json=USER)
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(UserAnalytics).values(updated_at=None))
+        await db.commit()
+
+    response = await client.get("/api/v1/analytics/users/1")
+    assert response.status_code == 200
+    assert response.json()["data"]["user_id"] == 1
+    assert not fake_redis.store
+
+@pytest.mark.asyncio
+async def test_missing_record_is_404(client, fake_redis):
+    response = await client.get("/api/v1/analytics/users/404")
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_matching_etag_is_not_modified(client, fake_redis):
+    await client.post("/api/v1/analytics/users", json=USER)
+
+    first = await client.get("/api/v1/analytics/users/1")
+    etag = first.headers["etag"]
+    not_modified = await client.get("/api/v1/analytics/users/1", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    await client.put("/api/v1/analytics/users/1", json={"login_count": 9})
+    # Without a new second SQLite keeps the same updated_at, so force a fresh version
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(UserAnalytics).values(updated_at=datetime(2030, 1, 1)))
+        await db.commit()
+    changed = await client.get("/api/v1/analytics/users/1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+@pytest.mark.asyncio
+async def test_dashboard_is_cached_as_response_bytes(client, fake_redis):
+    await client.post("/api/v1/analytics/users", json=USER)
+
+    first = await client.get("/api/v1/analytics/users/1/dashboard")
+    assert first.status_code == 200
+    assert fake_redis.store["dashboard:1"] == first.content
+    assert "learning_path_progress" not in first.json()["data"]
+
+    second = await client.get("/api/v1/analytics/users/1/dashboard")
+    assert second.content == first.content
+
+    await client.put("/api/v1/analytics/users/1", json={"completed_courses": 2})
+    third = await client.get("/api/v1/analytics/users/1/dashboard")
+    assert third.json()["data"]["completed_courses"] == 2
@@ -0,0 +1,28 @@
+import typing
+
+import pytest
+
+from app import schemas
+
+@pytest.mark.parametrize("enum, literal", [
+    (schemas.EngagementLevel, schemas.EngagementLevelValue),
+    (schemas.CompletionStatus, schemas.CompletionStatusValue),
+    (schemas.ActivityType, schemas.ActivityTypeValue),
+    (schemas.MetricType, schemas.MetricTypeValue),
+    (schemas.PeriodType, schemas.PeriodTypeValue),
+])
+def test_literal_field_types_match_enums(enum, literal):
+    assert typing.get_args(literal) == tuple(member.value for member in enum)
+
+@pytest.mark.asyncio
+async def test_unknown_activity_type_is_rejected(client):
+    response = await client.post("/api/v1/analytics/progress", json={
+        "user_id": 1, "course_id": 10, "activity_type": "binge_watch"
+    })
+    assert response.status_code == 422
+
+    response = await client.post("/api/v1/analytics/progress", json={
+        "user_id": 1, "course_id": 10, "activity_type": "video_watch"
+    })
+    assert response.status_code == 201
+    assert response.json()["data"]["completion_status"] == "in_progress"
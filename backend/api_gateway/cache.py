@@ -0,0 +1,61 @@
+"""
+Response cache for the gateway's read-heavy, slowly changing GET routes
+Upstream bodies are kept in Redis for a short TTL, so repeat reads are answered
+without a round trip to the service behind them
+"""
+
+import logging
+import os
+from typing import Optional
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+KEY_PREFIX = "gw:"
+
+redis_client: Optional[redis.Redis] = None
+
+async def init_cache():
+    """Create the Redis client."""
+    global redis_client
+    redis_client = redis.from_url(REDIS_URL)
+
+async def close_cache():
+    """Close the Redis client."""
+    global redis_client
+    if redis_client is not None:
+        await redis_client.aclose()
+        redis_client = None
+
+async def get(key: str) -> Optional[bytes]:
+    """Cached body for key, or None on a miss or when Redis is unavailable."""
+    if redis_client is None:
+        return None
+    try:
+        return await redis_client.get(KEY_PREFIX + key)
+    except RedisError:
+        logger.warning("Redis GET failed for %s", key, exc_info=True)
+        return None
+
+async def put(key: str, body: bytes, ttl: int):
+    """Cache body under key for ttl seconds."""
+    if redis_client is None:
+        return
+    try:
+        await redis_client.setex(KEY_PREFIX + key, ttl, body)
+    except RedisError:
+        logger.warning("Redis SETEX failed for %s", key, exc_info=True)
+
+async def invalidate_prefix(prefix: str):
+    """Delete every cached body whose key starts with prefix after a write."""
+    if redis_client is None:
+        return
+    try:
+        keys = [key async for key in redis_client.scan_iter(match=KEY_PREFIX + prefix + "*")]
+        if keys:
+            await redis_client.delete(*keys)
+    except RedisError:
+        logger.warning("Redis invalidation failed for %s", prefix, exc_info=True)
@@ -0,0 +1,72 @@
+"""
+Circuit breaking for the gateway's upstream calls
+Stops sending requests to a service that keeps failing, so callers get an
+immediate error instead of each waiting out the full timeout
+"""
+
+import time
+
+import httpx
+
+class CircuitOpenError(httpx.RequestError):
+    """Raised instead of sending a request while a service's circuit is open."""
+
+class CircuitBreaker:
+    """Failure counter for one upstream service.
+
+    After failure_threshold consecutive failures the circuit opens and requests
+    are refused for reset_timeout seconds. The first request after that is let
+    through as a probe: success closes the circuit, another failure reopens it
+    for a further reset_timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            return False
+        # Let this request probe the service; the rest wait out another window
+        self.opened_at = now
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """Transport that sends requests through a CircuitBreaker.
+
+    Connect failures and timeouts count against the circuit; any response, error
+    status included, shows the service is reachable and resets it.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, breaker: CircuitBreaker):
+        self.transport = transport
+        self.breaker = breaker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.breaker.allow():
+            raise CircuitOpenError("circuit open, request not sent", request=request)
+        try:
+            response = await self.transport.handle_async_request(request)
+        except (httpx.ConnectError, httpx.TimeoutException):
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
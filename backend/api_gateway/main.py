@@ -3,15 +3,25 @@ API Gateway for LMS Microservices
 Provides unified API endpoints for frontend integration
 """
 
+import asyncio
 import httpx
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import Dict, Any, Optional
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from typing import AsyncIterator, Dict, Any, Optional
+from contextlib import asynccontextmanager
+from functools import lru_cache
 import jwt
+import orjson
 import os
+import time
 from datetime import datetime
 
+import cache
+from circuit_breaker import CircuitBreaker, CircuitBreakerTransport, CircuitOpenError
+
 # Service URLs
 SERVICES = {
     "user": "http://localhost:8001",
@@ -24,11 +34,79 @@ SERVICES = {
     "analytics": "http://localhost:8005"
 }
 
+# Parsed upstream URLs kept per (service, path); static routes always hit, and
+# paths with IDs hit for the records being requested most
+URL_CACHE_SIZE = int(os.getenv("GATEWAY_URL_CACHE_SIZE", "4096"))
+
 # JWT Configuration
 SECRET_KEY = "your-secret-key-here"
 ALGORITHM = "HS256"
+# Decoded tokens kept in memory, so a client's repeat requests skip the HMAC check
+TOKEN_CACHE_SIZE = int(os.getenv("GATEWAY_TOKEN_CACHE_SIZE", "8192"))
+
+# Client headers passed on to upstream services, as the lowercase byte names ASGI
+# delivers them in; calls that forward a body also keep its content type and length
+FORWARDED_HEADERS = frozenset((b"authorization", b"x-request-id", b"x-trace-id"))
+BODY_FORWARDED_HEADERS = FORWARDED_HEADERS | {b"content-type", b"content-length"}
+
+# One pooled client per upstream service, shared by every call to it, so
+# connections are kept alive between requests; a slow service can only use up
+# its own pool, since httpx limits connections per client rather than per host
+UPSTREAM_TIMEOUT = httpx.Timeout(
+    float(os.getenv("GATEWAY_UPSTREAM_TIMEOUT", "10.0")),
+    connect=float(os.getenv("GATEWAY_CONNECT_TIMEOUT", "2.0"))
+)
+UPSTREAM_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("GATEWAY_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("GATEWAY_MAX_KEEPALIVE_CONNECTIONS", "20")),
+    keepalive_expiry=float(os.getenv("GATEWAY_KEEPALIVE_EXPIRY", "30.0"))
+)
+# Consecutive connect failures or timeouts after which calls to a service fail
+# fast with 503, and the seconds to wait before trying it again
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("GATEWAY_BREAKER_FAILURES", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("GATEWAY_BREAKER_RESET_TIMEOUT", "30.0"))
+
+# Seconds a cached upstream body is served for by the routes that use the
+# Redis response cache; per-user analytics change faster than catalog data
+ANALYTICS_CACHE_TTL = int(os.getenv("GATEWAY_ANALYTICS_CACHE_TTL", "60"))
+CATALOG_CACHE_TTL = int(os.getenv("GATEWAY_CATALOG_CACHE_TTL", "300"))
+
+# Seconds a request may spend waiting on upstream services in total. Clients
+# can shorten it with X-Budget-Ms, and callers further up a chain pass their
+# own X-Request-Deadline; the deadline is sent on so services can honour it too
+REQUEST_BUDGET = float(os.getenv("GATEWAY_REQUEST_BUDGET", "10.0"))
+MIN_UPSTREAM_TIMEOUT = 0.05
+
+# Per-call budget for the dashboard's concurrent upstream calls, so one slow
+# service fails the dashboard quickly instead of holding it for the full timeout
+DASHBOARD_CALL_TIMEOUT = float(os.getenv("GATEWAY_DASHBOARD_CALL_TIMEOUT", "3.0"))
+
+http_clients = {
+    service: httpx.AsyncClient(
+        timeout=UPSTREAM_TIMEOUT,
+        transport=CircuitBreakerTransport(
+            httpx.AsyncHTTPTransport(limits=UPSTREAM_LIMITS),
+            CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+        )
+    )
+    for service in SERVICES
+}
 
-app = FastAPI(title="LMS API Gateway", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect the response cache on startup; close it and the upstream clients on shutdown."""
+    await cache.init_cache()
+    yield
+    await cache.close_cache()
+    for client in http_clients.values():
+        await client.aclose()
+
+app = FastAPI(
+    title="LMS API Gateway",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # CORS middleware
 app.add_middleware(
@@ -39,6 +117,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class _OrjsonJWT(jwt.PyJWT):
+    """PyJWT decoder that parses the token payload with orjson instead of the stdlib json module."""
+
+    def _decode_payload(self, decoded: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise jwt.DecodeError(f"Invalid payload string: {e}") from e
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+_jwt = _OrjsonJWT()
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _decode_token(token: str) -> Dict[str, Any]:
+    """Verify and decode a JWT; invalid tokens raise and are never cached."""
+    return _jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
 async def verify_token(request: Request) -> Optional[Dict[str, Any]]:
     """Verify JWT token from Authorization header."""
     auth_header = request.headers.get("Authorization")
@@ -47,22 +144,210 @@ async def verify_token(request: Request) -> Optional[Dict[str, Any]]:
     
     token = auth_header.split(" ")[1]
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = _decode_token(token)
     except jwt.PyJWTError:
         return None
+    
+    # A cached payload was only checked for expiry when it was first decoded
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        return None
+    return dict(payload)
 
 async def get_current_user(request: Request) -> Dict[str, Any]:
-    """Get current user from JWT token."""
-    payload = await verify_token(request)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    """Get current user from JWT token, decoding it at most once per request."""
+    payload = getattr(request.state, "user", None)
+    if payload is None:
+        payload = await verify_token(request)
+        if not payload:
+            raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+        request.state.user = payload
     return payload
 
+async def require_admin(user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+    """Get current user, rejecting anyone without the admin role."""
+    if user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    return user
+
+def _forward_headers(request: Request, names: frozenset = FORWARDED_HEADERS) -> Dict[bytes, bytes]:
+    """Pick the headers to pass upstream straight from the raw ASGI header list."""
+    return {name: value for name, value in request.headers.raw if name in names}
+
+def _upstream_timeout(
+    request: Optional[Request], headers: Dict[bytes, bytes], limit: Optional[float] = None
+) -> httpx.Timeout:
+    """Timeout for an upstream call from what is left of the request's budget.
+
+    Adds the request's deadline to the headers sent upstream, as unix milliseconds.
+    A budget header that is not a number is ignored.
+    """
+    now = time.time()
+    deadline = now + REQUEST_BUDGET
+    if request is not None:
+        for name, base in (("x-budget-ms", now), ("x-request-deadline", 0.0)):
+            if name in request.headers:
+                try:
+                    deadline = min(deadline, base + float(request.headers[name]) / 1000)
+                except ValueError:
+                    pass
+    headers[b"x-request-deadline"] = str(int(deadline * 1000)).encode()
+    
+    remaining = max(MIN_UPSTREAM_TIMEOUT, deadline - now)
+    if limit is not None:
+        remaining = min(remaining, limit)
+    return httpx.Timeout(remaining, connect=min(UPSTREAM_TIMEOUT.connect, remaining))
+
+def _passthrough(response: httpx.Response) -> Response:
+    """Relay an upstream response body as-is, without decoding and re-encoding it."""
+    return Response(
+        content=response.content,
+        status_code=response.status_code,
+        media_type=response.headers.get("content-type", "application/json")
+    )
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _service_url(service: str, path: str) -> httpx.URL:
+    """Parsed upstream URL for a path on a service, cached so repeat calls skip URL parsing."""
+    return httpx.URL(f"{SERVICES[service]}{path}")
+
+async def _enveloped(chunks: AsyncIterator[bytes], message: str) -> AsyncIterator[bytes]:
+    """Yield an upstream JSON body inside the frontend's success envelope, chunk by chunk."""
+    yield b'{"success":true,"data":'
+    async for chunk in chunks:
+        yield chunk
+    yield b',"message":' + orjson.dumps(message) + b"}"
+
+async def _proxy(
+    request: Optional[Request],
+    service: str,
+    path: str,
+    method: str = "GET",
+    params: Optional[Dict[str, Any]] = None,
+    forward_body: bool = False,
+    message: Optional[str] = None,
+    status_code: int = 200
+) -> StreamingResponse:
+    """Forward a call to an upstream service and stream its response back as it arrives.
+
+    The caller's FORWARDED_HEADERS are passed on whenever a request is given,
+    and its body too with forward_body. Bodies are streamed both ways without
+    being parsed: the gateway holds one chunk at a time, and each side starts
+    receiving before the other has finished sending. With a message, the body
+    is streamed inside the frontend's success envelope under status_code.
+    """
+    headers = {}
+    content = None
+    if request is not None:
+        if forward_body:
+            headers = _forward_headers(request, BODY_FORWARDED_HEADERS)
+            # Clients posting JSON without saying so still reach services as JSON
+            headers.setdefault(b"content-type", b"application/json")
+            content = request.stream()
+        else:
+            headers = _forward_headers(request)
+    timeout = _upstream_timeout(request, headers)
+    client = http_clients[service]
+    upstream = await client.send(
+        client.build_request(
+            method,
+            _service_url(service, path),
+            params=params,
+            content=content,
+            headers=headers,
+            timeout=timeout,
+            extensions={"service": service}
+        ),
+        stream=True
+    )
+    content_type = upstream.headers.get("content-type", "application/json")
+    response_headers = {}
+    if message is None:
+        # Raw bytes are relayed still encoded, so the encoding has to go with them
+        body = upstream.aiter_raw()
+        if "content-encoding" in upstream.headers:
+            response_headers["Content-Encoding"] = upstream.headers["content-encoding"]
+        status_code = upstream.status_code
+    else:
+        if not content_type.startswith("application/json") or upstream.headers.get("content-length") == "0":
+            await upstream.aclose()
+            raise HTTPException(
+                status_code=500,
+                detail=f"{service.capitalize()} service error: expected a JSON body, got {content_type!r}"
+            )
+        body = _enveloped(upstream.aiter_bytes(), message)
+        content_type = "application/json"
+    return StreamingResponse(
+        body,
+        status_code=status_code,
+        media_type=content_type,
+        headers=response_headers,
+        background=BackgroundTask(upstream.aclose)
+    )
+
+async def _cached_proxy(
+    request: Optional[Request],
+    service: str,
+    path: str,
+    key: str,
+    ttl: int,
+    params: Optional[Dict[str, Any]] = None
+) -> Response:
+    """GET from an upstream service through the Redis response cache.
+
+    Only 200 JSON bodies are cached, so errors always reach the service again.
+    Keys for per-user data must include the user, since the cached body is
+    served to anyone whose request maps to the same key.
+    """
+    body = await cache.get(key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+    
+    headers = _forward_headers(request) if request is not None else {}
+    timeout = _upstream_timeout(request, headers)
+    response = await http_clients[service].get(
+        _service_url(service, path), params=params, headers=headers, timeout=timeout, extensions={"service": service}
+    )
+    if response.status_code == 200 and response.headers.get("content-type", "").startswith("application/json"):
+        await cache.put(key, response.content, ttl)
+    return _passthrough(response)
+
+@app.exception_handler(StarletteHTTPException)
+async def http_error(request: Request, exc: StarletteHTTPException) -> Response:
+    """Serialize the gateway's own error responses with orjson like every other body it builds."""
+    if exc.status_code in (204, 304):
+        return Response(status_code=exc.status_code, headers=exc.headers)
+    return ORJSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers)
+
+@app.exception_handler(CircuitOpenError)
+async def upstream_circuit_open(request: Request, exc: CircuitOpenError) -> Response:
+    """Answer with a 503 straight away while a service's circuit is open."""
+    service = exc.request.extensions.get("service", "upstream")
+    return ORJSONResponse(status_code=503, content={"detail": f"{service.capitalize()} service unavailable"})
+
+@app.exception_handler(httpx.RequestError)
+async def upstream_request_error(request: Request, exc: httpx.RequestError) -> Response:
+    """Answer with a 500 naming the service when an upstream call fails to connect, send or time out."""
+    service = exc.request.extensions.get("service", "upstream")
+    return ORJSONResponse(status_code=500, content={"detail": f"{service.capitalize()} service error: {str(exc)}"})
+
+# Health check body, rebuilt at most once a second however often it is polled
+_health_second = 0
+_health_body = b""
+
 @app.get("/api/health")
 async def health_check():
     """Health check for API gateway."""
-    return {"status": "ok", "gateway": "running", "timestamp": datetime.utcnow().isoformat()}
+    global _health_second, _health_body
+    now = int(time.time())
+    if now != _health_second:
+        _health_second = now
+        _health_body = orjson.dumps({
+            "status": "ok",
+            "gateway": "running",
+            "timestamp": datetime.utcfromtimestamp(now).isoformat()
+        })
+    return Response(content=_health_body, media_type="application/json")
 
 # ============================================================================
 # AUTHENTICATION ENDPOINTS
@@ -71,82 +356,31 @@ async def health_check():
 @app.post("/api/auth/login")
 async def login(request: Request):
     """Login endpoint - forwards to user service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{SERVICES['user']}/api/v1/auth/login",
-                json=await request.json(),
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"User service error: {str(e)}")
+    return await _proxy(request, "user", "/api/v1/auth/login", "POST", forward_body=True)
 
 @app.post("/api/auth/register")
 async def register(request: Request):
     """Register endpoint - forwards to user service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{SERVICES['user']}/api/v1/auth/register",
-                json=await request.json(),
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"User service error: {str(e)}")
+    return await _proxy(request, "user", "/api/v1/auth/register", "POST", forward_body=True)
 
 @app.post("/api/auth/logout")
 async def logout(request: Request):
     """Logout endpoint - forwards to user service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.post(
-                f"{SERVICES['user']}/api/v1/auth/logout",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"User service error: {str(e)}")
+    return await _proxy(request, "user", "/api/v1/auth/logout", "POST")
 
 # ============================================================================
 # USER ENDPOINTS
 # ============================================================================
 
 @app.get("/api/users/me")
-async def get_current_user_info(request: Request):
+async def get_current_user_info(request: Request, user: Dict[str, Any] = Depends(get_current_user)):
     """Get current user info - forwards to user service."""
-    user = await get_current_user(request)
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['user']}/api/v1/users/me",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"User service error: {str(e)}")
+    return await _proxy(request, "user", "/api/v1/users/me")
 
 @app.put("/api/users/me")
-async def update_user_profile(request: Request):
+async def update_user_profile(request: Request, user: Dict[str, Any] = Depends(get_current_user)):
     """Update user profile - forwards to user service."""
-    user = await get_current_user(request)
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.put(
-                f"{SERVICES['user']}/api/v1/users/{user['sub']}",
-                json=await request.json(),
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"User service error: {str(e)}")
+    return await _proxy(request, "user", f"/api/v1/users/{user['sub']}", "PUT", forward_body=True)
 
 
 
@@ -155,81 +389,24 @@ async def update_user_profile(request: Request):
 # ============================================================================
 
 @app.get("/api/admin/users")
-async def get_all_users(request: Request):
+async def get_all_users(request: Request, user: Dict[str, Any] = Depends(require_admin)):
     """Get all users (admin only) - forwards to user service."""
-    user = await get_current_user(request)
-    if user.get("role") != "admin":
-        raise HTTPException(status_code=403, detail="Admin privileges required")
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['user']}/api/v1/users",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"User service error: {str(e)}")
+    return await _proxy(request, "user", "/api/v1/users")
 
 @app.put("/api/admin/users/{user_id}")
-async def update_user(user_id: int, request: Request):
+async def update_user(user_id: int, request: Request, user: Dict[str, Any] = Depends(require_admin)):
     """Update user (admin only) - forwards to user service."""
-    user = await get_current_user(request)
-    if user.get("role") != "admin":
-        raise HTTPException(status_code=403, detail="Admin privileges required")
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.put(
-                f"{SERVICES['user']}/api/v1/users/{user_id}",
-                json=await request.json(),
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"User service error: {str(e)}")
+    return await _proxy(request, "user", f"/api/v1/users/{user_id}", "PUT", forward_body=True)
 
 @app.delete("/api/admin/users/{user_id}")
-async def delete_user(user_id: int, request: Request):
+async def delete_user(user_id: int, request: Request, user: Dict[str, Any] = Depends(require_admin)):
     """Delete user (admin only) - forwards to user service."""
-    user = await get_current_user(request)
-    if user.get("role") != "admin":
-        raise HTTPException(status_code=403, detail="Admin privileges required")
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.delete(
-                f"{SERVICES['user']}/api/v1/users/{user_id}",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"User service error: {str(e)}")
+    return await _proxy(request, "user", f"/api/v1/users/{user_id}", "DELETE")
 
 @app.get("/api/admin/stats")
-async def get_admin_stats(request: Request):
+async def get_admin_stats(request: Request, user: Dict[str, Any] = Depends(require_admin)):
     """Get admin statistics - forwards to user service."""
-    user = await get_current_user(request)
-    if user.get("role") != "admin":
-        raise HTTPException(status_code=403, detail="Admin privileges required")
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['user']}/api/v1/stats/users",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"User service error: {str(e)}")
+    return await _proxy(request, "user", "/api/v1/stats/users")
 
 # ============================================================================
 # COURSE ENDPOINTS
@@ -244,146 +421,55 @@ async def get_courses(
     instructor: Optional[str] = None
 ):
     """Get courses - forwards to course service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            params = {"skip": skip, "limit": limit}
-            if search:
-                params["search"] = search
-            if category:
-                params["category"] = category
-            if instructor:
-                params["instructor"] = instructor
-            
-            response = await client.get(
-                f"{SERVICES['course']}/api/v1/courses",
-                params=params,
-                timeout=10.0
-            )
-            # Wrap the response in the expected format for frontend
-            data = response.json()
-            return JSONResponse(
-                content={"success": True, "data": data, "message": "Courses retrieved successfully"},
-                status_code=200
-            )
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Course service error: {str(e)}")
+    params = {"skip": skip, "limit": limit}
+    if search:
+        params["search"] = search
+    if category:
+        params["category"] = category
+    if instructor:
+        params["instructor"] = instructor
+    
+    # Wrap the response in the expected format for frontend
+    return await _proxy(None, "course", "/api/v1/courses", params=params, message="Courses retrieved successfully")
 
 @app.get("/api/courses/{course_id}")
 async def get_course(course_id: int):
     """Get specific course - forwards to course service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{SERVICES['course']}/api/v1/courses/{course_id}",
-                timeout=10.0
-            )
-            # Wrap the response in the expected format for frontend
-            data = response.json()
-            return JSONResponse(
-                content={"success": True, "data": data, "message": "Course retrieved successfully"},
-                status_code=200
-            )
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Course service error: {str(e)}")
+    # Wrap the response in the expected format for frontend
+    return await _proxy(None, "course", f"/api/v1/courses/{course_id}", message="Course retrieved successfully")
 
 @app.post("/api/courses")
-async def create_course(request: Request):
+async def create_course(request: Request, user: Dict[str, Any] = Depends(get_current_user)):
     """Create course - forwards to course service."""
-    user = await get_current_user(request)
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.post(
-                f"{SERVICES['course']}/api/v1/courses",
-                json=await request.json(),
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Course service error: {str(e)}")
+    return await _proxy(request, "course", "/api/v1/courses", "POST", forward_body=True)
 
 @app.put("/api/admin/courses/{course_id}")
-async def update_course(course_id: int, request: Request):
+async def update_course(course_id: int, request: Request, user: Dict[str, Any] = Depends(require_admin)):
     """Update course (admin only) - forwards to course service."""
-    user = await get_current_user(request)
-    if user.get("role") != "admin":
-        raise HTTPException(status_code=403, detail="Admin privileges required")
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.put(
-                f"{SERVICES['course']}/api/v1/courses/{course_id}",
-                json=await request.json(),
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Course service error: {str(e)}")
+    return await _proxy(request, "course", f"/api/v1/courses/{course_id}", "PUT", forward_body=True)
 
 @app.delete("/api/admin/courses/{course_id}")
-async def delete_course(course_id: int, request: Request):
+async def delete_course(course_id: int, request: Request, user: Dict[str, Any] = Depends(require_admin)):
     """Delete course (admin only) - forwards to course service."""
-    user = await get_current_user(request)
-    if user.get("role") != "admin":
-        raise HTTPException(status_code=403, detail="Admin privileges required")
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.delete(
-                f"{SERVICES['course']}/api/v1/courses/{course_id}",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Course service error: {str(e)}")
+    return await _proxy(request, "course", f"/api/v1/courses/{course_id}", "DELETE")
 
 # ============================================================================
 # ENROLLMENT ENDPOINTS
 # ============================================================================
 
 @app.post("/api/enrollments")
-async def enroll_in_course(request: Request):
+async def enroll_in_course(request: Request, user: Dict[str, Any] = Depends(get_current_user)):
     """Enroll in course - forwards to enrollment service."""
-    user = await get_current_user(request)
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.post(
-                f"{SERVICES['enrollment']}/api/v1/enrollments",
-                json=await request.json(),
-                headers=headers,
-                timeout=10.0
-            )
-            # Wrap the response in the expected format for frontend
-            data = response.json()
-            return JSONResponse(
-                content={"success": True, "data": data, "message": "Enrollment successful"},
-                status_code=201
-            )
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Enrollment service error: {str(e)}")
+    # Wrap the response in the expected format for frontend
+    return await _proxy(
+        request, "enrollment", "/api/v1/enrollments", "POST",
+        forward_body=True, message="Enrollment successful", status_code=201
+    )
 
 @app.get("/api/enrollments")
-async def get_enrollments(request: Request):
+async def get_enrollments(request: Request, user: Dict[str, Any] = Depends(get_current_user)):
     """Get user enrollments - forwards to enrollment service."""
-    user = await get_current_user(request)
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['enrollment']}/api/v1/enrollments",
-                params={"user_id": user["sub"]},
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Enrollment service error: {str(e)}")
+    return await _proxy(request, "enrollment", "/api/v1/enrollments", params={"user_id": user["sub"]})
 
 # ============================================================================
 # CONTENT ENDPOINTS
@@ -398,92 +484,49 @@ async def get_content(
     course_id: Optional[int] = None
 ):
     """Get content - forwards to content service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            params = {"skip": skip, "limit": limit}
-            if search:
-                params["search"] = search
-            if content_type:
-                params["content_type"] = content_type
-            if course_id:
-                params["course_id"] = course_id
-            
-            response = await client.get(
-                f"{SERVICES['content']}/api/v1/content",
-                params=params,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Content service error: {str(e)}")
+    params = {"skip": skip, "limit": limit}
+    if search:
+        params["search"] = search
+    if content_type:
+        params["content_type"] = content_type
+    if course_id:
+        params["course_id"] = course_id
+    
+    return await _proxy(None, "content", "/api/v1/content", params=params)
 
 @app.get("/api/content/{content_id}")
 async def get_content_by_id(content_id: int):
     """Get specific content - forwards to content service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{SERVICES['content']}/api/v1/content/{content_id}",
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Content service error: {str(e)}")
+    return await _proxy(None, "content", f"/api/v1/content/{content_id}")
 
 @app.post("/api/content/upload")
-async def upload_content(request: Request):
+async def upload_content(request: Request, user: Dict[str, Any] = Depends(get_current_user)):
     """Upload content - forwards to content service."""
-    user = await get_current_user(request)
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.post(
-                f"{SERVICES['content']}/api/v1/content/upload",
-                data=await request.form(),
-                headers=headers,
-                timeout=30.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Content service error: {str(e)}")
+    # Stream the multipart body through as it arrives instead of parsing the form
+    # into memory and re-encoding it; the boundary travels in the content type
+    headers = _forward_headers(request, BODY_FORWARDED_HEADERS)
+    response = await http_clients["content"].post(
+        _service_url("content", "/api/v1/content/upload"),
+        content=request.stream(),
+        headers=headers,
+        timeout=30.0,
+        extensions={"service": "content"}
+    )
+    return _passthrough(response)
 
 # ============================================================================
 # PROGRESS ENDPOINTS
 # ============================================================================
 
 @app.get("/api/progress")
-async def get_progress(request: Request):
+async def get_progress(request: Request, user: Dict[str, Any] = Depends(get_current_user)):
     """Get user progress - forwards to progress service."""
-    user = await get_current_user(request)
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['progress']}/api/v1/progress",
-                params={"user_id": user["sub"]},
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Progress service error: {str(e)}")
+    return await _proxy(request, "progress", "/api/v1/progress", params={"user_id": user["sub"]})
 
 @app.post("/api/progress")
-async def update_progress(request: Request):
+async def update_progress(request: Request, user: Dict[str, Any] = Depends(get_current_user)):
     """Update progress - forwards to progress service."""
-    user = await get_current_user(request)
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.post(
-                f"{SERVICES['progress']}/api/v1/progress",
-                json=await request.json(),
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Progress service error: {str(e)}")
+    return await _proxy(request, "progress", "/api/v1/progress", "POST", forward_body=True)
 
 # ============================================================================
 # ASSESSMENT ENDPOINTS
@@ -495,274 +538,138 @@ async def get_assessments(
     assessment_type: Optional[str] = None
 ):
     """Get assessments - forwards to assessment service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            params = {}
-            if course_id:
-                params["course_id"] = course_id
-            if assessment_type:
-                params["assessment_type"] = assessment_type
-            
-            response = await client.get(
-                f"{SERVICES['assessment']}/api/v1/assessments",
-                params=params,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Assessment service error: {str(e)}")
+    params = {}
+    if course_id:
+        params["course_id"] = course_id
+    if assessment_type:
+        params["assessment_type"] = assessment_type
+    
+    return await _cached_proxy(
+        None, "assessment", "/api/v1/assessments",
+        f"assessments:{course_id}:{assessment_type}", CATALOG_CACHE_TTL, params=params
+    )
 
 @app.get("/api/assessments/{assessment_id}")
 async def get_assessment(assessment_id: int):
     """Get specific assessment - forwards to assessment service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{SERVICES['assessment']}/api/v1/assessments/{assessment_id}",
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Assessment service error: {str(e)}")
+    return await _cached_proxy(
+        None, "assessment", f"/api/v1/assessments/{assessment_id}", f"assessment:{assessment_id}", CATALOG_CACHE_TTL
+    )
 
 # ============================================================================
 # ANALYTICS ENDPOINTS
 # ============================================================================
 
 @app.get("/api/analytics/dashboard")
-async def get_dashboard_analytics(request: Request):
+async def get_dashboard_analytics(request: Request, user: Dict[str, Any] = Depends(get_current_user)):
     """Get dashboard analytics - forwards to analytics service."""
-    user = await get_current_user(request)
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['analytics']}/api/v1/analytics/users/{user['sub']}/dashboard",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Analytics service error: {str(e)}")
+    return await _cached_proxy(
+        request, "analytics", f"/api/v1/analytics/users/{user['sub']}/dashboard",
+        f"analytics-dashboard:{user['sub']}", ANALYTICS_CACHE_TTL
+    )
 
 @app.get("/api/analytics/courses/{course_id}")
-async def get_course_analytics(course_id: int, request: Request):
+async def get_course_analytics(course_id: int, request: Request, user: Dict[str, Any] = Depends(get_current_user)):
     """Get course analytics - forwards to analytics service."""
-    user = await get_current_user(request)
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['analytics']}/api/v1/analytics/courses/{course_id}",
-                params={"user_id": user["sub"]},
+    return await _proxy(request, "analytics", f"/api/v1/analytics/courses/{course_id}", params={"user_id": user["sub"]})
+
+@app.get("/api/dashboard/me")
+async def get_my_dashboard(request: Request, user: Dict[str, Any] = Depends(get_current_user)):
+    """Get the user's dashboard - fetches enrollments, analytics and learning path concurrently."""
+    headers = _forward_headers(request)
+    timeout = _upstream_timeout(request, headers, limit=DASHBOARD_CALL_TIMEOUT)
+    calls = [
+        ("enrollment", "/api/v1/enrollments", {"user_id": user["sub"]}),
+        ("analytics", f"/api/v1/analytics/users/{user['sub']}/dashboard", None),
+        ("analytics", f"/api/v1/analytics/users/{user['sub']}/learning-path", None)
+    ]
+    # One round trip of latency for all three instead of one after another
+    responses = await asyncio.gather(
+        *(
+            http_clients[service].get(
+                _service_url(service, path),
+                params=params,
                 headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Analytics service error: {str(e)}")
+                timeout=timeout,
+                extensions={"service": service}
+            )
+            for service, path, params in calls
+        ),
+        return_exceptions=True
+    )
+    for response in responses:
+        if isinstance(response, Exception):
+            raise response
+    
+    enrollments, analytics, learning_path = responses
+    # A user without a learning path yet still gets a dashboard
+    for response in (enrollments, analytics, learning_path):
+        if response.is_error and not (response is learning_path and response.status_code == 404):
+            return _passthrough(response)
+    
+    try:
+        data = {
+            "enrollments": orjson.Fragment(enrollments.content),
+            "analytics": orjson.loads(analytics.content)["data"],
+            "learning_path": orjson.loads(learning_path.content)["data"] if learning_path.status_code != 404 else None
+        }
+    except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=500, detail=f"Analytics service error: {str(e)}")
+    return Response(
+        content=orjson.dumps({"success": True, "data": data, "message": "Dashboard retrieved successfully"}),
+        media_type="application/json"
+    )
 
 # ============================================================================
 # COMMUNICATION ENDPOINTS
 # ============================================================================
 
-@app.post("/api/messages")
-async def create_message(request: Request):
-    """Create a new message - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.post(
-                f"{SERVICES['communication']}/api/v1/messages",
-                json=await request.json(),
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
-
-@app.get("/api/messages/user/{user_id}")
-async def get_messages_by_user(user_id: int, request: Request):
-    """Get messages for a user - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['communication']}/api/v1/messages/user/{user_id}",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
-
-@app.get("/api/messages/between/{user1_id}/{user2_id}")
-async def get_messages_between_users(user1_id: int, user2_id: int, request: Request):
-    """Get messages between two users - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['communication']}/api/v1/messages/between/{user1_id}/{user2_id}",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
-
-@app.patch("/api/messages/{message_id}/read")
-async def mark_message_as_read(message_id: int, request: Request):
-    """Mark a message as read - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.patch(
-                f"{SERVICES['communication']}/api/v1/messages/{message_id}/read",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
-
-@app.post("/api/announcements")
-async def create_announcement(request: Request):
-    """Create a new announcement - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.post(
-                f"{SERVICES['communication']}/api/v1/announcements",
-                json=await request.json(),
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
-
-@app.get("/api/announcements/course/{course_id}")
-async def get_announcements_by_course(course_id: int, request: Request):
-    """Get announcements for a course - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['communication']}/api/v1/announcements/course/{course_id}",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
-
-@app.get("/api/announcements/system")
-async def get_system_announcements(request: Request):
-    """Get system-wide announcements - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['communication']}/api/v1/announcements/system",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
-
-@app.get("/api/notifications/user/{user_id}")
-async def get_notifications_by_user(user_id: int, request: Request):
-    """Get notifications for a user - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['communication']}/api/v1/notifications/user/{user_id}",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
-
-@app.get("/api/notifications/user/{user_id}/unread")
-async def get_unread_notifications_by_user(user_id: int, request: Request):
-    """Get unread notifications for a user - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['communication']}/api/v1/notifications/user/{user_id}/unread",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
-
-@app.patch("/api/notifications/{notification_id}/read")
-async def mark_notification_as_read(notification_id: int, request: Request):
-    """Mark a notification as read - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.patch(
-                f"{SERVICES['communication']}/api/v1/notifications/{notification_id}/read",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
-
-@app.patch("/api/notifications/{notification_id}/dismiss")
-async def dismiss_notification(notification_id: int, request: Request):
-    """Dismiss a notification - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.patch(
-                f"{SERVICES['communication']}/api/v1/notifications/{notification_id}/dismiss",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
-
-@app.get("/api/conversations/user/{user_id}")
-async def get_conversations_by_user(user_id: int, request: Request):
-    """Get conversations for a user - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['communication']}/api/v1/conversations/user/{user_id}",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
-
-@app.get("/api/conversations/{conversation_id}")
-async def get_conversation(conversation_id: int, request: Request):
-    """Get conversation by ID - forwards to communication service."""
-    async with httpx.AsyncClient() as client:
-        try:
-            headers = {"Authorization": request.headers.get("Authorization", "")}
-            response = await client.get(
-                f"{SERVICES['communication']}/api/v1/conversations/{conversation_id}",
-                headers=headers,
-                timeout=10.0
-            )
-            return JSONResponse(content=response.json(), status_code=response.status_code)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Communication service error: {str(e)}")
+# The communication service routes the gateway exposes; the gateway adds no
+# checks of its own, so each is relayed to the same path under /api/v1 with its
+# query string and body by one handler. The upstream path is rebuilt from the
+# route template and the integer ids, so nothing but these routes can be reached
+COMMUNICATION_ROUTES = (
+    ("POST", "/api/messages"),
+    ("GET", "/api/messages/user/{user_id:int}"),
+    ("GET", "/api/messages/between/{user1_id:int}/{user2_id:int}"),
+    ("PATCH", "/api/messages/{message_id:int}/read"),
+    ("POST", "/api/announcements"),
+    ("GET", "/api/announcements/course/{course_id:int}"),
+    ("GET", "/api/announcements/system"),
+    ("GET", "/api/notifications/user/{user_id:int}"),
+    ("GET", "/api/notifications/user/{user_id:int}/unread"),
+    ("PATCH", "/api/notifications/{notification_id:int}/read"),
+    ("PATCH", "/api/notifications/{notification_id:int}/dismiss"),
+    ("GET", "/api/conversations/user/{user_id:int}"),
+    ("GET", "/api/conversations/{conversation_id:int}"),
+)
+CACHED_ANNOUNCEMENT_PATHS = ("/api/announcements/course/", "/api/announcements/system")
+
+async def communication_proxy(request: Request):
+    """Relay a messages, announcements, notifications or conversations call to communication service."""
+    path = request.scope["route"].path_format.format(**request.path_params)
+    upstream_path = "/api/v1/" + path.removeprefix("/api/")
+    if request.method == "GET" and path.startswith(CACHED_ANNOUNCEMENT_PATHS):
+        return await _cached_proxy(
+            request, "communication", upstream_path,
+            f"announcements:{path}?{request.url.query}", CATALOG_CACHE_TTL, params=request.query_params
+        )
+    response = await _proxy(
+        request,
+        "communication",
+        upstream_path,
+        method=request.method,
+        params=request.query_params,
+        forward_body=request.method != "GET"
+    )
+    # The upstream has answered by now, so the write is in and listings can be dropped
+    if request.method != "GET" and path.startswith("/api/announcements"):
+        await cache.invalidate_prefix("announcements:")
+    return response
+
+for method, route_path in COMMUNICATION_ROUTES:
+    app.add_api_route(route_path, communication_proxy, methods=[method])
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
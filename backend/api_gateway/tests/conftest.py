@@ -0,0 +1,93 @@
+import fnmatch
+
+import httpx
+import jwt
+import pytest
+import pytest_asyncio
+
+import cache
+import main
+
+def _unread_response(status_code, **kwargs):
+    """Build a response whose body has not been read yet, as one arriving over the network would be."""
+    built = httpx.Response(status_code, **kwargs)
+    return httpx.Response(status_code, headers=built.headers, stream=built.stream)
+
+class Upstream:
+    """Stand-in for the backend services: records each request and answers with the next queued response.
+
+    Responses registered for a path with route() are served for every request to
+    that path instead, for handlers whose upstream calls run concurrently.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.responses = []
+        self.routes = {}
+
+    def reply(self, status_code=200, json=None, **kwargs):
+        self.responses.append(_unread_response(status_code, json=json, **kwargs))
+
+    def route(self, path, status_code=200, json=None):
+        self.routes[path] = (status_code, json)
+
+    def handler(self, request):
+        self.requests.append(request)
+        if request.url.path in self.routes:
+            status_code, json = self.routes[request.url.path]
+            return _unread_response(status_code, json=json)
+        if not self.responses:
+            raise httpx.ConnectError("upstream unavailable", request=request)
+        return self.responses.pop(0)
+
+class FakeRedis:
+    """In-memory stand-in for the few redis.asyncio calls the cache module makes."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    async def scan_iter(self, match):
+        for key in list(self.store):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+@pytest_asyncio.fixture
+async def upstream(monkeypatch):
+    """Route the gateway's upstream clients to an in-memory Upstream."""
+    fake = Upstream()
+    mock_client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    monkeypatch.setattr(main, "http_clients", {service: mock_client for service in main.SERVICES})
+    yield fake
+    await mock_client.aclose()
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Route the response cache through an in-memory FakeRedis for the test."""
+    fake = FakeRedis()
+    monkeypatch.setattr(cache, "redis_client", fake)
+    return fake
+
+@pytest_asyncio.fixture
+async def client(upstream):
+    """HTTP client bound to the gateway app in-process."""
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+@pytest.fixture
+def auth_headers():
+    """Build an Authorization header carrying a token signed with the gateway's key."""
+    def build(role="student", sub="1"):
+        token = jwt.encode({"sub": sub, "role": role}, main.SECRET_KEY, algorithm=main.ALGORITHM)
+        return {"Authorization": f"Bearer {token}"}
+    return build
@@ -0,0 +1,60 @@
+import httpx
+import pytest
+
+import circuit_breaker
+import main
+from circuit_breaker import CircuitBreaker, CircuitBreakerTransport
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", fake.monotonic)
+    return fake
+
+def test_breaker_opens_after_threshold_and_probes_after_reset(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()
+    # Only one probe per window
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert not breaker.allow()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_with_503(monkeypatch, clock):
+    sent = []
+
+    def unreachable(request):
+        sent.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    upstream = httpx.AsyncClient(transport=CircuitBreakerTransport(httpx.MockTransport(unreachable), breaker))
+    monkeypatch.setattr(main, "http_clients", {service: upstream for service in main.SERVICES})
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(2):
+            assert (await client.get("/api/courses/1")).status_code == 500
+
+        response = await client.get("/api/courses/1")
+        assert response.status_code == 503
+        assert response.json()["detail"] == "Course service unavailable"
+        assert len(sent) == 2
+    await upstream.aclose()
@@ -0,0 +1,271 @@
+import gzip
+import json
+import time
+
+import jwt
+import pytest
+
+import main
+
+@pytest.mark.asyncio
+async def test_login_forwards_body_and_status(client, upstream):
+    upstream.reply(401, json={"detail": "bad credentials"})
+
+    response = await client.post("/api/auth/login", json={"email": "a@b.c", "password": "x"})
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": "bad credentials"}
+    sent = upstream.requests[0]
+    assert sent.url.path == "/api/v1/auth/login"
+    assert json.loads(sent.content) == {"email": "a@b.c", "password": "x"}
+
+@pytest.mark.asyncio
+async def test_request_body_is_forwarded_verbatim(client, upstream, auth_headers):
+    upstream.reply(201, json={"id": 5})
+    body = b'{"title":"Intro","price":1.10}'
+
+    response = await client.post("/api/courses", content=body, headers=auth_headers(role="instructor"))
+
+    assert response.status_code == 201
+    sent = upstream.requests[0]
+    assert sent.content == body
+    assert sent.headers["content-type"] == "application/json"
+
+@pytest.mark.asyncio
+async def test_courses_are_wrapped_for_the_frontend(client, upstream):
+    upstream.reply(json=[{"id": 1}])
+
+    response = await client.get("/api/courses", params={"search": "py"})
+
+    assert response.json() == {"success": True, "data": [{"id": 1}], "message": "Courses retrieved successfully"}
+    assert upstream.requests[0].url.params["search"] == "py"
+
+@pytest.mark.asyncio
+async def test_authorization_is_forwarded(client, upstream, auth_headers):
+    upstream.reply(json={"id": 1})
+    headers = auth_headers()
+
+    response = await client.get("/api/users/me", headers=headers)
+
+    assert response.status_code == 200
+    assert upstream.requests[0].headers["authorization"] == headers["Authorization"]
+
+@pytest.mark.asyncio
+async def test_protected_route_requires_token(client, upstream):
+    response = await client.get("/api/users/me")
+    assert response.status_code == 401
+    assert upstream.requests == []
+
+@pytest.mark.asyncio
+async def test_admin_route_requires_admin_role(client, upstream, auth_headers):
+    response = await client.get("/api/admin/users", headers=auth_headers(role="student"))
+    assert response.status_code == 403
+
+    upstream.reply(json=[])
+    response = await client.get("/api/admin/users", headers=auth_headers(role="admin"))
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_unreachable_service_is_500(client, upstream):
+    response = await client.get("/api/courses/1")
+    assert response.status_code == 500
+    assert "Course service error" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_non_json_upstream_body_is_not_wrapped(client, upstream):
+    upstream.reply(502, text="<html>Bad Gateway</html>")
+
+    response = await client.get("/api/courses")
+
+    assert response.status_code == 500
+    assert "Course service error" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_upstream_timeout_names_the_service(client, upstream, auth_headers):
+    response = await client.post(
+        "/api/content/upload",
+        files={"file": ("notes.txt", b"hello", "text/plain")},
+        headers=auth_headers()
+    )
+
+    assert response.status_code == 500
+    assert response.json()["detail"].startswith("Content service error")
+
+@pytest.mark.asyncio
+async def test_cached_token_still_expires(client, upstream, monkeypatch):
+    now = time.time()
+    token = jwt.encode({"sub": "1", "role": "student", "exp": int(now) + 60}, main.SECRET_KEY, algorithm=main.ALGORITHM)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    upstream.reply(json={"id": 1})
+    assert (await client.get("/api/users/me", headers=headers)).status_code == 200
+
+    monkeypatch.setattr(main.time, "time", lambda: now + 120)
+    assert (await client.get("/api/users/me", headers=headers)).status_code == 401
+
+@pytest.mark.asyncio
+async def test_tampered_token_is_rejected(client, upstream, auth_headers):
+    headers = auth_headers()
+    headers["Authorization"] = headers["Authorization"][:-2] + "xx"
+
+    response = await client.get("/api/users/me", headers=headers)
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_proxy_forwards_method_and_path(client, upstream, auth_headers):
+    upstream.reply(json={"id": 3, "is_read": True})
+
+    response = await client.patch("/api/notifications/3/read", headers=auth_headers())
+
+    assert response.json() == {"id": 3, "is_read": True}
+    sent = upstream.requests[0]
+    assert (sent.method, sent.url.path) == ("PATCH", "/api/v1/notifications/3/read")
+    assert sent.content == b""
+
+    response = await client.get("/api/messages/user/1")
+    assert response.status_code == 500
+    assert "Communication service error" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_dashboard_combines_services(client, upstream, auth_headers):
+    upstream.route("/api/v1/enrollments", json=[{"course_id": 10}])
+    upstream.route("/api/v1/analytics/users/7/dashboard", json={"success": True, "data": {"user_id": 7}, "message": ""})
+    upstream.route("/api/v1/analytics/users/7/learning-path", 404, json={"detail": "Learning path not found"})
+
+    response = await client.get("/api/dashboard/me", headers=auth_headers(sub="7"))
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {"enrollments": [{"course_id": 10}], "analytics": {"user_id": 7}, "learning_path": None}
+    assert upstream.requests[0].url.params["user_id"] == "7"
+    assert all(r.extensions["timeout"]["read"] == main.DASHBOARD_CALL_TIMEOUT for r in upstream.requests)
+
+    upstream.route("/api/v1/analytics/users/7/dashboard", 503, json={"detail": "down"})
+    response = await client.get("/api/dashboard/me", headers=auth_headers(sub="7"))
+    assert response.status_code == 503
+
+@pytest.mark.asyncio
+async def test_upload_streams_multipart_body_unchanged(client, upstream, auth_headers):
+    upstream.reply(201, json={"id": 9})
+
+    response = await client.post(
+        "/api/content/upload",
+        files={"file": ("notes.txt", b"hello world", "text/plain")},
+        data={"course_id": "10"},
+        headers=auth_headers(role="instructor")
+    )
+
+    assert response.status_code == 201
+    sent = upstream.requests[0]
+    sent.read()
+    assert sent.headers["content-type"].startswith("multipart/form-data; boundary=")
+    assert b"hello world" in sent.content
+    assert int(sent.headers["content-length"]) == len(sent.content)
+
+@pytest.mark.asyncio
+async def test_listing_streams_encoded_body_through(client, upstream):
+    body = gzip.compress(b'[{"id": 1}]')
+    upstream.reply(200, content=body, headers={"content-type": "application/json", "content-encoding": "gzip"})
+
+    response = await client.get("/api/content", params={"course_id": 10})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == [{"id": 1}]
+    assert upstream.requests[0].url.params["course_id"] == "10"
+
+@pytest.mark.asyncio
+async def test_health_body_is_rebuilt_each_second(client, monkeypatch):
+    monkeypatch.setattr(main.time, "time", lambda: 1700000000.25)
+    first = (await client.get("/api/health")).json()
+    assert first == {"status": "ok", "gateway": "running", "timestamp": "2023-11-14T22:13:20"}
+
+    monkeypatch.setattr(main.time, "time", lambda: 1700000001.5)
+    assert (await client.get("/api/health")).json()["timestamp"] == "2023-11-14T22:13:21"
+
+@pytest.mark.asyncio
+async def test_only_whitelisted_headers_are_forwarded(client, upstream):
+    upstream.reply(json={"ok": True})
+
+    await client.post("/api/auth/logout", headers={"X-Request-ID": "abc", "Cookie": "session=1"})
+
+    sent = upstream.requests[0].headers
+    assert sent["x-request-id"] == "abc"
+    assert "cookie" not in sent
+    assert "authorization" not in sent
+
+@pytest.mark.asyncio
+async def test_communication_routes_relay_method_query_and_body(client, upstream):
+    upstream.reply(201, json={"id": 4})
+
+    response = await client.post("/api/messages", params={"notify": "true"}, content=b'{"body":"hi"}')
+
+    assert response.status_code == 201
+    assert response.json() == {"id": 4}
+    sent = upstream.requests[0]
+    assert (sent.method, sent.url.path, sent.url.params["notify"]) == ("POST", "/api/v1/messages", "true")
+    assert sent.content == b'{"body":"hi"}'
+
+    upstream.reply(json=[])
+    await client.get("/api/conversations/user/3")
+    assert upstream.requests[1].url.path == "/api/v1/conversations/user/3"
+
+@pytest.mark.asyncio
+async def test_communication_routes_reach_only_the_exposed_upstream_routes(client, upstream):
+    for method, path in [
+        ("POST", "/api/notifications"),
+        ("POST", "/api/conversations"),
+        ("GET", "/api/messages/5"),
+        ("GET", "/api/messages/%2e%2e/%2e%2e/templates"),
+        ("GET", "/api/messages/..%2F..%2Fstats%2Foverall"),
+        ("GET", "/api/messages/user/1/../../../stats"),
+    ]:
+        response = await client.request(method, path)
+        assert response.status_code in (404, 405), path
+
+    assert upstream.requests == []
+
+@pytest.mark.asyncio
+async def test_enrollment_is_streamed_inside_envelope_with_created_status(client, upstream, auth_headers):
+    upstream.reply(200, json={"id": 12, "course_id": 10})
+
+    response = await client.post("/api/enrollments", json={"course_id": 10}, headers=auth_headers())
+
+    assert response.status_code == 201
+    assert response.json() == {"success": True, "data": {"id": 12, "course_id": 10}, "message": "Enrollment successful"}
+
+@pytest.mark.asyncio
+async def test_gateway_errors_are_json(client):
+    response = await client.get("/api/users/me", headers={"Authorization": "Bearer nope"})
+    assert (response.status_code, response.json()) == (401, {"detail": "Invalid authentication credentials"})
+
+    response = await client.get("/api/no-such-route")
+    assert (response.status_code, response.json()) == (404, {"detail": "Not Found"})
+
+@pytest.mark.asyncio
+async def test_forwarded_body_keeps_client_content_type(client, upstream, auth_headers):
+    upstream.reply(201, json={"id": 1})
+
+    await client.post(
+        "/api/progress",
+        content=b"content_id=3",
+        headers={**auth_headers(), "Content-Type": "application/x-www-form-urlencoded"}
+    )
+
+    sent = upstream.requests[0]
+    sent.read()
+    assert sent.headers["content-type"] == "application/x-www-form-urlencoded"
+    assert sent.content == b"content_id=3"
+    assert sent.headers["content-length"] == "12"
+
+@pytest.mark.asyncio
+async def test_upstream_timeout_comes_from_request_budget(client, upstream, monkeypatch):
+    monkeypatch.setattr(main.time, "time", lambda: 1700000000.0)
+    upstream.reply(json=[])
+    upstream.reply(json=[])
+
+    await client.post("/api/auth/logout", headers={"X-Budget-Ms": "500"})
+    await client.post("/api/auth/logout", headers={"X-Request-Deadline": "1700000000200", "X-Budget-Ms": "soon"})
+
+    first, second = upstream.requests
+    assert first.extensions["timeout"]["read"] == pytest.approx(0.5)
+    assert first.headers["x-request-deadline"] == "1700000000500"
+    assert second.extensions["timeout"]["read"] == pytest.approx(0.2)
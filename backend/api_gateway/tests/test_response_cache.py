@@ -0,0 +1,43 @@
+import pytest
+
+@pytest.mark.asyncio
+async def test_assessment_is_served_from_cache(client, upstream, fake_redis):
+    upstream.reply(json={"id": 3, "title": "Quiz"})
+
+    first = await client.get("/api/assessments/3")
+    second = await client.get("/api/assessments/3")
+
+    assert first.json() == second.json() == {"id": 3, "title": "Quiz"}
+    assert len(upstream.requests) == 1
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(client, upstream, fake_redis):
+    upstream.reply(404, json={"detail": "Assessment not found"})
+    upstream.reply(json={"id": 3})
+
+    assert (await client.get("/api/assessments/3")).status_code == 404
+    assert (await client.get("/api/assessments/3")).json() == {"id": 3}
+    assert len(upstream.requests) == 2
+
+@pytest.mark.asyncio
+async def test_analytics_dashboard_is_cached_per_user(client, upstream, fake_redis, auth_headers):
+    upstream.reply(json={"data": {"user_id": 1}})
+    upstream.reply(json={"data": {"user_id": 2}})
+
+    await client.get("/api/analytics/dashboard", headers=auth_headers(sub="1"))
+    response = await client.get("/api/analytics/dashboard", headers=auth_headers(sub="2"))
+
+    assert response.json() == {"data": {"user_id": 2}}
+    assert len(upstream.requests) == 2
+
+@pytest.mark.asyncio
+async def test_announcement_write_drops_cached_listings(client, upstream, fake_redis):
+    upstream.reply(json=[])
+    upstream.reply(201, json={"id": 1})
+    upstream.reply(json=[{"id": 1}])
+
+    assert (await client.get("/api/announcements/system")).json() == []
+    await client.post("/api/announcements", content=b'{"title":"Hi"}')
+
+    assert (await client.get("/api/announcements/system")).json() == [{"id": 1}]
+    assert [r.method for r in upstream.requests] == ["GET", "POST", "GET"]
@@ -0,0 +1,112 @@
+import logging
+import os
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Redis cache for the course-wide question/assessment listings and stats
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+LIST_CACHE_TTL = int(os.getenv("ASSESSMENT_LIST_CACHE_TTL", "300"))
+# Stats are aggregates over submissions, which change too often to invalidate
+# on every write, so they just expire quickly
+STATS_CACHE_TTL = int(os.getenv("ASSESSMENT_STATS_CACHE_TTL", "60"))
+
+redis_client: Optional[redis.Redis] = None
+
+
+def questions_by_course_key(course_id: int, active_only: bool) -> str:
+    return f"questions:course:{course_id}:{int(active_only)}"
+
+
+def questions_by_assessment_key(assessment_id: int, active_only: bool) -> str:
+    return f"questions:assessment:{assessment_id}:{int(active_only)}"
+
+
+def assessments_by_course_key(course_id: int, active_only: bool) -> str:
+    return f"assessments:course:{course_id}:{int(active_only)}"
+
+
+def stats_key(scope: str) -> str:
+    return f"stats:{scope}"
+
+
+def question_list_keys(course_id: int, assessment_id: Optional[int]) -> list[str]:
+    """Every cached listing a question with these ids can appear in."""
+    keys = [questions_by_course_key(course_id, active_only) for active_only in (True, False)]
+    if assessment_id is not None:
+        keys += [questions_by_assessment_key(assessment_id, active_only) for active_only in (True, False)]
+    return keys
+
+
+def assessment_list_keys(course_id: int) -> list[str]:
+    """Every cached listing an assessment of this course can appear in."""
+    return [assessments_by_course_key(course_id, active_only) for active_only in (True, False)]
+
+
+async def init_cache():
+    """Create the Redis client."""
+    global redis_client
+    redis_client = redis.from_url(REDIS_URL)
+
+
+async def close_cache():
+    """Close the Redis client."""
+    global redis_client
+    if redis_client is not None:
+        await redis_client.aclose()
+        redis_client = None
+
+
+async def _read_through(
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: int,
+    encode: Callable[[Any], Any],
+    decode: Callable[[Any], Any]
+) -> Any:
+    """Return decode(cached value) for key, or call loader and cache encode(result) on a miss.
+    
+    Redis errors fall back to the loader so the cache never takes the endpoint
+    down with it.
+    """
+    if redis_client is None:
+        return await loader()
+    
+    try:
+        hit = await redis_client.get(key)
+    except RedisError:
+        logger.warning("Redis GET failed for %s", key, exc_info=True)
+        return await loader()
+    if hit is not None:
+        return decode(hit)
+    
+    value = await loader()
+    try:
+        await redis_client.setex(key, ttl, encode(value))
+    except RedisError:
+        logger.warning("Redis SETEX failed for %s", key, exc_info=True)
+    return value
+
+
+async def cached(key: str, loader: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+    """Return the JSON value cached under key, calling loader and caching its result on a miss."""
+    return await _read_through(key, loader, ttl, orjson.dumps, orjson.loads)
+
+
+async def cached_bytes(key: str, loader: Callable[[], Awaitable[bytes]], ttl: int = LIST_CACHE_TTL) -> bytes:
+    """Return the already-serialized bytes cached under key, calling loader and caching its result on a miss."""
+    return await _read_through(key, loader, ttl, bytes, bytes)
+
+
+async def invalidate(*keys: str):
+    """Delete cached entries after a write."""
+    if redis_client is None or not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except RedisError:
+        logger.warning("Redis DEL failed for %s", keys, exc_info=True)
@@ -1,8 +1,8 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_, func, desc
+from sqlalchemy import and_, case, func, delete, desc, insert, update
 from fastapi import HTTPException, status
 
 from .models import (
@@ -21,7 +21,6 @@ async def create_question(db: AsyncSession, question_create: QuestionCreate) ->
     question = Question(**question_create.dict())
     db.add(question)
     await db.commit()
-    await db.refresh(question)
     return question
 
 
@@ -55,32 +54,32 @@ async def get_questions_by_assessment(
 
 async def update_question(
     db: AsyncSession, question_id: int, question_update: QuestionUpdate
-) -> Optional[Question]:
-    """Update question."""
+) -> Optional[Tuple[Question, Tuple[int, Optional[int]]]]:
+    """Update question, returning it with its (course_id, assessment_id) from before the update."""
     question = await get_question(db, question_id)
     if not question:
         return None
+    previous_ids = (question.course_id, question.assessment_id)
     
     update_data = question_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(question, field, value)
     
-    question.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(question)
-    return question
+    return question, previous_ids
 
 
-async def delete_question(db: AsyncSession, question_id: int) -> bool:
-    """Soft delete question."""
-    question = await get_question(db, question_id)
-    if not question:
-        return False
-    
-    question.is_active = False
-    question.updated_at = datetime.utcnow()
+async def delete_question(db: AsyncSession, question_id: int) -> Optional[Tuple[int, Optional[int]]]:
+    """Soft delete question, returning its (course_id, assessment_id), or None if there is no such question."""
+    result = await db.execute(
+        update(Question)
+        .where(Question.id == question_id)
+        .values(is_active=False, updated_at=func.now())
+        .returning(Question.course_id, Question.assessment_id)
+    )
+    row = result.one_or_none()
     await db.commit()
-    return True
+    return tuple(row) if row else None
 
 
 # Assessment CRUD operations
@@ -89,7 +88,6 @@ async def create_assessment(db: AsyncSession, assessment_create: AssessmentCreat
     assessment = Assessment(**assessment_create.dict())
     db.add(assessment)
     await db.commit()
-    await db.refresh(assessment)
     return assessment
 
 
@@ -112,57 +110,72 @@ async def get_assessments_by_course(
 
 async def update_assessment(
     db: AsyncSession, assessment_id: int, assessment_update: AssessmentUpdate
-) -> Optional[Assessment]:
-    """Update assessment."""
+) -> Optional[Tuple[Assessment, int]]:
+    """Update assessment, returning it with its course_id from before the update."""
     assessment = await get_assessment(db, assessment_id)
     if not assessment:
         return None
+    previous_course_id = assessment.course_id
     
     update_data = assessment_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(assessment, field, value)
     
-    assessment.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(assessment)
-    return assessment
+    return assessment, previous_course_id
 
 
-async def delete_assessment(db: AsyncSession, assessment_id: int) -> bool:
-    """Soft delete assessment."""
-    assessment = await get_assessment(db, assessment_id)
-    if not assessment:
-        return False
-    
-    assessment.is_active = False
-    assessment.updated_at = datetime.utcnow()
+async def delete_assessment(db: AsyncSession, assessment_id: int) -> Optional[int]:
+    """Soft delete assessment, returning its course_id, or None if there is no such assessment."""
+    result = await db.execute(
+        update(Assessment)
+        .where(Assessment.id == assessment_id)
+        .values(is_active=False, updated_at=func.now())
+        .returning(Assessment.course_id)
+    )
+    course_id = result.scalar_one_or_none()
     await db.commit()
-    return True
+    return course_id
 
 
 # Submission CRUD operations
+# Question types whose answers can be checked against correct_answer
+AUTO_GRADED_TYPES = frozenset((QuestionType.MULTIPLE_CHOICE, QuestionType.TRUE_FALSE))
+
+
 async def create_submission(
     db: AsyncSession, submission_create: AssessmentSubmissionCreate
 ) -> AssessmentSubmission:
     """Create a new submission."""
-    # Check if user has already submitted
-    existing_submissions = await get_submissions_by_user_and_assessment(
-        db, submission_create.user_id, submission_create.assessment_id
+    # Fetch the assessment and count previous attempts in one round trip,
+    # without loading the submissions themselves
+    previous_attempts = (
+        select(func.count())
+        .select_from(AssessmentSubmission)
+        .where(
+            and_(
+                AssessmentSubmission.user_id == submission_create.user_id,
+                AssessmentSubmission.assessment_id == submission_create.assessment_id
+            )
+        )
+        .scalar_subquery()
     )
-    
-    # Get assessment to check max attempts
-    assessment = await get_assessment(db, submission_create.assessment_id)
-    if not assessment:
+    result = await db.execute(
+        select(Assessment, previous_attempts).where(Assessment.id == submission_create.assessment_id)
+    )
+    row = result.one_or_none()
+    if not row:
         raise HTTPException(status_code=404, detail="Assessment not found")
+    assessment, previous_attempts = row
     
-    if len(existing_submissions) >= assessment.max_attempts and not assessment.allow_retakes:
+    if previous_attempts >= assessment.max_attempts and not assessment.allow_retakes:
         raise HTTPException(
             status_code=400,
             detail=f"Maximum attempts ({assessment.max_attempts}) reached for this assessment"
         )
     
     # Set attempt number
-    attempt_number = len(existing_submissions) + 1
+    attempt_number = previous_attempts + 1
     
     submission = AssessmentSubmission(
         **submission_create.dict(),
@@ -171,7 +184,6 @@ async def create_submission(
     
     db.add(submission)
     await db.commit()
-    await db.refresh(submission)
     return submission
 
 
@@ -184,25 +196,29 @@ async def get_submission(db: AsyncSession, submission_id: int) -> Optional[Asses
 
 
 async def get_submissions_by_user(
-    db: AsyncSession, user_id: int
+    db: AsyncSession, user_id: int, limit: int = 50, offset: int = 0
 ) -> List[AssessmentSubmission]:
-    """Get all submissions for a user."""
+    """Get a page of submissions for a user, newest first."""
     result = await db.execute(
         select(AssessmentSubmission)
         .where(AssessmentSubmission.user_id == user_id)
-        .order_by(desc(AssessmentSubmission.submitted_at))
+        .order_by(desc(AssessmentSubmission.submitted_at), desc(AssessmentSubmission.id))
+        .offset(offset)
+        .limit(limit)
     )
     return result.scalars().all()
 
 
 async def get_submissions_by_assessment(
-    db: AsyncSession, assessment_id: int
+    db: AsyncSession, assessment_id: int, limit: int = 50, offset: int = 0
 ) -> List[AssessmentSubmission]:
-    """Get all submissions for an assessment."""
+    """Get a page of submissions for an assessment, newest first."""
     result = await db.execute(
         select(AssessmentSubmission)
         .where(AssessmentSubmission.assessment_id == assessment_id)
-        .order_by(desc(AssessmentSubmission.submitted_at))
+        .order_by(desc(AssessmentSubmission.submitted_at), desc(AssessmentSubmission.id))
+        .offset(offset)
+        .limit(limit)
     )
     return result.scalars().all()
 
@@ -227,46 +243,61 @@ async def get_submissions_by_user_and_assessment(
 # Grading functions
 async def auto_grade_submission(db: AsyncSession, submission_id: int) -> AssessmentSubmission:
     """Automatically grade a submission for auto-gradable questions."""
-    submission = await get_submission(db, submission_id)
-    if not submission:
+    # Load the submission, its assessment and the grading columns of the
+    # assessment's active questions in one round trip; one row per question
+    result = await db.execute(
+        select(
+            AssessmentSubmission,
+            Assessment,
+            Question.id,
+            Question.type,
+            Question.correct_answer,
+            Question.points
+        )
+        .outerjoin(Assessment, Assessment.id == AssessmentSubmission.assessment_id)
+        .outerjoin(Question, and_(Question.assessment_id == Assessment.id, Question.is_active == True))
+        .where(AssessmentSubmission.id == submission_id)
+    )
+    rows = result.all()
+    if not rows:
         raise HTTPException(status_code=404, detail="Submission not found")
     
-    # Get assessment and questions
-    assessment = await get_assessment(db, submission.assessment_id)
-    questions = await get_questions_by_assessment(db, submission.assessment_id)
+    submission, assessment = rows[0][:2]
+    questions = [row[2:] for row in rows if row[2] is not None]
     
     if not assessment or not questions:
         raise HTTPException(status_code=404, detail="Assessment or questions not found")
     
     total_score = 0
     max_score = 0
+    graded_at = datetime.utcnow()
+    answers = submission.answers or {}
     question_responses = []
     
-    for question in questions:
-        max_score += question.points
-        user_answer = submission.answers.get(str(question.id), "")
+    for question_id, question_type, correct_answer, points in questions:
+        max_score += points
+        user_answer = answers.get(str(question_id), "")
         
-        # Create question response
-        question_response = QuestionResponse(
-            submission_id=submission.id,
-            question_id=question.id,
-            user_answer=user_answer,
-            max_points=question.points
-        )
-        
-        # Auto-grade if possible
-        if question.type in [QuestionType.MULTIPLE_CHOICE, QuestionType.TRUE_FALSE]:
-            is_correct = user_answer == question.correct_answer
-            points_earned = question.points if is_correct else 0
-            question_response.is_correct = is_correct
-            question_response.points_earned = points_earned
-            question_response.graded_at = datetime.utcnow()
+        # Auto-grade if possible; anything else is left for manual grading
+        if question_type in AUTO_GRADED_TYPES:
+            is_correct = user_answer == correct_answer
+            points_earned = points if is_correct else 0
             total_score += points_earned
+            question_graded_at = graded_at
         else:
-            # Manual grading required
-            question_response.points_earned = 0
+            is_correct = None
+            points_earned = 0
+            question_graded_at = None
         
-        question_responses.append(question_response)
+        question_responses.append({
+            "submission_id": submission_id,
+            "question_id": question_id,
+            "user_answer": user_answer,
+            "max_points": points,
+            "is_correct": is_correct,
+            "points_earned": points_earned,
+            "graded_at": question_graded_at
+        })
     
     # Update submission
     submission.score = total_score
@@ -277,12 +308,15 @@ async def auto_grade_submission(db: AsyncSession, submission_id: int) -> Assessm
         if assessment.passing_score is not None
         else None
     )
-    submission.graded_at = datetime.utcnow()
-    
-    # Save question responses
-    db.add_all(question_responses)
+    submission.graded_at = graded_at
+    
+    # Regrading starts over, so drop any responses an earlier pass saved, then
+    # save these in one multi-row INSERT instead of one ORM object each
+    await db.execute(delete(QuestionResponse).where(QuestionResponse.submission_id == submission_id))
+    await db.execute(insert(QuestionResponse), question_responses)
+    # The flush writes the grade with one UPDATE by primary key; sessions don't
+    # expire on commit, so the submission already holds every value it returns
     await db.commit()
-    await db.refresh(submission)
     
     return submission
 
@@ -291,48 +325,71 @@ async def manual_grade_submission(
     db: AsyncSession, grading_request: GradingRequest
 ) -> AssessmentSubmission:
     """Manually grade a submission."""
-    submission = await get_submission(db, grading_request.submission_id)
-    if not submission:
+    # Load the submission and its assessment's passing score in one round trip
+    result = await db.execute(
+        select(AssessmentSubmission, Assessment.id, Assessment.passing_score)
+        .outerjoin(Assessment, Assessment.id == AssessmentSubmission.assessment_id)
+        .where(AssessmentSubmission.id == grading_request.submission_id)
+    )
+    row = result.one_or_none()
+    if not row:
         raise HTTPException(status_code=404, detail="Submission not found")
-    
-    # Get assessment
-    assessment = await get_assessment(db, submission.assessment_id)
-    if not assessment:
+    submission, assessment_id, passing_score = row
+    if assessment_id is None:
         raise HTTPException(status_code=404, detail="Assessment not found")
     
     total_score = 0
     max_score = 0
+    graded_at = datetime.utcnow()
+    
+    # Only the keys of the graded questions' responses are needed to update them
+    result = await db.execute(
+        select(QuestionResponse.question_id, QuestionResponse.id, QuestionResponse.max_points).where(
+            and_(
+                QuestionResponse.submission_id == submission.id,
+                QuestionResponse.question_id.in_(grading_request.question_grades.keys())
+            )
+        )
+    )
+    question_responses = {question_id: (response_id, max_points) for question_id, response_id, max_points in result}
     
     # Update question responses with manual grades
+    graded_responses = []
     for question_id, grade_data in grading_request.question_grades.items():
-        question_response = await get_question_response_by_submission_and_question(
-            db, submission.id, question_id
-        )
+        if question_id not in question_responses:
+            continue
+        response_id, max_points = question_responses[question_id]
+        points_earned = grade_data.get('score', 0)
+        graded_responses.append({
+            "id": response_id,
+            "points_earned": points_earned,
+            "feedback": grade_data.get('feedback'),
+            "is_correct": grade_data.get('is_correct'),
+            "graded_at": graded_at,
+            "graded_by": grading_request.grader_id
+        })
         
-        if question_response:
-            question_response.points_earned = grade_data.get('score', 0)
-            question_response.feedback = grade_data.get('feedback')
-            question_response.is_correct = grade_data.get('is_correct')
-            question_response.graded_at = datetime.utcnow()
-            question_response.graded_by = grading_request.grader_id
-            
-            total_score += question_response.points_earned
-            max_score += question_response.max_points
+        total_score += points_earned
+        max_score += max_points
+    
+    # One executemany UPDATE by primary key for all of them
+    if graded_responses:
+        await db.execute(update(QuestionResponse), graded_responses)
     
     # Update submission
     submission.score = total_score
     submission.max_score = max_score
     submission.percentage = (total_score / max_score * 100) if max_score > 0 else 0
     submission.is_passed = (
-        submission.percentage >= assessment.passing_score
-        if assessment.passing_score is not None
+        submission.percentage >= passing_score
+        if passing_score is not None
         else None
     )
-    submission.graded_at = datetime.utcnow()
+    submission.graded_at = graded_at
     submission.graded_by = grading_request.grader_id
     
+    # No refresh needed: nothing on the submission is set by the database
     await db.commit()
-    await db.refresh(submission)
     
     return submission
 
@@ -356,29 +413,30 @@ async def get_assessment_stats(
     db: AsyncSession, course_id: Optional[int] = None, assessment_id: Optional[int] = None
 ) -> Dict[str, Any]:
     """Get assessment statistics."""
-    # Base queries
-    assessment_query = select(Assessment)
-    submission_query = select(AssessmentSubmission)
+    # Aggregate in the database instead of loading every row
+    assessment_query = select(func.count(Assessment.id))
+    graded = AssessmentSubmission.score.isnot(None)
+    submission_query = select(
+        func.count(AssessmentSubmission.id),
+        func.count(AssessmentSubmission.score),
+        func.avg(case((graded, func.coalesce(AssessmentSubmission.percentage, 0)))),
+        func.count(case((and_(graded, AssessmentSubmission.is_passed.is_(True)), 1)))
+    )
     
     if course_id:
         assessment_query = assessment_query.where(Assessment.course_id == course_id)
         # For submissions, we need to join with assessments
-        submission_query = submission_query.join(Assessment).where(Assessment.course_id == course_id)
+        submission_query = submission_query.join(
+            Assessment, Assessment.id == AssessmentSubmission.assessment_id
+        ).where(Assessment.course_id == course_id)
     
     if assessment_id:
         assessment_query = assessment_query.where(Assessment.id == assessment_id)
         submission_query = submission_query.where(AssessmentSubmission.assessment_id == assessment_id)
     
-    # Get counts
-    assessment_result = await db.execute(assessment_query)
-    assessments = assessment_result.scalars().all()
-    
-    submission_result = await db.execute(submission_query)
-    submissions = submission_result.scalars().all()
-    
-    # Calculate statistics
-    total_assessments = len(assessments)
-    total_submissions = len(submissions)
+    # Both counts in one round trip
+    result = await db.execute(submission_query.add_columns(assessment_query.scalar_subquery()))
+    total_submissions, graded_count, average_score, passed_count, total_assessments = result.one()
     
     if total_submissions == 0:
         return {
@@ -390,10 +448,9 @@ async def get_assessment_stats(
         }
     
     # Calculate averages
-    graded_submissions = [s for s in submissions if s.score is not None]
-    if graded_submissions:
-        average_score = sum(s.percentage or 0 for s in graded_submissions) / len(graded_submissions)
-        pass_rate = sum(1 for s in graded_submissions if s.is_passed) / len(graded_submissions) * 100
+    if graded_count:
+        average_score = float(average_score)
+        pass_rate = passed_count / graded_count * 100
     else:
         average_score = 0.0
         pass_rate = 0.0
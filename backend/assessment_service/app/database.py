@@ -2,17 +2,44 @@ import os
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+def _async_url(url: str) -> str:
+    """Point a plain postgresql:// URL at asyncpg; SQLAlchemy would pick the sync psycopg2 driver."""
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    return url
+
 # Use SQLite for development, PostgreSQL for production
-DATABASE_URL = os.getenv(
+DATABASE_URL = _async_url(os.getenv(
     "DATABASE_URL",
     "sqlite+aiosqlite:///./assessment.db",  # SQLite for development
-)
+))
+
+# Connection pool settings (PostgreSQL only)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+# Prepared statements kept per asyncpg connection, so the same CRUD queries
+# are parsed and planned by the server once rather than on every call
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "512"))
+
+if "sqlite" in DATABASE_URL:
+    engine_options = {"connect_args": {"check_same_thread": False}}
+else:
+    engine_options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        "connect_args": {"prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE},
+    }
 
 engine = create_async_engine(
-    DATABASE_URL, 
-    echo=False, 
+    DATABASE_URL,
+    echo=False,
     future=True,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+    **engine_options
 )
 async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
@@ -1,12 +1,45 @@
 from typing import List, Optional
 from fastapi import Depends, FastAPI, HTTPException, status, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
 
-from . import crud, models, schemas
+from . import cache, crud, migrate, schemas
 from .database import engine, get_db
 
-app = FastAPI(title="Assessment Service", version="1.0.0")
+app = FastAPI(title="Assessment Service", version="1.0.0", default_response_class=ORJSONResponse)
+
+
+def _fields(schema: type[BaseModel], row) -> dict:
+    """Read a response schema's fields straight off an ORM row, without validating them."""
+    return {name: getattr(row, name) for name in schema.model_fields}
+
+
+def _json_response(content: bytes) -> Response:
+    return Response(content=content, media_type="application/json")
+
+
+def _row_response(schema: type[BaseModel], row) -> Response:
+    """Serialize one ORM row as the given response schema.
+
+    Rows come from our own tables, so building and validating a Pydantic model
+    for each one on the way out only costs time; orjson encodes the column
+    values, datetimes and enums included, directly.
+    """
+    return _json_response(orjson.dumps(_fields(schema, row)))
+
+
+def _rows_json(schema: type[BaseModel], rows: list) -> bytes:
+    """Serialize a list of ORM rows as the given response schema."""
+    return orjson.dumps([_fields(schema, row) for row in rows])
+
+
+def _rows_response(schema: type[BaseModel], rows: list) -> Response:
+    return _json_response(_rows_json(schema, rows))
+
 
 origins = ["*"]
 app.add_middleware(
@@ -20,8 +53,18 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    async with engine.begin() as conn:
-        await conn.run_sync(models.Base.metadata.create_all)
+    # Tables are created out of band by `python -m app.migrate`, not by every worker
+    if migrate.RUN_ON_STARTUP:
+        await migrate.create_tables()
+    # Open a pooled connection now so the first request doesn't pay for it
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await cache.init_cache()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await cache.close_cache()
 
 
 @app.get("/api/v1/health")
@@ -37,18 +80,19 @@ async def create_question(
 ) -> schemas.Question:
     """Create a new question."""
     question = await crud.create_question(db, question_create)
+    await cache.invalidate(*cache.question_list_keys(question.course_id, question.assessment_id))
     return schemas.Question.from_orm(question)
 
 
 @app.get("/api/v1/questions/{question_id}", response_model=schemas.Question)
 async def get_question(
     question_id: int, db: AsyncSession = Depends(get_db)
-) -> schemas.Question:
+) -> Response:
     """Get question by ID."""
     question = await crud.get_question(db, question_id)
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
-    return schemas.Question.from_orm(question)
+    return _row_response(schemas.Question, question)
 
 
 @app.get("/api/v1/questions/course/{course_id}", response_model=List[schemas.Question])
@@ -56,10 +100,13 @@ async def get_questions_by_course(
     course_id: int,
     active_only: bool = Query(True, description="Filter only active questions"),
     db: AsyncSession = Depends(get_db)
-) -> List[schemas.Question]:
+) -> Response:
     """Get all questions for a course."""
-    questions = await crud.get_questions_by_course(db, course_id, active_only)
-    return [schemas.Question.from_orm(q) for q in questions]
+    async def load():
+        questions = await crud.get_questions_by_course(db, course_id, active_only)
+        return _rows_json(schemas.Question, questions)
+    
+    return _json_response(await cache.cached_bytes(cache.questions_by_course_key(course_id, active_only), load))
 
 
 @app.get("/api/v1/questions/assessment/{assessment_id}", response_model=List[schemas.Question])
@@ -67,10 +114,13 @@ async def get_questions_by_assessment(
     assessment_id: int,
     active_only: bool = Query(True, description="Filter only active questions"),
     db: AsyncSession = Depends(get_db)
-) -> List[schemas.Question]:
+) -> Response:
     """Get all questions for an assessment."""
-    questions = await crud.get_questions_by_assessment(db, assessment_id, active_only)
-    return [schemas.Question.from_orm(q) for q in questions]
+    async def load():
+        questions = await crud.get_questions_by_assessment(db, assessment_id, active_only)
+        return _rows_json(schemas.Question, questions)
+    
+    return _json_response(await cache.cached_bytes(cache.questions_by_assessment_key(assessment_id, active_only), load))
 
 
 @app.put("/api/v1/questions/{question_id}", response_model=schemas.Question)
@@ -80,9 +130,15 @@ async def update_question(
     db: AsyncSession = Depends(get_db),
 ) -> schemas.Question:
     """Update question."""
-    question = await crud.update_question(db, question_id, question_update)
-    if not question:
+    updated = await crud.update_question(db, question_id, question_update)
+    if not updated:
         raise HTTPException(status_code=404, detail="Question not found")
+    question, previous_ids = updated
+    # A question moved to another course or assessment leaves its old listings too
+    await cache.invalidate(*{
+        *cache.question_list_keys(*previous_ids),
+        *cache.question_list_keys(question.course_id, question.assessment_id)
+    })
     return schemas.Question.from_orm(question)
 
 
@@ -91,9 +147,10 @@ async def delete_question(
     question_id: int, db: AsyncSession = Depends(get_db)
 ) -> None:
     """Soft delete question."""
-    success = await crud.delete_question(db, question_id)
-    if not success:
+    deleted = await crud.delete_question(db, question_id)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Question not found")
+    await cache.invalidate(*cache.question_list_keys(*deleted))
     return None
 
 
@@ -105,6 +162,7 @@ async def create_assessment(
 ) -> schemas.AssessmentResponse:
     """Create a new assessment."""
     assessment = await crud.create_assessment(db, assessment_create)
+    await cache.invalidate(*cache.assessment_list_keys(assessment.course_id))
     return schemas.AssessmentResponse(
         assessment=schemas.Assessment.from_orm(assessment),
         message="Assessment created successfully"
@@ -114,12 +172,12 @@ async def create_assessment(
 @app.get("/api/v1/assessments/{assessment_id}", response_model=schemas.Assessment)
 async def get_assessment(
     assessment_id: int, db: AsyncSession = Depends(get_db)
-) -> schemas.Assessment:
+) -> Response:
     """Get assessment by ID."""
     assessment = await crud.get_assessment(db, assessment_id)
     if not assessment:
         raise HTTPException(status_code=404, detail="Assessment not found")
-    return schemas.Assessment.from_orm(assessment)
+    return _row_response(schemas.Assessment, assessment)
 
 
 @app.get("/api/v1/assessments/course/{course_id}", response_model=List[schemas.Assessment])
@@ -127,10 +185,13 @@ async def get_assessments_by_course(
     course_id: int,
     active_only: bool = Query(True, description="Filter only active assessments"),
     db: AsyncSession = Depends(get_db)
-) -> List[schemas.Assessment]:
+) -> Response:
     """Get all assessments for a course."""
-    assessments = await crud.get_assessments_by_course(db, course_id, active_only)
-    return [schemas.Assessment.from_orm(a) for a in assessments]
+    async def load():
+        assessments = await crud.get_assessments_by_course(db, course_id, active_only)
+        return _rows_json(schemas.Assessment, assessments)
+    
+    return _json_response(await cache.cached_bytes(cache.assessments_by_course_key(course_id, active_only), load))
 
 
 @app.put("/api/v1/assessments/{assessment_id}", response_model=schemas.AssessmentResponse)
@@ -140,9 +201,15 @@ async def update_assessment(
     db: AsyncSession = Depends(get_db),
 ) -> schemas.AssessmentResponse:
     """Update assessment."""
-    assessment = await crud.update_assessment(db, assessment_id, assessment_update)
-    if not assessment:
+    updated = await crud.update_assessment(db, assessment_id, assessment_update)
+    if not updated:
         raise HTTPException(status_code=404, detail="Assessment not found")
+    assessment, previous_course_id = updated
+    # An assessment moved to another course leaves its old listings too
+    await cache.invalidate(*{
+        *cache.assessment_list_keys(previous_course_id),
+        *cache.assessment_list_keys(assessment.course_id)
+    })
     return schemas.AssessmentResponse(
         assessment=schemas.Assessment.from_orm(assessment),
         message="Assessment updated successfully"
@@ -154,9 +221,10 @@ async def delete_assessment(
     assessment_id: int, db: AsyncSession = Depends(get_db)
 ) -> None:
     """Soft delete assessment."""
-    success = await crud.delete_assessment(db, assessment_id)
-    if not success:
+    course_id = await crud.delete_assessment(db, assessment_id)
+    if course_id is None:
         raise HTTPException(status_code=404, detail="Assessment not found")
+    await cache.invalidate(*cache.assessment_list_keys(course_id))
     return None
 
 
@@ -184,29 +252,35 @@ async def get_submission(
 
 @app.get("/api/v1/submissions/user/{user_id}", response_model=List[schemas.AssessmentSubmission])
 async def get_submissions_by_user(
-    user_id: int, db: AsyncSession = Depends(get_db)
-) -> List[schemas.AssessmentSubmission]:
-    """Get all submissions for a user."""
-    submissions = await crud.get_submissions_by_user(db, user_id)
-    return [schemas.AssessmentSubmission.from_orm(s) for s in submissions]
+    user_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+) -> Response:
+    """Get a page of submissions for a user, newest first."""
+    submissions = await crud.get_submissions_by_user(db, user_id, limit, offset)
+    return _rows_response(schemas.AssessmentSubmission, submissions)
 
 
 @app.get("/api/v1/submissions/assessment/{assessment_id}", response_model=List[schemas.AssessmentSubmission])
 async def get_submissions_by_assessment(
-    assessment_id: int, db: AsyncSession = Depends(get_db)
-) -> List[schemas.AssessmentSubmission]:
-    """Get all submissions for an assessment."""
-    submissions = await crud.get_submissions_by_assessment(db, assessment_id)
-    return [schemas.AssessmentSubmission.from_orm(s) for s in submissions]
+    assessment_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+) -> Response:
+    """Get a page of submissions for an assessment, newest first."""
+    submissions = await crud.get_submissions_by_assessment(db, assessment_id, limit, offset)
+    return _rows_response(schemas.AssessmentSubmission, submissions)
 
 
 @app.get("/api/v1/submissions/user/{user_id}/assessment/{assessment_id}", response_model=List[schemas.AssessmentSubmission])
 async def get_submissions_by_user_and_assessment(
     user_id: int, assessment_id: int, db: AsyncSession = Depends(get_db)
-) -> List[schemas.AssessmentSubmission]:
+) -> Response:
     """Get all submissions for a user and assessment."""
     submissions = await crud.get_submissions_by_user_and_assessment(db, user_id, assessment_id)
-    return [schemas.AssessmentSubmission.from_orm(s) for s in submissions]
+    return _rows_response(schemas.AssessmentSubmission, submissions)
 
 
 # Grading endpoints
@@ -235,7 +309,7 @@ async def get_course_assessment_stats(
     course_id: int, db: AsyncSession = Depends(get_db)
 ) -> schemas.AssessmentStats:
     """Get assessment statistics for a course."""
-    stats = await crud.get_assessment_stats(db, course_id=course_id)
+    stats = await cache.cached(cache.stats_key(f"course:{course_id}"), lambda: crud.get_assessment_stats(db, course_id=course_id), cache.STATS_CACHE_TTL)
     return schemas.AssessmentStats(**stats)
 
 
@@ -244,7 +318,7 @@ async def get_assessment_stats(
     assessment_id: int, db: AsyncSession = Depends(get_db)
 ) -> schemas.AssessmentStats:
     """Get statistics for a specific assessment."""
-    stats = await crud.get_assessment_stats(db, assessment_id=assessment_id)
+    stats = await cache.cached(cache.stats_key(f"assessment:{assessment_id}"), lambda: crud.get_assessment_stats(db, assessment_id=assessment_id), cache.STATS_CACHE_TTL)
     return schemas.AssessmentStats(**stats)
 
 
@@ -253,5 +327,5 @@ async def get_overall_assessment_stats(
     db: AsyncSession = Depends(get_db)
 ) -> schemas.AssessmentStats:
     """Get overall assessment statistics."""
-    stats = await crud.get_assessment_stats(db)
+    stats = await cache.cached(cache.stats_key("overall"), lambda: crud.get_assessment_stats(db), cache.STATS_CACHE_TTL)
     return schemas.AssessmentStats(**stats)
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""Create the assessment service's tables.
+
+Run before the workers start; on Kubernetes it is each pod's init container:
+
+    python -m app.migrate
+
+Single-process dev setups can set RUN_MIGRATIONS=1 to have the app do this on
+startup instead.
+"""
+import asyncio
+import os
+
+from sqlalchemy import text
+
+from . import models
+from .database import engine
+
+RUN_ON_STARTUP = os.getenv("RUN_MIGRATIONS", "0") == "1"
+
+
+async def create_tables() -> None:
+    async with engine.begin() as conn:
+        # Every replica's init container runs this at once; serialize their DDL
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": "assessment_service_migrate"})
+        await conn.run_sync(models.Base.metadata.create_all)
+
+
+async def main() -> None:
+    await create_tables()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,4 @@
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Boolean, Float, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Boolean, Float, ForeignKey, Text, Index, func
 from sqlalchemy.orm import declarative_base, relationship
 from enum import Enum
 
@@ -26,8 +25,8 @@ class Question(Base):
     __tablename__ = "questions"
 
     id = Column(Integer, primary_key=True, index=True)
-    course_id = Column(Integer, nullable=False, index=True)
-    assessment_id = Column(Integer, nullable=True, index=True)  # For questions in specific assessments
+    course_id = Column(Integer, nullable=False)
+    assessment_id = Column(Integer, nullable=True)  # For questions in specific assessments
     text = Column(Text, nullable=False)
     type = Column(String, nullable=False, default=QuestionType.MULTIPLE_CHOICE)
     options = Column(JSON, nullable=True)  # For MCQ questions
@@ -35,8 +34,12 @@ class Question(Base):
     points = Column(Integer, default=1)  # Points for this question
     explanation = Column(Text, nullable=True)  # Explanation of the answer
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    # Fetch the database-set timestamps with RETURNING on the INSERT/UPDATE
+    # itself, instead of leaving them to load (and fail, under asyncio) on access
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class Assessment(Base):
@@ -44,7 +47,7 @@ class Assessment(Base):
     __tablename__ = "assessments"
 
     id = Column(Integer, primary_key=True, index=True)
-    course_id = Column(Integer, nullable=False, index=True)
+    course_id = Column(Integer, nullable=False)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     type = Column(String, nullable=False, default=AssessmentType.QUIZ)
@@ -56,8 +59,12 @@ class Assessment(Base):
     max_attempts = Column(Integer, default=1)
     start_date = Column(DateTime, nullable=True)
     end_date = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    # Fetch the database-set timestamps with RETURNING on the INSERT/UPDATE
+    # itself, instead of leaving them to load (and fail, under asyncio) on access
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class AssessmentSubmission(Base):
@@ -65,27 +72,29 @@ class AssessmentSubmission(Base):
     __tablename__ = "assessment_submissions"
 
     id = Column(Integer, primary_key=True, index=True)
-    assessment_id = Column(Integer, nullable=False, index=True)
-    user_id = Column(Integer, nullable=False, index=True)
+    assessment_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
     answers = Column(JSON, nullable=False)  # {question_id: answer}
     score = Column(Float, nullable=True)  # Calculated score
     max_score = Column(Float, nullable=True)  # Maximum possible score
     percentage = Column(Float, nullable=True)  # Score as percentage
     is_passed = Column(Boolean, nullable=True)  # Whether student passed
-    submitted_at = Column(DateTime, default=datetime.utcnow)
+    submitted_at = Column(DateTime, server_default=func.now())
     graded_at = Column(DateTime, nullable=True)
     graded_by = Column(Integer, nullable=True)  # User ID of grader
     feedback = Column(Text, nullable=True)  # General feedback
     attempt_number = Column(Integer, default=1)  # Which attempt this is
     time_taken = Column(Integer, nullable=True)  # Time taken in seconds
 
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class QuestionResponse(Base):
     """Model representing individual question responses for detailed grading."""
     __tablename__ = "question_responses"
 
     id = Column(Integer, primary_key=True, index=True)
-    submission_id = Column(Integer, nullable=False, index=True)
+    submission_id = Column(Integer, nullable=False)
     question_id = Column(Integer, nullable=False, index=True)
     user_answer = Column(String, nullable=False)
     is_correct = Column(Boolean, nullable=True)
@@ -93,4 +102,26 @@ class QuestionResponse(Base):
     max_points = Column(Float, nullable=False)
     feedback = Column(Text, nullable=True)  # Specific feedback for this question
     graded_at = Column(DateTime, nullable=True)
-    graded_by = Column(Integer, nullable=True)
\ No newline at end of file
+    graded_by = Column(Integer, nullable=True)
+
+# Composite indexes matching the hot query predicates; each one also serves
+# lookups on its leading column, so those columns carry no index of their own
+Index("ix_questions_course_active", Question.course_id, Question.is_active)
+Index("ix_questions_assessment_active", Question.assessment_id, Question.is_active)
+Index("ix_assessments_course_active", Assessment.course_id, Assessment.is_active)
+Index(
+    "ix_assessment_submissions_user_assessment_submitted",
+    AssessmentSubmission.user_id,
+    AssessmentSubmission.assessment_id,
+    AssessmentSubmission.submitted_at.desc()
+)
+Index(
+    "ix_assessment_submissions_assessment_submitted",
+    AssessmentSubmission.assessment_id,
+    AssessmentSubmission.submitted_at.desc()
+)
+Index(
+    "ix_question_responses_submission_question",
+    QuestionResponse.submission_id,
+    QuestionResponse.question_id
+)
@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+# The engine is built at import time, so point it at a throwaway SQLite file first
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_db_dir, 'assessment_test.db')}"
+
+import httpx
+import pytest_asyncio
+
+from app import cache, models
+from app.database import engine
+from app.main import app
+from app.migrate import create_tables
+
+
+class FakeRedis:
+    """In-memory stand-in for the few redis.asyncio calls the cache module makes."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value.encode() if isinstance(value, str) else value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    async def aclose(self):
+        pass
+
+
+@pytest_asyncio.fixture
+async def db_tables():
+    """Give each test empty assessment tables."""
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.drop_all)
+    await create_tables()
+    yield
+
+
+@pytest_asyncio.fixture
+async def client(db_tables):
+    """HTTP client bound to the app in-process, without the Redis cache."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest_asyncio.fixture
+async def fake_redis():
+    """Route the listing and stats caches through an in-memory FakeRedis for the test."""
+    previous = cache.redis_client
+    cache.redis_client = FakeRedis()
+    yield cache.redis_client
+    cache.redis_client = previous
@@ -0,0 +1,166 @@
+import pytest
+
+from sqlalchemy import select
+
+from app.database import async_session
+from app.models import QuestionResponse
+
+ASSESSMENT = {"course_id": 1, "title": "Quiz 1", "total_points": 6, "passing_score": 50, "max_attempts": 2}
+
+
+async def create_quiz(client):
+    """An assessment with a 2-point multiple choice, a 1-point true/false and a 3-point essay question."""
+    response = await client.post("/api/v1/assessments", json=ASSESSMENT)
+    assessment_id = response.json()["assessment"]["id"]
+    question_ids = []
+    for question in [
+        {"text": "2 + 2?", "options": ["3", "4"], "correct_answer": "4", "points": 2},
+        {"text": "The sky is blue", "type": "true_false", "correct_answer": "true", "points": 1},
+        {"text": "Explain gravity", "type": "essay", "points": 3},
+    ]:
+        response = await client.post(
+            "/api/v1/questions", json={"course_id": 1, "assessment_id": assessment_id, **question}
+        )
+        question_ids.append(response.json()["id"])
+    return assessment_id, question_ids
+
+
+async def submit(client, assessment_id, answers, user_id=7):
+    response = await client.post(
+        "/api/v1/submissions", json={"assessment_id": assessment_id, "user_id": user_id, "answers": answers}
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+async def responses_for(submission_id):
+    async with async_session() as db:
+        result = await db.execute(
+            select(QuestionResponse).where(QuestionResponse.submission_id == submission_id)
+        )
+        responses = result.scalars().all()
+    by_question = {response.question_id: response for response in responses}
+    assert len(by_question) == len(responses), "duplicate responses for a question"
+    return by_question
+
+
+@pytest.mark.asyncio
+async def test_auto_grade_scores_only_auto_gradable_questions(client):
+    assessment_id, (mcq, true_false, essay) = await create_quiz(client)
+    submission = await submit(client, assessment_id, {str(mcq): "4", str(true_false): "false", str(essay): "Mass"})
+
+    response = await client.post(f"/api/v1/submissions/{submission['id']}/auto-grade")
+
+    assert response.status_code == 200
+    graded = response.json()
+    assert (graded["score"], graded["max_score"]) == (2, 6)
+    assert graded["percentage"] == pytest.approx(100 / 3)
+    assert graded["is_passed"] is False
+    assert graded["graded_at"] is not None
+
+    responses = await responses_for(submission["id"])
+    assert (responses[mcq].is_correct, responses[mcq].points_earned) == (True, 2)
+    assert (responses[true_false].is_correct, responses[true_false].points_earned) == (False, 0)
+    # Essays wait for a grader
+    assert (responses[essay].is_correct, responses[essay].graded_at) == (None, None)
+    assert responses[essay].user_answer == "Mass"
+
+
+@pytest.mark.asyncio
+async def test_auto_grade_skips_deleted_questions(client):
+    assessment_id, (mcq, true_false, essay) = await create_quiz(client)
+    await client.delete(f"/api/v1/questions/{essay}")
+    submission = await submit(client, assessment_id, {str(mcq): "4", str(true_false): "true"})
+
+    graded = (await client.post(f"/api/v1/submissions/{submission['id']}/auto-grade")).json()
+
+    assert (graded["score"], graded["max_score"], graded["is_passed"]) == (3, 3, True)
+    assert set(await responses_for(submission["id"])) == {mcq, true_false}
+
+
+@pytest.mark.asyncio
+async def test_auto_grade_missing_submission_or_questions_is_404(client):
+    assert (await client.post("/api/v1/submissions/99/auto-grade")).status_code == 404
+
+    response = await client.post("/api/v1/assessments", json=ASSESSMENT)
+    submission = await submit(client, response.json()["assessment"]["id"], {})
+    response = await client.post(f"/api/v1/submissions/{submission['id']}/auto-grade")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Assessment or questions not found"
+
+
+@pytest.mark.asyncio
+async def test_manual_grade_totals_only_the_graded_questions(client):
+    assessment_id, (mcq, true_false, essay) = await create_quiz(client)
+    submission = await submit(client, assessment_id, {str(mcq): "4", str(true_false): "true", str(essay): "Mass"})
+    await client.post(f"/api/v1/submissions/{submission['id']}/auto-grade")
+
+    response = await client.post("/api/v1/submissions/grade", json={
+        "submission_id": submission["id"],
+        "grader_id": 3,
+        "question_grades": {
+            str(essay): {"score": 2, "feedback": "Mostly right", "is_correct": True},
+            "999": {"score": 5}
+        }
+    })
+
+    assert response.status_code == 200
+    graded = response.json()
+    assert (graded["score"], graded["max_score"], graded["graded_by"]) == (2, 3, 3)
+    assert graded["percentage"] == pytest.approx(200 / 3)
+    assert graded["is_passed"] is True
+
+    responses = await responses_for(submission["id"])
+    assert (responses[essay].points_earned, responses[essay].feedback) == (2, "Mostly right")
+    assert (responses[essay].graded_by, responses[essay].is_correct) == (3, True)
+    # Questions left out of the request keep their auto grades
+    assert (responses[mcq].points_earned, responses[mcq].graded_by) == (2, None)
+
+
+@pytest.mark.asyncio
+async def test_grading_twice_replaces_the_earlier_grade(client):
+    assessment_id, (mcq, true_false, essay) = await create_quiz(client)
+    submission = await submit(client, assessment_id, {str(mcq): "4", str(true_false): "true", str(essay): "Mass"})
+
+    first = (await client.post(f"/api/v1/submissions/{submission['id']}/auto-grade")).json()
+    second = (await client.post(f"/api/v1/submissions/{submission['id']}/auto-grade")).json()
+    assert (first["score"], first["max_score"]) == (second["score"], second["max_score"]) == (3, 6)
+
+    for score, feedback in [(3, "Great"), (1, "Regraded")]:
+        graded = (await client.post("/api/v1/submissions/grade", json={
+            "submission_id": submission["id"],
+            "grader_id": 4,
+            "question_grades": {str(essay): {"score": score, "feedback": feedback}}
+        })).json()
+        assert (graded["score"], graded["max_score"]) == (score, 3)
+
+    fetched = (await client.get(f"/api/v1/submissions/{submission['id']}")).json()
+    assert (fetched["score"], fetched["graded_by"], fetched["is_passed"]) == (1, 4, False)
+    assert (await responses_for(submission["id"]))[essay].feedback == "Regraded"
+
+
+@pytest.mark.asyncio
+async def test_manual_grade_missing_submission_is_404(client):
+    response = await client.post(
+        "/api/v1/submissions/grade", json={"submission_id": 99, "grader_id": 1, "question_grades": {}}
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Submission not found"
+
+
+@pytest.mark.asyncio
+async def test_submissions_count_attempts_and_stop_at_max_attempts(client):
+    assessment_id, _ = await create_quiz(client)
+
+    assert (await submit(client, assessment_id, {}))["attempt_number"] == 1
+    assert (await submit(client, assessment_id, {}))["attempt_number"] == 2
+    # Another user's attempts are counted separately
+    assert (await submit(client, assessment_id, {}, user_id=8))["attempt_number"] == 1
+
+    response = await client.post(
+        "/api/v1/submissions", json={"assessment_id": assessment_id, "user_id": 7, "answers": {}}
+    )
+    assert response.status_code == 400
+
+    response = await client.post("/api/v1/submissions", json={"assessment_id": 99, "user_id": 7, "answers": {}})
+    assert response.status_code == 404
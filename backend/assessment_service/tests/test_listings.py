@@ -0,0 +1,169 @@
+import pytest
+
+from app import cache
+
+ASSESSMENT = {"course_id": 1, "title": "Quiz 1", "total_points": 5, "passing_score": 60}
+
+
+async def create_question(client, **fields):
+    response = await client.post(
+        "/api/v1/questions", json={"course_id": 1, "text": "2 + 2?", "correct_answer": "4", **fields}
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+async def create_assessment(client, **fields):
+    response = await client.post("/api/v1/assessments", json={**ASSESSMENT, **fields})
+    assert response.status_code == 201
+    return response.json()["assessment"]
+
+
+async def listed_ids(client, url, **params):
+    response = await client.get(url, params=params)
+    assert response.status_code == 200
+    return [row["id"] for row in response.json()]
+
+
+@pytest.mark.asyncio
+async def test_listings_serialize_rows_like_the_response_schema(client):
+    assessment = await create_assessment(client)
+    question = await create_question(client, assessment_id=assessment["id"], options=["3", "4"], points=2)
+
+    listed = (await client.get("/api/v1/questions/course/1")).json()
+    assert listed == [question]
+    assert listed[0]["type"] == "multiple_choice"
+    assert (await client.get(f"/api/v1/questions/{question['id']}")).json() == question
+
+    listed = (await client.get("/api/v1/assessments/course/1")).json()
+    assert listed == [assessment]
+    assert set(listed[0]) >= {"id", "is_active", "created_at", "updated_at", "allow_retakes"}
+
+
+@pytest.mark.asyncio
+async def test_soft_deleted_rows_drop_out_of_active_listings_only(client):
+    assessment = await create_assessment(client)
+    kept = await create_question(client, assessment_id=assessment["id"])
+    deleted = await create_question(client, assessment_id=assessment["id"])
+
+    assert (await client.delete(f"/api/v1/questions/{deleted['id']}")).status_code == 204
+    assert (await client.delete(f"/api/v1/assessments/{assessment['id']}")).status_code == 204
+
+    assert await listed_ids(client, "/api/v1/questions/course/1") == [kept["id"]]
+    assert await listed_ids(client, f"/api/v1/questions/assessment/{assessment['id']}") == [kept["id"]]
+    assert sorted(await listed_ids(client, "/api/v1/questions/course/1", active_only=False)) == [kept["id"], deleted["id"]]
+    assert await listed_ids(client, "/api/v1/assessments/course/1") == []
+    assert await listed_ids(client, "/api/v1/assessments/course/1", active_only=False) == [assessment["id"]]
+
+    # Soft-deleted rows can still be fetched directly
+    question = (await client.get(f"/api/v1/questions/{deleted['id']}")).json()
+    assert question["is_active"] is False
+    assert question["updated_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_deleting_missing_rows_is_404(client):
+    assert (await client.delete("/api/v1/questions/99")).status_code == 404
+    assert (await client.delete("/api/v1/assessments/99")).status_code == 404
+    assert (await client.put("/api/v1/questions/99", json={"text": "x"})).status_code == 404
+    assert (await client.put("/api/v1/assessments/99", json={"title": "x"})).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_question_listings_are_cached_until_a_write(client, fake_redis):
+    assessment = await create_assessment(client)
+    question = await create_question(client, assessment_id=assessment["id"])
+
+    course_url = "/api/v1/questions/course/1"
+    assessment_url = f"/api/v1/questions/assessment/{assessment['id']}"
+    assert await listed_ids(client, course_url) == [question["id"]]
+    assert await listed_ids(client, assessment_url) == [question["id"]]
+    assert cache.questions_by_course_key(1, True) in fake_redis.store
+    assert cache.questions_by_assessment_key(assessment["id"], True) in fake_redis.store
+
+    # A cached listing is served without touching the database
+    fake_redis.store[cache.questions_by_course_key(1, True)] = b"[]"
+    assert (await client.get(course_url)).json() == []
+
+    response = await client.put(f"/api/v1/questions/{question['id']}", json={"text": "3 + 3?"})
+    assert response.status_code == 200
+    assert (await client.get(course_url)).json()[0]["text"] == "3 + 3?"
+    assert (await client.get(assessment_url)).json()[0]["text"] == "3 + 3?"
+
+    added = await create_question(client, assessment_id=assessment["id"])
+    assert await listed_ids(client, assessment_url) == [question["id"], added["id"]]
+
+    await client.delete(f"/api/v1/questions/{question['id']}")
+    assert await listed_ids(client, course_url) == [added["id"]]
+    assert await listed_ids(client, assessment_url) == [added["id"]]
+
+
+@pytest.mark.asyncio
+async def test_assessment_listings_are_cached_until_a_write(client, fake_redis):
+    assessment = await create_assessment(client)
+    url = "/api/v1/assessments/course/1"
+    assert await listed_ids(client, url) == [assessment["id"]]
+    assert cache.assessments_by_course_key(1, True) in fake_redis.store
+
+    response = await client.put(f"/api/v1/assessments/{assessment['id']}", json={"title": "Midterm"})
+    assert response.status_code == 200
+    assert (await client.get(url)).json()[0]["title"] == "Midterm"
+
+    added = await create_assessment(client)
+    assert await listed_ids(client, url) == [assessment["id"], added["id"]]
+
+    await client.delete(f"/api/v1/assessments/{assessment['id']}")
+    assert await listed_ids(client, url) == [added["id"]]
+    assert await listed_ids(client, url, active_only=False) == [assessment["id"], added["id"]]
+
+
+@pytest.mark.asyncio
+async def test_listings_fall_back_to_the_database_without_redis(client):
+    await create_question(client)
+    assert cache.redis_client is None
+    assert len(await listed_ids(client, "/api/v1/questions/course/1")) == 1
+
+
+@pytest.mark.asyncio
+async def test_submission_listings_page_newest_first(client):
+    assessment = await create_assessment(client, max_attempts=5)
+    other = await create_assessment(client)
+    ids = []
+    for _ in range(3):
+        response = await client.post(
+            "/api/v1/submissions", json={"assessment_id": assessment["id"], "user_id": 7, "answers": {}}
+        )
+        ids.append(response.json()["id"])
+    await client.post("/api/v1/submissions", json={"assessment_id": other["id"], "user_id": 8, "answers": {}})
+
+    # Submissions in the same second fall back to newest id first
+    newest_first = ids[::-1]
+    assert await listed_ids(client, "/api/v1/submissions/user/7") == newest_first
+    assert await listed_ids(client, "/api/v1/submissions/user/7", limit=2) == newest_first[:2]
+    assert await listed_ids(client, "/api/v1/submissions/user/7", limit=2, offset=2) == newest_first[2:]
+    assert await listed_ids(client, f"/api/v1/submissions/assessment/{assessment['id']}", offset=1) == newest_first[1:]
+    assert len(await listed_ids(client, f"/api/v1/submissions/user/7/assessment/{assessment['id']}")) == 3
+    assert (await client.get("/api/v1/submissions/user/7", params={"limit": 0})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_stats_aggregate_graded_submissions(client, fake_redis):
+    assessment = await create_assessment(client, max_attempts=3)
+    question = await create_question(client, assessment_id=assessment["id"], points=2)
+    await create_assessment(client, course_id=2)
+    for answer in ["4", "5"]:
+        response = await client.post(
+            "/api/v1/submissions",
+            json={"assessment_id": assessment["id"], "user_id": 7, "answers": {str(question["id"]): answer}}
+        )
+        await client.post(f"/api/v1/submissions/{response.json()['id']}/auto-grade")
+    # Left ungraded
+    await client.post("/api/v1/submissions", json={"assessment_id": assessment["id"], "user_id": 7, "answers": {}})
+
+    stats = (await client.get("/api/v1/stats/course/1")).json()
+    assert (stats["total_assessments"], stats["total_submissions"]) == (1, 3)
+    assert stats["average_score"] == 50.0
+    assert stats["pass_rate"] == 50.0
+    assert (await client.get(f"/api/v1/stats/assessment/{assessment['id']}")).json() == stats
+    assert (await client.get("/api/v1/stats/overall")).json()["total_assessments"] == 2
+    assert cache.stats_key("course:1") in fake_redis.store